@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Compare generated Dockerfile variants for every buildable service version.
+
+Usage: python scripts/benchmark_dockerfiles.py [--build] [service ...]
+
+Without --build only the layer counts are reported. With --build every variant is
+built from scratch (docker build --no-cache) and the wall-clock build time is shown.
+"""
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+# Make the dockit package importable when running from a source checkout
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.service_manager import ServiceManager
+from dockit.utilities.dockerfile_optimizer import DockerfileOptimizer
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.template_loader import TemplateLoader
+from dockit.commands.generator import Generator
+
+# Variant name -> Generator options
+VARIANTS = {
+    'standard': {},
+    'optimized': {'optimize': True},
+    'fast': {'fast_build': True},
+    'fast+opt': {'fast_build': True, 'optimize': True},
+}
+
+def build(context_dir: str, tag: str) -> float:
+    started_at = time.perf_counter()
+    subprocess.run(
+        ['docker', 'build', '--no-cache', '-q', '-t', tag, context_dir],
+        check=True,
+        capture_output=True,
+        env=dict(os.environ, DOCKER_BUILDKIT='1')
+    )
+    return time.perf_counter() - started_at
+
+def main():
+    args = sys.argv[1:]
+    run_builds = '--build' in args
+    services = [arg for arg in args if not arg.startswith('--')]
+
+    Messenger.set_quiet(True)
+    service_manager = ServiceManager()
+    service_manager.initialize_services()
+    service_manager.load_all_services()
+    # Benchmark the templates of this checkout rather than the ones published to ~/.dockit
+    env = TemplateLoader.create_environment(PathResolver.get_predefined_templates_path())
+
+    print(f"{'service':<16}{'variant':<12}{'layers':>8}{'build (s)':>12}")
+    for service_name in services or list(service_manager.services.keys()):
+        for version in service_manager.get_service_versions(service_name) or []:
+            if 'build' not in service_manager.get_service_config(service_name, version):
+                continue
+
+            for variant, options in VARIANTS.items():
+                with tempfile.TemporaryDirectory() as project_dir:
+                    Generator({service_name: version}, project_dir, env, **options).run()
+                    context_dir = os.path.join(project_dir, 'dockit', f"{service_name}-{version}")
+                    with open(os.path.join(context_dir, 'Dockerfile'), 'r') as f:
+                        layers = DockerfileOptimizer.count_layers(f.read())
+
+                    seconds = ''
+                    if run_builds:
+                        seconds = f"{build(context_dir, f'dockit-bench-{service_name}-{version}-{variant}'):.1f}"
+
+                    print(f"{service_name + '-' + version:<16}{variant:<12}{layers:>8}{seconds:>12}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Compare the cost of republishing the bundled services and templates.
+
+Usage: python scripts/benchmark_publish.py [--runs N]
+
+Each strategy publishes the catalog of this checkout into a scratch directory,
+then republishes it N times: once with nothing changed (the common case of
+`dockit force-publish`) and once with a single file edited in between.
+"rmtree+copytree" is how publishing used to work; "sync" is DirectorySync.
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import statistics
+
+# Make the dockit package importable when running from a source checkout
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.directory_sync import DirectorySync
+
+def bundled_dirs():
+    """Every directory force-publish copies, as (source, name under the target)"""
+    dirs = []
+    for kind, root in (('services', PathResolver.get_predefined_services_path()),
+                       ('templates', PathResolver.get_predefined_templates_path())):
+        for name in sorted(os.listdir(root)):
+            if os.path.isdir(os.path.join(root, name)) and name != '__pycache__':
+                dirs.append((os.path.join(root, name), os.path.join(kind, name)))
+    return dirs
+
+def copytree(dirs, target_root):
+    for source, name in dirs:
+        target = os.path.join(target_root, name)
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        shutil.copytree(source, target)
+
+def sync(dirs, target_root):
+    directory_sync = DirectorySync()
+    for source, name in dirs:
+        directory_sync.sync(source, os.path.join(target_root, name))
+
+STRATEGIES = {'rmtree+copytree': copytree, 'sync': sync}
+
+def timed(function, *args) -> float:
+    started_at = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - started_at) * 1000
+
+def main():
+    args = sys.argv[1:]
+    runs = int(args[args.index('--runs') + 1]) if '--runs' in args else 20
+    dirs = bundled_dirs()
+    files = sum(len(names) for source, _ in dirs for _, _, names in os.walk(source))
+    print(f"{len(dirs)} directories, {files} files, median of {runs} runs")
+    print(f"{'strategy':<18}{'no-op (ms)':>12}{'1 edit (ms)':>13}")
+
+    for strategy, publish in STRATEGIES.items():
+        with tempfile.TemporaryDirectory() as scratch:
+            # The edited copy of the catalog, so the bundled files are never touched
+            sources = os.path.join(scratch, 'source')
+            edited = []
+            for source, name in dirs:
+                shutil.copytree(source, os.path.join(sources, name))
+                edited.append((os.path.join(sources, name), name))
+            target_root = os.path.join(scratch, 'published')
+            publish(edited, target_root)
+
+            noop = [timed(publish, edited, target_root) for _ in range(runs)]
+
+            changed_file = next(
+                os.path.join(root, names[0]) for root, _, names in os.walk(edited[0][0]) if names
+            )
+            one_edit = []
+            for run in range(runs):
+                with open(changed_file, 'a') as f:
+                    f.write(f"\n# benchmark edit {run}")
+                one_edit.append(timed(publish, edited, target_root))
+
+            print(f"{strategy:<18}{statistics.median(noop):>12.2f}{statistics.median(one_edit):>13.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+import os
+import sys
+
+# Make the dockit package importable when running from a source checkout
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.template_loader import TemplateLoader
+
+def main():
+    templates_dir = PathResolver.get_predefined_templates_path()
+    target_dir = PathResolver.get_precompiled_templates_path()
+
+    manifest = TemplateLoader.compile_templates(templates_dir, target_dir)
+    for name in manifest:
+        print(f"Compiled {name}")
+    print(f"\nPrecompiled templates written to {target_dir}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Record the content of every bundled service and template file in bundled_history.json
+
+Run it before each release. The history lets OverrideMigration tell the copies
+older releases left in ~/.dockit from the files users edited. With --git, every
+version the files had in the repository's history is recorded too.
+"""
+import os
+import sys
+import json
+import hashlib
+import subprocess
+
+# Make the dockit package importable when running from a source checkout
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.file_writer import FileWriter
+
+LAYERS = ('services', 'templates')
+
+def current_files():
+    """(path in the history, sha256) of every file shipped now"""
+    package_dir = os.path.dirname(PathResolver.get_predefined_services_path())
+    for layer in LAYERS:
+        for root, dirs, files in os.walk(os.path.join(package_dir, layer)):
+            dirs[:] = [d for d in dirs if d != '__pycache__']
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                yield os.path.relpath(path, package_dir).replace(os.sep, '/'), FileWriter.hash_file(path)
+
+def git_files():
+    """(path in the history, sha256) of every version the files had in the repository"""
+    def git(*args):
+        return subprocess.run(['git', *args], check=True, capture_output=True).stdout
+
+    prefix = 'src/dockit/'
+    paths = [prefix + layer for layer in LAYERS]
+    for commit in git('log', '--format=%H', '--', *paths).decode().split():
+        for line in git('ls-tree', '-r', commit, '--', *paths).decode().splitlines():
+            info, path = line.split('\t', 1)
+            blob = info.split()[2]
+            yield path[len(prefix):], hashlib.sha256(git('cat-file', 'blob', blob)).hexdigest()
+
+def main():
+    history_path = PathResolver.get_bundled_history_path()
+    history = {}
+    if os.path.exists(history_path):
+        with open(history_path, 'r') as f:
+            history = json.load(f)
+
+    found = list(current_files())
+    if '--git' in sys.argv[1:]:
+        found += list(git_files())
+
+    added = 0
+    for path, digest in found:
+        if digest not in history.setdefault(path, []):
+            history[path].append(digest)
+            added += 1
+
+    FileWriter().write(history_path, json.dumps(dict(sorted(history.items())), indent=2) + '\n')
+    print(f"Recorded {added} new file version(s) in {history_path}")
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,215 @@
+import importlib
+import multiprocessing
 import typer
-from dockit.commands.init import InitCommand
-from dockit.commands.add_service import AddServiceCommand
-from dockit.commands.delete_service import DeleteServiceCommand
-from dockit.commands.publish import PublishCommand
-from dockit.commands.about import AboutCommand
-from dockit.commands.version import VersionCommand
+from typing import List, Optional
+
+# Command name -> "module:Class". Implementations (and their heavy imports such as
+# questionary, jinja2 or the service catalog) are only loaded when the command runs.
+COMMANDS = {
+    "init": "dockit.commands.init:InitCommand",
+    "add-service": "dockit.commands.add_service:AddServiceCommand",
+    "delete-service": "dockit.commands.delete_service:DeleteServiceCommand",
+    "generate": "dockit.commands.generate:GenerateCommand",
+    "build": "dockit.commands.build:BuildCommand",
+    "up": "dockit.commands.up:UpCommand",
+    "plan": "dockit.commands.plan:PlanCommand",
+    "status": "dockit.commands.status:StatusCommand",
+    "logs": "dockit.commands.logs:LogsCommand",
+    "top": "dockit.commands.top:TopCommand",
+    "validate": "dockit.commands.validate:ValidateCommand",
+    "force-publish": "dockit.commands.publish:PublishCommand",
+    "about": "dockit.commands.about:AboutCommand",
+    "version": "dockit.commands.version:VersionCommand",
+}
+
+class LazyCommand:
+    def __init__(self, target: str):
+        """
+        :param target: import path of the command class, like "dockit.commands.init:InitCommand"
+        """
+        self.target = target
+        self._instance = None
+
+    def resolve(self):
+        """Import and instantiate the command on first use"""
+        if self._instance is None:
+            module_name, class_name = self.target.split(":")
+            module = importlib.import_module(module_name)
+            self._instance = getattr(module, class_name)()
+        return self._instance
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve().run(*args, **kwargs)
 
 class DockitCLI:
     def __init__(self):
         self.app = typer.Typer()
-        self.init_cmd = InitCommand()
-        self.add_service_cmd = AddServiceCommand()
-        self.delete_service_cmd = DeleteServiceCommand()
-        self.publish_cmd = PublishCommand()
-        self.about_cmd = AboutCommand()
-        self.version_cmd = VersionCommand()
+        self.commands = {name: LazyCommand(target) for name, target in COMMANDS.items()}
 
         # Register the CLI commands
-        self.app.command("init")(self.init_cmd.run)
-        self.app.command("add-service")(self.add_service_cmd.run)
-        self.app.command("delete-service")(self.delete_service_cmd.run)
-        self.app.command("force-publish")(self.publish_cmd.run)
-        self.app.command("about")(self.about_cmd.run)
-        self.app.command("version")(self.version_cmd.run)
+        self.app.command("init")(self.init)
+        self.app.command("generate")(self.generate)
+        self.app.command("build")(self.build)
+        self.app.command("up")(self.up)
+        self.app.command("rebuild")(self.rebuild)
+        self.app.command("plan")(self.plan)
+        self.app.command("apply")(self.apply)
+        self.app.command("status")(self.status)
+        self.app.command("logs")(self.logs)
+        self.app.command("top")(self.top)
+        self.app.command("add-service")(self.add_service)
+        self.app.command("delete-service")(self.delete_service)
+        self.app.command("validate")(self.validate)
+        self.app.command("force-publish")(self.force_publish)
+        self.app.command("about")(self.about)
+        self.app.command("version")(self.version)
+
+    def init(
+        self,
+        spec: Optional[str] = typer.Option(None, "--spec", help="Stack spec (YAML) listing the services to generate, skipping selection prompts"),
+        service: Optional[List[str]] = typer.Option(None, "--service", help="Service to include as name=version, e.g. php=8.4 (repeatable)"),
+        yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompts"),
+        start: bool = typer.Option(False, "--start", help="Start the containers after generating when --yes is given"),
+        optimize: bool = typer.Option(False, "--optimize", help="Emit layer-optimized Dockerfiles with BuildKit cache mounts"),
+        fast_build: bool = typer.Option(False, "--fast-build", help="Install all PHP extensions in one parallel install-php-extensions step"),
+        build_cache: bool = typer.Option(False, "--build-cache", help="Export and import a local BuildKit cache per image (needs a docker-container builder)"),
+        build_cache_dir: Optional[str] = typer.Option(None, "--build-cache-dir", help="Directory of the local build caches (default: ~/.dockit/buildcache); implies --build-cache"),
+    ):
+        """Initialize a new Docker service configuration"""
+        self.commands["init"](spec=spec, services=service, yes=yes, start=start, optimize=optimize,
+                              fast_build=fast_build, build_cache=build_cache, build_cache_dir=build_cache_dir)
+
+    def generate(
+        self,
+        projects: List[str] = typer.Option(..., "--projects", help="Glob of project directories, e.g. 'apps/*' (repeatable)"),
+        spec_name: str = typer.Option("dockit.yml", "--spec-name", help="Stack spec file to read from each project"),
+        jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Number of worker processes (default: CPU count)"),
+        optimize: bool = typer.Option(False, "--optimize", help="Emit layer-optimized Dockerfiles with BuildKit cache mounts"),
+        fast_build: bool = typer.Option(False, "--fast-build", help="Install all PHP extensions in one parallel install-php-extensions step"),
+        build_cache: bool = typer.Option(False, "--build-cache", help="Export and import a local BuildKit cache per image (needs a docker-container builder)"),
+        build_cache_dir: Optional[str] = typer.Option(None, "--build-cache-dir", help="Directory of the local build caches (default: ~/.dockit/buildcache); implies --build-cache"),
+    ):
+        """Generate many projects in parallel from their stack specs"""
+        self.commands["generate"](projects=projects, spec_name=spec_name, jobs=jobs, optimize=optimize,
+                                  fast_build=fast_build, build_cache=build_cache, build_cache_dir=build_cache_dir)
+
+    def build(
+        self,
+        service: Optional[List[str]] = typer.Argument(None, help="Services to build (default: every service with a build)"),
+        jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Number of images built at the same time (default: CPU count)"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Build without using the BuildKit cache"),
+    ):
+        """Build the project images in parallel from a generated bake file"""
+        self.commands["build"](services=service, jobs=jobs, no_cache=no_cache)
+
+    def up(
+        self,
+        jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Number of images built at the same time (default: CPU count)"),
+        wait: bool = typer.Option(False, "--wait", help="Wait until every service is healthy (or running, without a healthcheck)"),
+        timeout: float = typer.Option(120, "--timeout", help="Seconds to wait for the services with --wait"),
+    ):
+        """Start the containers, rebuilding only the images whose build inputs changed"""
+        self.commands["up"](jobs=jobs, wait=wait, timeout=timeout)
+
+    def rebuild(
+        self,
+        service: Optional[List[str]] = typer.Argument(None, help="Services to rebuild (default: every service with a build)"),
+        all_images: bool = typer.Option(False, "--all", help="Rebuild even the images whose build inputs did not change"),
+        jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Number of images built at the same time (default: CPU count)"),
+    ):
+        """Rebuild changed images and restart their containers"""
+        self.commands["up"](services=service, force=all_images, jobs=jobs)
+
+    def plan(
+        self,
+        spec: Optional[str] = typer.Option(None, "--spec", help="Stack spec (YAML) listing the services (default: ./dockit.yml)"),
+        service: Optional[List[str]] = typer.Option(None, "--service", help="Service to include as name=version, e.g. php=8.4 (repeatable)"),
+        optimize: bool = typer.Option(False, "--optimize", help="Emit layer-optimized Dockerfiles with BuildKit cache mounts"),
+        fast_build: bool = typer.Option(False, "--fast-build", help="Install all PHP extensions in one parallel install-php-extensions step"),
+        build_cache: bool = typer.Option(False, "--build-cache", help="Export and import a local BuildKit cache per image (needs a docker-container builder)"),
+        build_cache_dir: Optional[str] = typer.Option(None, "--build-cache-dir", help="Directory of the local build caches (default: ~/.dockit/buildcache); implies --build-cache"),
+    ):
+        """Show what regenerating the stack would change, service by service"""
+        self.commands["plan"](spec=spec, services=service, optimize=optimize, fast_build=fast_build,
+                              build_cache=build_cache, build_cache_dir=build_cache_dir)
+
+    def apply(
+        self,
+        spec: Optional[str] = typer.Option(None, "--spec", help="Stack spec (YAML) listing the services (default: ./dockit.yml)"),
+        service: Optional[List[str]] = typer.Option(None, "--service", help="Service to include as name=version, e.g. php=8.4 (repeatable)"),
+        yes: bool = typer.Option(False, "--yes", "-y", help="Skip the confirmation prompt"),
+        jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Number of images built at the same time (default: CPU count)"),
+        optimize: bool = typer.Option(False, "--optimize", help="Emit layer-optimized Dockerfiles with BuildKit cache mounts"),
+        fast_build: bool = typer.Option(False, "--fast-build", help="Install all PHP extensions in one parallel install-php-extensions step"),
+        build_cache: bool = typer.Option(False, "--build-cache", help="Export and import a local BuildKit cache per image (needs a docker-container builder)"),
+        build_cache_dir: Optional[str] = typer.Option(None, "--build-cache-dir", help="Directory of the local build caches (default: ~/.dockit/buildcache); implies --build-cache"),
+    ):
+        """Regenerate the stack and recreate only the services that changed"""
+        self.commands["plan"](spec=spec, services=service, apply=True, yes=yes, jobs=jobs, optimize=optimize,
+                              fast_build=fast_build, build_cache=build_cache, build_cache_dir=build_cache_dir)
+
+    def status(
+        self,
+        watch: bool = typer.Option(False, "--watch", "-w", help="Keep the table updated from the Docker events stream"),
+    ):
+        """Show the state and health of the project containers"""
+        self.commands["status"](watch=watch)
+
+    def logs(
+        self,
+        service: Optional[List[str]] = typer.Argument(None, help="Services to show (default: all)"),
+        follow: bool = typer.Option(False, "--follow", "-f", help="Keep following the logs"),
+        tail: int = typer.Option(100, "--tail", "-n", help="Lines to show per service"),
+        grep: Optional[str] = typer.Option(None, "--grep", "-g", help="Only lines matching this regular expression"),
+        level: Optional[str] = typer.Option(None, "--level", "-l", help="Only lines at or above this level (info, warning, error, ...)"),
+        buffer_size: int = typer.Option(1000, "--buffer", help="Lines kept per service while following before the oldest are dropped"),
+    ):
+        """Show the logs of the project containers, per service"""
+        self.commands["logs"](services=service, follow=follow, tail=tail, grep=grep, level=level, buffer_size=buffer_size)
+
+    def top(
+        self,
+        service: Optional[List[str]] = typer.Argument(None, help="Services to monitor (default: all)"),
+        interval: float = typer.Option(1.0, "--interval", "-i", help="Seconds between samples"),
+        output_format: str = typer.Option("table", "--format", help="table, csv or json (one JSON object per line)"),
+        output: Optional[str] = typer.Option(None, "--output", "-o", help="Write the csv/json samples to this file while showing the table"),
+        count: int = typer.Option(0, "--count", "-c", help="Stop after this many samples (default: until Ctrl+C)"),
+    ):
+        """Show CPU, memory and I/O per service of the stack"""
+        self.commands["top"](services=service, interval=interval, output_format=output_format, output=output, count=count)
+
+    def add_service(self):
+        """Add a new service"""
+        self.commands["add-service"]()
+
+    def delete_service(self):
+        """Delete a service version"""
+        self.commands["delete-service"]()
+
+    def validate(
+        self,
+        service: Optional[List[str]] = typer.Argument(None, help="Services to validate (default: the whole catalog)"),
+        jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Number of worker processes (default: CPU count)"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Check every service.json again, even unchanged ones"),
+    ):
+        """Check every version of every service in the catalog"""
+        self.commands["validate"](services=service, jobs=jobs, use_cache=not no_cache)
+
+    def force_publish(self):
+        """Copy the predefined services and templates to ~/.dockit/bundled to customize from"""
+        self.commands["force-publish"]()
+
+    def about(self):
+        """Show information about Dockit"""
+        self.commands["about"]()
+
+    def version(self):
+        """Show the version of Dockit"""
+        self.commands["version"]()
 
 def main():
+    # Needed by the generate worker pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     DockitCLI().app()
 
 if __name__ == "__main__":
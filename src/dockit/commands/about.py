@@ -43,9 +43,19 @@ class AboutCommand:
 
             self.console.print("\n[bold]Commands:[/bold]")
             self.console.print("• [blue]init[/blue]           - Initialize a new Docker service configuration")
+            self.console.print("• [blue]generate[/blue]       - Generate many projects in parallel from their stack specs")
+            self.console.print("• [blue]build[/blue]          - Build the project images in parallel from a bake file")
+            self.console.print("• [blue]up[/blue]             - Start the containers, rebuilding only changed images")
+            self.console.print("• [blue]rebuild[/blue]        - Rebuild changed images and restart their containers")
+            self.console.print("• [blue]plan[/blue]           - Show what regenerating the stack would change per service")
+            self.console.print("• [blue]apply[/blue]          - Regenerate and recreate only the changed services")
+            self.console.print("• [blue]status[/blue]         - Show (or --watch) the state of the project containers")
+            self.console.print("• [blue]logs[/blue]           - Show, filter and follow the logs of every service")
+            self.console.print("• [blue]top[/blue]            - Monitor CPU, memory and I/O per service")
             self.console.print("• [blue]add-service[/blue]    - Add a new service")
             self.console.print("• [blue]delete-service[/blue] - Delete a service version")
-            self.console.print("• [blue]force-publish[/blue]  - Force publish a the predefined service version")
+            self.console.print("• [blue]validate[/blue]       - Check every service version in the catalog")
+            self.console.print("• [blue]force-publish[/blue]  - Copy the predefined services and templates to ~/.dockit/bundled to customize from")
             self.console.print("• [blue]about[/blue]          - Show information about Dockit")
             self.console.print("• [blue]version[/blue]        - Show the version of Dockit")
 
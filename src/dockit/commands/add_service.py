@@ -11,7 +11,6 @@ class AddServiceCommand:
         self.messenger = Messenger()
         self.service_manager = ServiceManager()
         self.services_dir = PathResolver.get_services_dir()
-        self.templates_dir = PathResolver.get_templates_dir()
 
     def run(self):
         try:
@@ -32,6 +31,13 @@ class AddServiceCommand:
             if not version:
                 return
 
+            # The new version goes into the user's layer, on top of any bundled versions
+            self.service_manager.initialize_services()
+            self.service_manager.load_all_services()
+            if version in (self.service_manager.get_service_versions(service_name) or []):
+                self.messenger.warning(f"Version '{version}' already exists for service '{service_name}'")
+                return
+
             # Create service directory
             service_dir = os.path.join(self.services_dir, service_name)
             os.makedirs(service_dir, exist_ok=True)
@@ -46,21 +52,18 @@ class AddServiceCommand:
 
             # Load skeleton template
             skeleton_file = "image_base.json" if version_type == "Docker Registry" else "build_version.json"
-            skeleton_path = os.path.join(self.templates_dir, "skeletons", skeleton_file)
+            skeleton_path = PathResolver.find_resource(PathResolver.get_template_layers(), "skeletons", skeleton_file)
             with open(skeleton_path, "r") as f:
                 skeleton = json.load(f)
 
-            # Create or update service.json
+            # Create or update service.json; it only holds the user's versions, merged over the bundled ones
             service_json_path = os.path.join(service_dir, "service.json")
             existing_config = {}
             if os.path.exists(service_json_path):
                 with open(service_json_path, "r") as f:
                     existing_config = json.load(f)
-                    if version in existing_config:
-                        self.messenger.warning(f"Version '{version}' already exists for service '{service_name}'")
-                        return
 
-            # Add new version
+            # Add new version (replacing a hidden one of the same name)
             existing_config[version] = skeleton["version"]
 
             # Save service.json
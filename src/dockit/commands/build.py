@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+from rich.console import Console
+from rich.table import Table
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.docker_manager import DockerManager
+from dockit.utilities.build_manager import BuildManager
+from dockit.utilities.build_fingerprint import BuildFingerprint, BuildState
+
+class BuildCommand:
+    def __init__(self):
+        self.messenger = Messenger()
+        self.console = Console()
+        self.docker_manager = DockerManager()
+
+    def run(self, services: Optional[List[str]] = None, jobs: Optional[int] = None,
+            no_cache: bool = False, project_dir: str = '.'):
+        try:
+            build_manager = BuildManager(project_dir)
+            definition, fingerprints = self.load_definition(build_manager, services)
+            if not definition['target']:
+                self.messenger.warning("No services to build")
+                return
+
+            if not self.docker_manager.is_docker_installed():
+                self.messenger.error("Docker not found. Please make sure Docker is installed and running.")
+                sys.exit(1)
+
+            # Everything asked for is built, along with the images it builds on
+            targets = [name for wave in build_manager.build_order(definition, services) for name in wave]
+            if not self.build_images(build_manager, definition, fingerprints, targets, jobs, no_cache):
+                sys.exit(1)
+            self.messenger.success("All images built successfully!")
+        except KeyboardInterrupt:
+            self.messenger.info("\nOperation cancelled by user")
+            sys.exit(0)
+
+    def load_definition(self, build_manager: BuildManager, services: Optional[List[str]] = None):
+        """Read the bake definition and fingerprints of a project; exits when they cannot be determined"""
+        try:
+            definition = build_manager.bake_definition(build_manager.load_compose())
+        except (OSError, ValueError) as e:
+            self.messenger.error(f"Could not read docker-compose.yml: {str(e)}. Run 'dockit init' first.")
+            sys.exit(1)
+
+        unknown = [name for name in services or [] if name not in definition['target']]
+        if unknown:
+            self.messenger.error(f"No buildable service named {', '.join(unknown)}")
+            sys.exit(1)
+        try:
+            fingerprints = BuildFingerprint.compute(definition, build_manager.project_dir)
+        except (OSError, ValueError) as e:
+            self.messenger.error(str(e))
+            sys.exit(1)
+        return definition, fingerprints
+
+    def build_images(self, build_manager: BuildManager, definition: dict, fingerprints: Dict[str, str],
+                     targets: List[str], jobs: Optional[int] = None, no_cache: bool = False) -> bool:
+        """Build the targets, labelling each image with its fingerprint; returns True if all were built"""
+        limited = build_manager.limit_to(definition, fingerprints, targets)
+        bake_file = build_manager.write_bake_file(limited)
+        self.messenger.info(f"Wrote {os.path.relpath(bake_file)}")
+
+        waves = build_manager.build_order(limited, targets, dependencies_too=False)
+        jobs = max(1, min(jobs or os.cpu_count() or 1, len(targets)))
+        self.messenger.info(f"Building {len(targets)} image(s) with up to {jobs} in parallel")
+
+        started_at = time.perf_counter()
+        results = build_manager.build(bake_file, waves, jobs, no_cache)
+        elapsed = time.perf_counter() - started_at
+
+        # Remember what the images were built from, so unchanged ones are not rebuilt
+        state = BuildState(build_manager.project_dir)
+        for result in results:
+            if result['ok']:
+                state.set(result['target'], fingerprints[result['target']])
+        state.save()
+
+        self.show_report(limited, results)
+        self.messenger.note(f"{len(results)} image(s) in {elapsed:.1f}s")
+
+        failed = [result for result in results if not result['ok']]
+        if failed or len(results) < len(targets):
+            self.messenger.error(f"{len(failed)} image(s) failed, {len(targets) - len(results)} not built")
+            return False
+        return True
+
+    def show_report(self, definition: dict, results: List[dict]):
+        """Print per-target build times"""
+        table = Table(title="Built images")
+        table.add_column("Service")
+        table.add_column("Image")
+        table.add_column("Time", justify="right")
+        table.add_column("Status")
+
+        for result in results:
+            status = "[green]ok[/green]" if result['ok'] else f"[red]{result['error']}[/red]"
+            tags = ", ".join(definition['target'][result['target']].get('tags', []))
+            table.add_row(result['target'], tags, f"{result['seconds']:.1f} s", status)
+
+        self.console.print(table)
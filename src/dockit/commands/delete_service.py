@@ -6,6 +6,7 @@ import questionary
 from dockit.utilities.messenger import Messenger
 from dockit.utilities.service_manager import ServiceManager
 from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.service_definition import ServiceDefinition
 
 class DeleteServiceCommand:
     def __init__(self):
@@ -48,11 +49,10 @@ class DeleteServiceCommand:
     def _get_service_name(self) -> str:
         """Get and validate service name"""
         try:
-            # Get list of available services
-            services = []
-            if os.path.exists(self.services_dir):
-                services = [d for d in os.listdir(self.services_dir) 
-                          if os.path.isdir(os.path.join(self.services_dir, d))]
+            # Bundled services are listed too: deleting one of their versions hides it
+            self.service_manager.initialize_services()
+            self.service_manager.load_all_services()
+            services = self.service_manager.catalog.get_service_names()
 
             if not services:
                 self.messenger.warning("No services found")
@@ -72,19 +72,11 @@ class DeleteServiceCommand:
     def _get_version(self, service_name: str) -> str:
         """Get and validate version to delete"""
         try:
-            service_json_path = os.path.join(self.services_dir, service_name, "service.json")
-            if not os.path.exists(service_json_path):
-                self.messenger.error(f"Service configuration not found for '{service_name}'")
-                return None
-
-            with open(service_json_path, "r") as f:
-                service_config = json.load(f)
-
-            if not service_config:
+            versions = self.service_manager.get_service_versions(service_name)
+            if not versions:
                 self.messenger.error(f"No versions found for service '{service_name}'")
                 return None
 
-            versions = list(service_config.keys())
             version = questionary.select(
                 "Select version to delete:",
                 choices=versions
@@ -107,26 +99,38 @@ class DeleteServiceCommand:
             sys.exit(0)
 
     def _delete_service_version(self, service_name: str, version: str, delete_files: bool) -> bool:
-        """Delete service version and optionally its files"""
+        """Delete service version and optionally its files
+
+        Only the user's layer is written: a version that is also bundled is
+        hidden there with null, and only files under ~/.dockit are deleted.
+        """
         try:
             service_dir = os.path.join(self.services_dir, service_name)
             service_json_path = os.path.join(service_dir, "service.json")
             version_dir = os.path.join(service_dir, "conf", version)
 
-            # Load current configuration
-            with open(service_json_path, "r") as f:
-                service_config = json.load(f)
+            # Versions extending this one would be left without their base
+            sources = self.service_manager.catalog.get_sources(service_name) or []
+            dependents = ServiceDefinition.dependents(ServiceDefinition.load(sources), version)
+            if dependents:
+                self.messenger.error(f"Version '{version}' is extended by {', '.join(dependents)}; delete those first")
+                return False
+
+            # Load the user's configuration, if the service has one yet
+            service_config = {}
+            if os.path.exists(service_json_path):
+                with open(service_json_path, "r") as f:
+                    service_config = json.load(f)
 
             # Get files to delete if needed
             files_to_delete = []
-            if delete_files and version in service_config:
-                version_config = service_config[version]
-                if "files" in version_config:
-                    for file_info in version_config["files"].values():
-                        if "source" in file_info:
-                            file_path = os.path.join(service_dir, file_info["source"].replace("{version}", version))
-                            if os.path.exists(file_path):
-                                files_to_delete.append(file_path)
+            if delete_files:
+                version_config = self.service_manager.get_service_config(service_name, version) or {}
+                for file_info in (version_config.get("publishes") or {}).values():
+                    if "source" in file_info:
+                        file_path = os.path.join(service_dir, file_info["source"].format(version=version))
+                        if os.path.exists(file_path):
+                            files_to_delete.append(file_path)
 
             # Delete files if requested
             if delete_files:
@@ -142,15 +146,22 @@ class DeleteServiceCommand:
                     shutil.rmtree(version_dir)
                     self.messenger.info(f"Removed empty version directory: {version_dir}")
 
-            # Remove version from service.json
-            del service_config[version]
-
-            # Save updated service.json
-            with open(service_json_path, "w") as f:
-                json.dump(service_config, f, indent=4)
-
-            # If no versions left, remove service directory
-            if not service_config:
+            # Remove version from the user's service.json, hiding it when a lower layer still has it
+            lower = ServiceDefinition.load([source for source in sources if source != service_json_path])
+            if version in lower:
+                service_config[version] = None
+            else:
+                service_config.pop(version, None)
+
+            if service_config:
+                os.makedirs(service_dir, exist_ok=True)
+                with open(service_json_path, "w") as f:
+                    json.dump(service_config, f, indent=4)
+            elif os.path.exists(service_json_path):
+                os.remove(service_json_path)
+
+            # If nothing of the service is left in the user's layer, remove its directory
+            if os.path.isdir(service_dir) and not any(files for _, _, files in os.walk(service_dir)):
                 shutil.rmtree(service_dir)
                 self.messenger.info(f"Removed service directory: {service_dir}")
 
@@ -158,4 +169,4 @@ class DeleteServiceCommand:
 
         except Exception as e:
             self.messenger.error(f"Failed to delete service version: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
@@ -0,0 +1,134 @@
+import os
+import sys
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from rich.console import Console
+from rich.table import Table
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.service_manager import ServiceManager
+from dockit.utilities.gitignore_manager import GitignoreManager
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.stack_spec import StackSpec
+from dockit.utilities.template_loader import TemplateLoader
+from dockit.commands.generator import Generator
+
+TEMPLATES = ['docker-compose.yml.j2', 'Dockerfile.j2']
+
+# Jinja environment of the current process, shared by every project it generates
+_env = None
+
+def prepare_process():
+    """Load the catalog and compile the templates once per process (also the pool initializer)"""
+    global _env
+    Messenger.set_quiet(True)
+
+    service_manager = ServiceManager()
+    # Forked workers inherit the parent's loaded catalog; spawned ones read the up-to-date index
+    if service_manager.catalog is None:
+        service_manager.initialize_services()
+        service_manager.load_all_services()
+
+    if _env is None:
+        _env = TemplateLoader.create_environment(PathResolver.get_template_layers())
+        for name in TEMPLATES:
+            _env.get_template(name)
+
+def generate_project(project_dir: str, spec_name: str, options: dict) -> dict:
+    """Generate a single project from its stack spec; options are passed on to the Generator"""
+    started_at = time.perf_counter()
+    result = {'project': project_dir, 'services': 0, 'ok': False, 'error': None}
+    try:
+        spec = StackSpec.load(os.path.join(project_dir, spec_name))
+        result['services'] = len(spec.services)
+
+        result['error'] = ServiceManager().find_selection_error(spec.services)
+        if result['error'] is None:
+            result['ok'] = Generator(spec.services, project_dir, _env, **options).run()
+            if result['ok']:
+                GitignoreManager(project_dir).add_pattern('dockit/data/', 'Dockit data directory')
+            else:
+                result['error'] = "Generation failed"
+    except (OSError, ValueError) as e:
+        result['error'] = str(e)
+    except Exception as e:
+        # A broken service definition or template fails this project only, not the whole batch
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['seconds'] = time.perf_counter() - started_at
+    return result
+
+class GenerateCommand:
+    def __init__(self):
+        self.messenger = Messenger()
+        self.console = Console()
+
+    def run(self, projects: List[str], spec_name: str = 'dockit.yml', jobs: Optional[int] = None,
+            optimize: bool = False, fast_build: bool = False, build_cache: bool = False,
+            build_cache_dir: Optional[str] = None):
+        try:
+            project_dirs = self.find_projects(projects, spec_name)
+            if not project_dirs:
+                self.messenger.warning(f"No projects with a {spec_name} found")
+                return
+
+            options = {
+                'optimize': optimize,
+                'fast_build': fast_build,
+                'build_cache': PathResolver.resolve_build_cache_dir(build_cache, build_cache_dir),
+            }
+            jobs = max(1, min(jobs or os.cpu_count() or 1, len(project_dirs)))
+            self.messenger.info(f"Generating {len(project_dirs)} project(s) with {jobs} worker(s)")
+
+            started_at = time.perf_counter()
+            with Messenger.quiet_mode():
+                # Load the catalog and warm the template cache before forking so workers share them
+                prepare_process()
+                if jobs == 1:
+                    results = [generate_project(project_dir, spec_name, options) for project_dir in project_dirs]
+                else:
+                    with ProcessPoolExecutor(max_workers=jobs, initializer=prepare_process) as pool:
+                        count = len(project_dirs)
+                        results = list(pool.map(generate_project, project_dirs, [spec_name] * count, [options] * count))
+            elapsed = time.perf_counter() - started_at
+
+            self.show_report(results)
+
+            failed = [result for result in results if not result['ok']]
+            self.messenger.note(
+                f"{len(results)} project(s) in {elapsed:.2f}s ({len(results) / elapsed:.1f} projects/s)"
+            )
+            if failed:
+                self.messenger.error(f"{len(failed)} project(s) failed")
+                sys.exit(1)
+            self.messenger.success("All projects generated successfully!")
+        except KeyboardInterrupt:
+            self.messenger.info("\nOperation cancelled by user")
+            sys.exit(0)
+
+    def find_projects(self, patterns: List[str], spec_name: str) -> List[str]:
+        """Expand project globs into the directories that contain a stack spec"""
+        project_dirs = []
+        for pattern in patterns:
+            for path in sorted(glob.glob(pattern)):
+                if os.path.isdir(path) and path not in project_dirs:
+                    if os.path.exists(os.path.join(path, spec_name)):
+                        project_dirs.append(path)
+                    else:
+                        self.messenger.warning(f"Skipping {path}: no {spec_name}")
+        return project_dirs
+
+    def show_report(self, results: List[dict]):
+        """Print per-project timings"""
+        table = Table(title="Generated projects")
+        table.add_column("Project")
+        table.add_column("Services", justify="right")
+        table.add_column("Time", justify="right")
+        table.add_column("Status")
+
+        for result in results:
+            status = "[green]ok[/green]" if result['ok'] else f"[red]{result['error']}[/red]"
+            table.add_row(result['project'], str(result['services']), f"{result['seconds'] * 1000:.0f} ms", status)
+
+        self.console.print(table)
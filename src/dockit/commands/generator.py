@@ -1,48 +1,66 @@
 from dockit.utilities.messenger import Messenger
-from dockit.utilities.debugger import Debugger
 from dockit.utilities.service_manager import ServiceManager
 import os
-import json
-from jinja2 import Environment, FileSystemLoader
 from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.template_loader import TemplateLoader
+from dockit.utilities.file_writer import FileWriter
+from dockit.utilities.dockerfile_optimizer import DockerfileOptimizer
+from dockit.utilities.runtime_stage import RuntimeStage, SNAPSHOT_LIBS
+from dockit.utilities.shared_base import SharedBase
+from dockit.utilities.fast_build import FastBuild
 class Generator:
-    def __init__(self, selected_services: dict):
+    def __init__(self, selected_services: dict, project_dir: str = '.', env=None, optimize: bool = False,
+                 fast_build: bool = False, build_cache: str = None, writer: FileWriter = None):
         """
         :param selected_services: dict like { "php": "8.2", "mysql": "8.0" }
+        :param project_dir: directory the docker-compose.yml and dockit/ build contexts are written to
+        :param env: a prepared Jinja environment to share between generators
+        :param optimize: emit layer-optimized Dockerfiles with BuildKit cache mounts
+        :param fast_build: install all PHP extensions in one install-php-extensions step
+        :param build_cache: directory to export/import a local BuildKit cache per image, or None
+        :param writer: where generated files go; a PlanWriter only records them
         """
         self.selected_services = selected_services
+        self.project_dir = project_dir
+        self.optimize = optimize
+        self.fast_build = fast_build
+        self.build_cache = build_cache
         self.messenger = Messenger()
-        self.templates_dir = PathResolver.get_templates_dir()
+        # Templates overridden in ~/.dockit/templates win over the bundled ones
+        self.template_layers = PathResolver.get_template_layers()
         self.service_manager = ServiceManager()
-        self.env = Environment(
-            loader=FileSystemLoader(self.templates_dir),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-        # Add custom tojson filter with ensure_ascii=False
-        self.env.filters['tojson'] = lambda value: json.dumps(value, ensure_ascii=False)
-        # Add custom dd filter
-        self.env.filters['dd'] = Debugger.dd
+        # Uses shipped precompiled templates when unchanged, else the bytecode cache in ~/.dockit/cache
+        self.env = env or TemplateLoader.create_environment(self.template_layers)
+        # Only files whose content changed are rewritten, keeping Docker build caches valid
+        self.writer = writer or FileWriter()
 
     def run(self):
         self.messenger.sweet("[+] Starting generation...")
 
         # Validate and resolve services before generation
-        resolved = self.service_manager.resolve_service_configs(self.selected_services)
+        resolved = self.service_manager.resolve_service_configs(self.selected_services, self.project_dir, self.writer)
         if resolved is None:  # Explicitly check for None to handle validation failures
             self.messenger.error("Service validation failed. Operation cancelled.")
-            return
+            return False
 
-        self.generate_docker_compose(resolved)
+        if not self.generate_docker_compose(resolved):
+            return False
+        self.messenger.info(self.writer.summary())
         self.messenger.success("Docker Compose file generated successfully!")
+        return True
 
-    def generate_docker_compose(self, services: dict):
+    def generate_docker_compose(self, services: dict) -> bool:
         """Generate docker-compose.yml file based on selected services"""
         try:
-            # Get current directory name as project name
-            project_name = os.path.basename(os.getcwd())
-            # Convert to slug format (lowercase, replace spaces with dashes)
-            project_name = project_name.lower().replace(' ', '-')
+            # Get project directory name as project name
+            project_name = PathResolver.get_project_name(self.project_dir)
+
+            # Steps shared by services on the same base image go into a common base image
+            builds = {
+                service_name: self.prepare_build(service_config['build'])
+                for service_name, service_config in services.items() if 'build' in service_config
+            }
+            bases = self.generate_shared_bases(builds)
 
             # Generate Dockerfiles and update compose configuration
             for service_name, service_config in services.items():
@@ -52,7 +70,12 @@ class Generator:
                     service_config['image'] = f"dockit-{service_name}-{self.selected_services[service_name]}"
 
                     # Generate Dockerfile
-                    self.generate_dockerfile(service_name, service_config)
+                    self.generate_dockerfile(service_name, service_config, builds[service_name])
+                    for base in bases:
+                        if service_name in base['services']:
+                            service_config['base'] = base
+                    if self.build_cache:
+                        service_config['cache'] = self.cache_entries(f"{service_name}-{self.selected_services[service_name]}")
                     
                     # Update compose.build using only the version number
                     version = service_config['build']['base_image'].split(':')[1].split('-')[0]
@@ -61,6 +84,9 @@ class Generator:
                         'dockerfile': "Dockerfile",
                     }
 
+                # Dependencies with a healthcheck are waited for until they are healthy
+                service_config['depends_on'] = self.dependency_conditions(service_config, services)
+
                 # Handle publishable files
                 if 'publishable_files' in service_config:
                     if 'volumes' not in service_config['compose']:
@@ -79,43 +105,94 @@ class Generator:
             template = self.env.get_template('docker-compose.yml.j2')
             output = template.render(
                 services=services,
-                project_name=project_name
+                project_name=project_name,
+                bases=bases
             )
 
-            # Ensure the directory exists
-            os.makedirs('.', exist_ok=True)
-            
             # Write the docker-compose.yml file
-            with open('docker-compose.yml', 'w') as f:
-                f.write(output)
-            
-            self.messenger.info('Generated docker-compose.yml')
+            if self.writer.write(os.path.join(self.project_dir, 'docker-compose.yml'), output):
+                self.messenger.info('Generated docker-compose.yml')
+            else:
+                self.messenger.info('docker-compose.yml is up to date')
+            return True
         except Exception as e:
             self.messenger.error(f"Error generating docker-compose.yml: {str(e)}")
+            return False
+
+
+    @staticmethod
+    def dependency_conditions(service_config: dict, services: dict) -> dict:
+        """Map each dependency of a service to the compose condition to start it on"""
+        conditions = {}
+        for dependency in service_config.get('compose', {}).get('depends_on', []):
+            healthcheck = 'healthcheck' in services.get(dependency, {}).get('compose', {})
+            conditions[dependency] = 'service_healthy' if healthcheck else 'service_started'
+        return conditions
+
+    def prepare_build(self, build: dict) -> dict:
+        """Apply the build rewrites selected for this generation to a service build block"""
+        return FastBuild.rewrite(build) if self.fast_build else build
 
+    def render_dockerfile(self, build: dict, compose: dict, snapshot_libs: bool) -> str:
+        """Render Dockerfile.j2 for a build block"""
+        runtime = RuntimeStage.plan(build, self.optimize)
+        return self.env.get_template("Dockerfile.j2").render(
+            build=build,
+            compose=compose,
+            optimize=self.optimize,
+            plan=DockerfileOptimizer.optimize(build) if self.optimize else None,
+            runtime=runtime,
+            snapshot_libs=SNAPSHOT_LIBS if snapshot_libs else None
+        )
+
+    def cache_entries(self, name: str) -> dict:
+        """cache_from/cache_to entries keeping an image's BuildKit cache in its own local directory"""
+        directory = os.path.join(os.path.abspath(os.path.expanduser(self.build_cache)), name)
+        return {
+            'from': [f"type=local,src={directory}"],
+            # mode=max also exports the layers of the builder stage
+            'to': [f"type=local,dest={directory},mode=max"],
+        }
+
+    def generate_shared_bases(self, builds: dict) -> list:
+        """Write the shared base image Dockerfiles and rebase the member builds on them"""
+        bases = []
+        for group in SharedBase.plan(builds):
+            members = [builds[service_name] for service_name in group['services']]
+            # The runtime stages need to know which libraries came with the original image
+            snapshot_libs = any(build.get('runtime') for build in members)
+            dockerfile = self.render_dockerfile(group['build'], {}, snapshot_libs)
+            image = SharedBase.image_name(dockerfile)
+
+            if self.writer.write(os.path.join(self.project_dir, 'dockit', image, 'Dockerfile'), dockerfile):
+                self.messenger.info(f"Generated shared base image {image} for {', '.join(group['services'])}")
 
-    def generate_dockerfile(self, service_name: str, service_config: dict):
+            for service_name in group['services']:
+                builds[service_name] = SharedBase.remainder(builds[service_name], group['build'], image)
+            base = {'name': image, 'image': image, 'context': f"./dockit/{image}", 'services': group['services']}
+            if self.build_cache:
+                base['cache'] = self.cache_entries(image)
+            bases.append(base)
+        return bases
+
+    def generate_dockerfile(self, service_name: str, service_config: dict, build: dict = None):
         """Generate Dockerfile for a service"""
         try:
-            # Get the template path
-            template_path = f"Dockerfile.j2"
-            
             # Render the Dockerfile template
-            template = self.env.get_template(template_path)
-            dockerfile = template.render(
-                build=service_config['build'],
-                compose=service_config['compose']
-            )
+            build = build or self.prepare_build(service_config['build'])
+            # On a shared base image the base libraries were already recorded by the base
+            on_shared_base = build['base_image'] != service_config['build']['base_image']
+            snapshot_libs = bool(build.get('runtime')) and not on_shared_base
+            dockerfile = self.render_dockerfile(build, service_config['compose'], snapshot_libs)
             
             # Create build directory using only the version number
             version = service_config['build']['base_image'].split(':')[1].split('-')[0]
-            build_dir = f"./dockit/{service_name}-{version}"
-            os.makedirs(build_dir, exist_ok=True)
+            build_dir = os.path.join(self.project_dir, 'dockit', f"{service_name}-{version}")
             
             # Write the Dockerfile
-            with open(f"{build_dir}/Dockerfile", 'w') as f:
-                f.write(dockerfile)
-            
-            self.messenger.info(f'Generated Dockerfile for {service_name}')
+            if self.writer.write(os.path.join(build_dir, 'Dockerfile'), dockerfile):
+                self.messenger.info(f'Generated Dockerfile for {service_name}')
+            else:
+                self.messenger.info(f'Dockerfile for {service_name} is up to date')
         except Exception as e:
             self.messenger.error(f'Error generating Dockerfile for {service_name}: {str(e)}')
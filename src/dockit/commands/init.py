@@ -1,11 +1,15 @@
 import questionary
+import sys
+import time
+from typing import List, Optional
 from rich import print
 from dockit.utilities.messenger import Messenger
 from dockit.utilities.service_manager import ServiceManager
 from dockit.utilities.gitignore_manager import GitignoreManager
 from dockit.utilities.docker_manager import DockerManager
+from dockit.utilities.stack_spec import StackSpec
+from dockit.utilities.path_resolver import PathResolver
 from dockit.commands.generator import Generator
-import os
 
 class InitCommand:
     def __init__(self):
@@ -13,37 +17,78 @@ class InitCommand:
         self.service_manager = ServiceManager()
         self.gitignore_manager = GitignoreManager()
         self.docker_manager = DockerManager()
-        self.service_manager.initialize_services()
-        self.service_manager.load_all_services()
 
-    def run(self):
+    def run(self, spec: Optional[str] = None, services: Optional[List[str]] = None,
+            yes: bool = False, start: bool = False, optimize: bool = False, fast_build: bool = False,
+            build_cache: bool = False, build_cache_dir: Optional[str] = None):
         self.messenger.info("Dockit init")
 
-        selected_services = self.service_manager.collect_services()
-        if not selected_services:
-            self.messenger.warning("No services selected. Exiting.")
-            return
+        self.service_manager.initialize_services()
+        self.service_manager.load_all_services()
 
-        selected_versions = self.service_manager.collect_versions(selected_services)
+        if spec or services:
+            # Batch mode: the stack comes from --spec/--service instead of prompts
+            stack_spec = self.load_selection(spec, services)
+            if stack_spec is None:
+                sys.exit(1)
+            selected_versions = stack_spec.services
+            start = start or stack_spec.start
+        else:
+            selected_services = self.service_manager.collect_services()
+            if not selected_services:
+                self.messenger.warning("No services selected. Exiting.")
+                return
 
-        confirmed = self.show_summary(selected_versions)
+            selected_versions = self.service_manager.collect_versions(selected_services)
+
+        confirmed = self.show_summary(selected_versions, yes)
         if not confirmed:
             self.messenger.warning("Operation cancelled.")
             return
 
         # 🔥 Call the Generator
-        generator = Generator(selected_versions)
-        generator.run()
+        started_at = time.perf_counter()
+        generator = Generator(
+            selected_versions,
+            optimize=optimize,
+            fast_build=fast_build,
+            build_cache=PathResolver.resolve_build_cache_dir(build_cache, build_cache_dir)
+        )
+        if not generator.run():
+            sys.exit(1)
+        self.messenger.note(f"Generated {len(selected_versions)} service(s) in {time.perf_counter() - started_at:.3f}s")
 
         # Update .gitignore if it exists
         self.gitignore_manager.add_pattern('dockit/data/', 'Dockit data directory')
 
         # Ask if user wants to start the containers
-        if questionary.confirm("Would you like to start the containers now?", default=True).ask():
+        if yes:
+            if start:
+                self.docker_manager.start_containers()
+        elif questionary.confirm("Would you like to start the containers now?", default=True).ask():
             self.docker_manager.start_containers()
 
-    def show_summary(self, selected_versions):
+    def load_selection(self, spec: Optional[str], services: Optional[List[str]]) -> Optional[StackSpec]:
+        """Build the stack from a spec file and/or --service options and check it against the catalog"""
+        try:
+            stack_spec = StackSpec.load(spec) if spec else StackSpec()
+            # --service options override versions from the spec
+            stack_spec.services.update(StackSpec.parse_services(services or []))
+        except (OSError, ValueError) as e:
+            self.messenger.error(f"Invalid stack spec: {str(e)}")
+            return None
+
+        error = self.service_manager.find_selection_error(stack_spec.services)
+        if error:
+            self.messenger.error(error)
+            return None
+
+        return stack_spec
+
+    def show_summary(self, selected_versions, yes: bool = False):
         self.messenger.success("Selected configuration:")
         for service, version in selected_versions.items():
             print(f"• {service} → {version}")
-        return questionary.confirm("Proceed with generating configuration?", default=True).ask()
\ No newline at end of file
+        if yes:
+            return True
+        return questionary.confirm("Proceed with generating configuration?", default=True).ask()
@@ -0,0 +1,76 @@
+import re
+import sys
+from typing import List, Optional
+from rich.console import Console
+from rich.text import Text
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.docker_manager import DockerManager
+from dockit.utilities.log_multiplexer import LogFilter, LogMultiplexer
+
+SERVICE_COLORS = ["cyan", "magenta", "green", "blue", "yellow", "bright_cyan", "bright_magenta", "bright_green"]
+LEVEL_STYLES = {"warning": "yellow", "error": "red", "critical": "bold red"}
+
+class LogsCommand:
+    def __init__(self):
+        self.messenger = Messenger()
+        self.console = Console()
+        self.docker_manager = DockerManager()
+        # Service name -> color of its prefix, and the width the prefixes are padded to
+        self.colors = {}
+        self.width = 0
+
+    def run(self, services: Optional[List[str]] = None, follow: bool = False, tail: int = 100,
+            grep: Optional[str] = None, level: Optional[str] = None, buffer_size: int = 1000,
+            project_dir: str = '.'):
+        try:
+            try:
+                log_filter = LogFilter(grep, level)
+            except re.error as e:
+                self.messenger.error(f"Invalid --grep pattern: {str(e)}")
+                sys.exit(1)
+            except ValueError as e:
+                self.messenger.error(str(e))
+                sys.exit(1)
+
+            if not self.docker_manager.is_docker_installed():
+                self.messenger.error("Docker not found. Please make sure Docker is installed and running.")
+                sys.exit(1)
+
+            containers = self.docker_manager.get_container_status(project_dir)
+            if services:
+                unknown = set(services) - {container['service'] for container in containers}
+                if unknown:
+                    self.messenger.error(f"No containers for: {', '.join(sorted(unknown))}")
+                    sys.exit(1)
+                containers = [container for container in containers if container['service'] in services]
+            if not containers:
+                self.messenger.warning("No containers found for this project. Start them with 'dockit up'.")
+                return
+
+            multiplexer = LogMultiplexer(self.docker_manager, containers, buffer_size, log_filter)
+            self.width = max(len(service) for service in multiplexer.buffers)
+            self.colors = {
+                service: SERVICE_COLORS[index % len(SERVICE_COLORS)]
+                for index, service in enumerate(sorted(multiplexer.buffers))
+            }
+
+            if follow:
+                multiplexer.follow(self.print_lines, tail)
+            else:
+                for service, lines in sorted(multiplexer.tail(tail).items()):
+                    self.print_lines(service, lines, 0)
+
+            for service, error in multiplexer.errors.items():
+                self.messenger.warning(f"Could not read the logs of {service}: {error}")
+        except KeyboardInterrupt:
+            self.messenger.info("\nOperation cancelled by user")
+            sys.exit(0)
+
+    def print_lines(self, service: str, lines: List[str], dropped: int):
+        """Print lines prefixed with their service, colored by level"""
+        prefix = (f"{service:<{self.width}} | ", self.colors.get(service, "white"))
+        if dropped:
+            self.console.print(Text.assemble(prefix, (f"... {dropped} line(s) dropped, output too fast", "dim")))
+        for line in lines:
+            style = LEVEL_STYLES.get(LogFilter.level_of(line), "")
+            self.console.print(Text.assemble(prefix, (line, style)), soft_wrap=True)
@@ -0,0 +1,171 @@
+import os
+import sys
+from typing import List, Optional
+import questionary
+import yaml
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.service_manager import ServiceManager
+from dockit.utilities.gitignore_manager import GitignoreManager
+from dockit.utilities.docker_manager import DockerManager
+from dockit.utilities.build_manager import BuildManager
+from dockit.utilities.file_writer import FileWriter
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.stack_spec import StackSpec
+from dockit.utilities.compose_plan import ComposePlan, PlanWriter, COMPOSE_FILE
+from dockit.commands.generator import Generator
+from dockit.commands.up import UpCommand
+
+DEFAULT_SPEC = "dockit.yml"
+
+ACTIONS = {
+    "create": "[green]create[/green]",
+    "recreate": "[yellow]recreate[/yellow]",
+    "build": "[cyan]build[/cyan]",
+    "remove": "[red]remove[/red]",
+}
+
+class PlanCommand:
+    def __init__(self):
+        self.messenger = Messenger()
+        self.console = Console()
+        self.service_manager = ServiceManager()
+        self.docker_manager = DockerManager()
+
+    def run(self, spec: Optional[str] = None, services: Optional[List[str]] = None, apply: bool = False,
+            yes: bool = False, jobs: Optional[int] = None, optimize: bool = False, fast_build: bool = False,
+            build_cache: bool = False, build_cache_dir: Optional[str] = None, project_dir: str = '.'):
+        try:
+            self.service_manager.initialize_services()
+            self.service_manager.load_all_services()
+
+            selected_versions = self.load_selection(spec, services, project_dir)
+            if selected_versions is None:
+                sys.exit(1)
+
+            # Generate into memory: nothing in the project changes until the plan is applied
+            writer = PlanWriter()
+            generator = Generator(
+                selected_versions,
+                project_dir,
+                optimize=optimize,
+                fast_build=fast_build,
+                build_cache=PathResolver.resolve_build_cache_dir(build_cache, build_cache_dir),
+                writer=writer
+            )
+            with Messenger.quiet_mode():
+                generated = generator.run()
+            if not generated:
+                self.messenger.error("Could not generate the stack; 'dockit validate' shows what is wrong with the catalog")
+                sys.exit(1)
+
+            plan = self.make_plan(writer, project_dir)
+            self.show_plan(plan, writer, project_dir)
+            if not apply:
+                return
+            if not plan.has_changes() and not writer.written:
+                return
+
+            if not yes and not questionary.confirm("Apply these changes?", default=True).ask():
+                self.messenger.warning("Operation cancelled.")
+                return
+
+            written = writer.commit(FileWriter(), self.service_manager.store)
+            GitignoreManager(project_dir).add_pattern('dockit/data/', 'Dockit data directory')
+            self.messenger.success(f"Updated {len(written)} file(s)")
+
+            if not self.restart(plan, jobs, project_dir):
+                sys.exit(1)
+        except KeyboardInterrupt:
+            self.messenger.info("\nOperation cancelled by user")
+            sys.exit(0)
+
+    def load_selection(self, spec: Optional[str], services: Optional[List[str]], project_dir: str = '.'):
+        """The services to generate, from the spec (dockit.yml by default) and --service options"""
+        default_spec = os.path.join(project_dir, DEFAULT_SPEC)
+        if spec is None and os.path.exists(default_spec):
+            spec = default_spec
+        if spec is None and not services:
+            self.messenger.error(f"Nothing to plan: pass --spec or --service, or add a {DEFAULT_SPEC}")
+            return None
+
+        try:
+            stack_spec = StackSpec.load(spec) if spec else StackSpec()
+            stack_spec.services.update(StackSpec.parse_services(services or []))
+        except (OSError, ValueError) as e:
+            self.messenger.error(f"Invalid stack spec: {str(e)}")
+            return None
+
+        error = self.service_manager.find_selection_error(stack_spec.services)
+        if error:
+            self.messenger.error(error)
+            return None
+        return stack_spec.services
+
+    def make_plan(self, writer: PlanWriter, project_dir: str = '.') -> ComposePlan:
+        """Compare the generated stack with the docker-compose.yml and files in place"""
+        compose_path = os.path.join(project_dir, COMPOSE_FILE)
+        try:
+            current = BuildManager(project_dir).load_compose()
+        except FileNotFoundError:
+            current = None
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            self.messenger.warning(f"Could not read the current {COMPOSE_FILE}, every service is recreated: {str(e)}")
+            current = None
+
+        if compose_path in writer.pending:
+            planned = yaml.safe_load(writer.pending[compose_path]) or {}
+        else:
+            planned = current or {}
+
+        changed_files = {
+            os.path.relpath(path, project_dir): "+" if path in writer.created else "~"
+            for path in writer.written if path != compose_path
+        }
+        return ComposePlan(current, planned, changed_files)
+
+    def show_plan(self, plan: ComposePlan, writer: PlanWriter, project_dir: str = '.'):
+        """Print the services that change and why"""
+        if not plan.has_changes():
+            if writer.written:
+                files = ', '.join(os.path.relpath(path, project_dir) for path in writer.written)
+                self.messenger.info(f"No service changes; files to update: {files}")
+            else:
+                self.messenger.success("Everything is up to date")
+            return
+
+        table = Table(title="Plan")
+        table.add_column("Service")
+        table.add_column("Action")
+        table.add_column("Changes")
+        for name, entry in plan.services.items():
+            if entry["action"] != "keep":
+                table.add_row(name, ACTIONS[entry["action"]], escape("\n".join(entry["changes"])))
+        self.console.print(table)
+
+        kept = plan.with_action("keep")
+        if kept:
+            self.messenger.note(f"Left running: {', '.join(kept)}")
+
+    def restart(self, plan: ComposePlan, jobs: Optional[int] = None, project_dir: str = '.') -> bool:
+        """Build the changed images, then recreate only the affected services"""
+        if not plan.affected and not plan.removed:
+            return True
+        if not self.docker_manager.is_docker_installed():
+            self.messenger.error("Docker not found. The files are updated; run 'dockit up' once Docker is running.")
+            return False
+
+        up = UpCommand()
+        build_manager = BuildManager(project_dir)
+        buildable = build_manager.bake_definition(build_manager.load_compose())['target']
+        targets = [name for name in plan.affected + plan.with_action("build") if name in buildable]
+        if targets:
+            definition, fingerprints = up.build_cmd.load_definition(build_manager, targets)
+            if not up.build_stale(build_manager, definition, fingerprints, targets, jobs=jobs):
+                return False
+
+        return self.docker_manager.start_containers(
+            build=False, services=plan.affected, recreate=True, remove_orphans=bool(plan.removed)
+        )
@@ -1,16 +1,21 @@
 import os
 import sys
-import shutil
-import questionary
-import typer
 from dockit.utilities.messenger import Messenger
 from dockit.utilities.service_manager import ServiceManager
 from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.directory_sync import DirectorySync
+from dockit.utilities.file_writer import FileWriter
 
 class PublishCommand:
     def __init__(self):
         self.messenger = Messenger()
         self.service_manager = ServiceManager()
+        # A reference copy to start customizing from; ~/.dockit/services and templates only hold overrides
+        self.services_dir = os.path.join(PathResolver.get_reference_dir(), "services")
+        self.templates_dir = os.path.join(PathResolver.get_reference_dir(), "templates")
+        # Republishing only copies files whose content changed and swaps each directory in whole
+        self.sync = DirectorySync()
+        self.writer = FileWriter()
 
     def run(self):
         """Run the publish command with force mode"""
@@ -31,6 +36,8 @@ class PublishCommand:
         # Track if any items were published
         services_published = self.publish_services(force)
         templates_published = self.publish_templates(force)
+        if force and not (services_published or templates_published):
+            self.messenger.info("Services and templates are up to date")
         
         # If nothing was published and force is False, show warning
         if not (services_published or templates_published) and not force:
@@ -40,7 +47,7 @@ class PublishCommand:
         return True
 
     def publish_services(self, force: bool) -> bool:
-        """Publish services to user's home directory"""
+        """Publish services to the reference directory"""
         predefined_services_path = PathResolver.get_predefined_services_path()
         if not os.path.exists(predefined_services_path):
             self.messenger.warning("No predefined services found")
@@ -49,29 +56,28 @@ class PublishCommand:
         published = False
         for service_name in os.listdir(predefined_services_path):
             source_path = os.path.join(predefined_services_path, service_name)
-            target_path = os.path.join(self.service_manager.services_dir, service_name)
+            target_path = os.path.join(self.services_dir, service_name)
             
             if os.path.isdir(source_path):
                 if os.path.exists(target_path):
                     if force:
-                        shutil.rmtree(target_path)
-                        shutil.copytree(source_path, target_path)
-                        self.messenger.info(f"Republished service: {service_name}")
-                        published = True
+                        if self.sync.sync(source_path, target_path):
+                            self.messenger.info(f"Republished service: {service_name}")
+                            published = True
                     else:
                         self.messenger.warning(f"Service already exists: {service_name}")
                 else:
-                    shutil.copytree(source_path, target_path)
+                    self.sync.sync(source_path, target_path)
                     #self.messenger.info(f"Published service: {service_name}")
                     published = True
         
         if published:
-            self.messenger.success(f"Services published to {PathResolver.get_services_dir()}")
+            self.messenger.success(f"Services published to {self.services_dir}")
            
         return published
 
     def publish_templates(self, force: bool) -> bool:
-        """Publish templates to user's home directory"""
+        """Publish templates to the reference directory"""
         predefined_templates_path = PathResolver.get_predefined_templates_path()
         if not os.path.exists(predefined_templates_path):
             self.messenger.warning("No predefined templates found")
@@ -80,41 +86,44 @@ class PublishCommand:
         published = False
         for template_name in os.listdir(predefined_templates_path):
             source_path = os.path.join(predefined_templates_path, template_name)
-            target_path = os.path.join(self.service_manager.templates_dir, template_name)
+            target_path = os.path.join(self.templates_dir, template_name)
             
             if os.path.isdir(source_path):
                 if os.path.exists(target_path):
                     if force:
-                        shutil.rmtree(target_path)
-                        shutil.copytree(source_path, target_path)
-                        self.messenger.info(f"Republished template: {template_name}")
-                        published = True
+                        if self.sync.sync(source_path, target_path):
+                            self.messenger.info(f"Republished template: {template_name}")
+                            published = True
                     else:
                         self.messenger.warning(f"Template already exists: {template_name}")
                 else:
-                    shutil.copytree(source_path, target_path)
+                    self.sync.sync(source_path, target_path)
                     published = True
             elif os.path.isfile(source_path):
                 if os.path.exists(target_path):
                     if force:
-                        shutil.copy2(source_path, target_path)
-                        self.messenger.info(f"Republished template file: {template_name}")
-                        published = True
+                        if self.writer.copy(source_path, target_path):
+                            self.messenger.info(f"Republished template file: {template_name}")
+                            published = True
                     else:
                         self.messenger.warning(f"Template file already exists: {template_name}")
                 else:
-                    shutil.copy2(source_path, target_path)
+                    self.writer.copy(source_path, target_path)
                     #self.messenger.info(f"Published template file: {template_name}")
                     published = True
 
         if published:
-            self.messenger.success(f"Templates published to {PathResolver.get_templates_dir()}")
+            self.messenger.success(f"Templates published to {self.templates_dir}")
+            self.messenger.note(
+                f"Copy the files you want to change into {PathResolver.get_home_dir()}/services or templates; "
+                f"{PathResolver.get_reference_dir()} itself is never read"
+            )
         
         return published
 
     def initialize_directories(self):
-        """Initialize the base directories for services and templates"""
-        os.makedirs(self.service_manager.services_dir, exist_ok=True)
-        os.makedirs(self.service_manager.templates_dir, exist_ok=True)
+        """Initialize the reference directories for services and templates"""
+        os.makedirs(self.services_dir, exist_ok=True)
+        os.makedirs(self.templates_dir, exist_ok=True)
         #self.messenger.info("Initialized base directories")
         
@@ -0,0 +1,41 @@
+import sys
+import time
+from rich.console import Console
+from rich.live import Live
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.docker_manager import DockerManager
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.status_board import StatusBoard
+
+class StatusCommand:
+    def __init__(self):
+        self.messenger = Messenger()
+        self.console = Console()
+        self.docker_manager = DockerManager()
+
+    def run(self, watch: bool = False, project_dir: str = '.'):
+        try:
+            if not self.docker_manager.is_docker_installed():
+                self.messenger.error("Docker not found. Please make sure Docker is installed and running.")
+                sys.exit(1)
+
+            project = PathResolver.get_project_name(project_dir)
+            # Events from this second on are replayed, so nothing between the listing and the stream is lost
+            since = int(time.time())
+            board = StatusBoard(self.docker_manager.get_container_status(project_dir))
+
+            if not watch:
+                self.console.print(board.render(project))
+                return
+
+            events = self.docker_manager.watch_events(project_dir, since=since)
+            try:
+                with Live(board.render(project), console=self.console, auto_refresh=False) as live:
+                    for event in events:
+                        if board.apply(event):
+                            live.update(board.render(project), refresh=True)
+            finally:
+                events.close()
+        except KeyboardInterrupt:
+            self.messenger.info("\nOperation cancelled by user")
+            sys.exit(0)
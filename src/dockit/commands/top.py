@@ -0,0 +1,124 @@
+import csv
+import sys
+import json
+from typing import List, Optional
+from rich.console import Console
+from rich.live import Live
+from rich.table import Table
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.docker_manager import DockerManager
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.build_manager import BuildManager
+from dockit.utilities.stats_monitor import StatsMonitor, FIELDS
+
+FORMATS = ("table", "csv", "json")
+
+class TopCommand:
+    def __init__(self):
+        self.messenger = Messenger()
+        self.console = Console()
+        self.docker_manager = DockerManager()
+
+    def run(self, services: Optional[List[str]] = None, interval: float = 1.0, output_format: str = "table",
+            output: Optional[str] = None, count: int = 0, project_dir: str = '.'):
+        try:
+            if output_format not in FORMATS:
+                self.messenger.error(f"Unknown format '{output_format}', use one of: {', '.join(FORMATS)}")
+                sys.exit(1)
+            if output and output_format == "table":
+                self.messenger.error("--output needs --format csv or --format json")
+                sys.exit(1)
+
+            try:
+                containers = self.project_containers(project_dir, services)
+            except (OSError, ValueError) as e:
+                self.messenger.error(f"Could not read docker-compose.yml: {str(e)}")
+                sys.exit(1)
+            if not containers:
+                self.messenger.error("No services to monitor")
+                sys.exit(1)
+
+            if not self.docker_manager.is_docker_installed():
+                self.messenger.error("Docker not found. Please make sure Docker is installed and running.")
+                sys.exit(1)
+
+            monitor = StatsMonitor(self.docker_manager, containers, interval)
+            project = PathResolver.get_project_name(project_dir)
+            if output_format == "table":
+                with Live(self.render(project, []), console=self.console, auto_refresh=False) as live:
+                    monitor.run(lambda rows: live.update(self.render(project, rows), refresh=True), count)
+            elif output:
+                with open(output, "w", newline="") as f:
+                    writer = self.sample_writer(f, output_format)
+                    with Live(self.render(project, []), console=self.console, auto_refresh=False) as live:
+                        def on_sample(rows):
+                            writer(rows)
+                            f.flush()
+                            live.update(self.render(project, rows), refresh=True)
+                        monitor.run(on_sample, count)
+                self.messenger.success(f"Samples written to {output}")
+            else:
+                writer = self.sample_writer(sys.stdout, output_format)
+                monitor.run(lambda rows: (writer(rows), sys.stdout.flush()), count)
+
+            for container, error in monitor.errors.items():
+                self.messenger.warning(f"Could not read the stats of {container}: {error}")
+        except KeyboardInterrupt:
+            self.messenger.info("\nOperation cancelled by user")
+            sys.exit(0)
+
+    @staticmethod
+    def project_containers(project_dir: str, services: Optional[List[str]] = None) -> dict:
+        """Container name -> service for the services of the generated docker-compose.yml"""
+        compose = BuildManager(project_dir).load_compose()
+        project = compose.get("name") or PathResolver.get_project_name(project_dir)
+
+        containers = {}
+        for name, service in compose["services"].items():
+            service = service or {}
+            # Shared base images are only built, never started
+            if service.get("scale") == 0 or (services and name not in services):
+                continue
+            containers[service.get("container_name") or f"{project}_{name}"] = name
+        if services and set(services) - set(containers.values()):
+            raise ValueError(f"unknown service(s): {', '.join(sorted(set(services) - set(containers.values())))}")
+        return containers
+
+    @staticmethod
+    def sample_writer(stream, output_format: str):
+        """Function writing the rows of one sample as CSV (header first) or as JSON lines"""
+        if output_format == "json":
+            return lambda rows: stream.writelines(json.dumps(row) + "\n" for row in rows)
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+        return writer.writerows
+
+    @staticmethod
+    def render(project: str, rows: List[dict]) -> Table:
+        table = Table(title=f"{project} resource usage")
+        table.add_column("Service")
+        table.add_column("Containers", justify="right")
+        table.add_column("CPU %", justify="right")
+        table.add_column("Memory", justify="right")
+        table.add_column("Mem %", justify="right")
+        table.add_column("Net rx/tx /s", justify="right")
+        table.add_column("Block read/write /s", justify="right")
+        for row in rows:
+            table.add_row(
+                row["service"],
+                str(row["containers"]),
+                f"{row['cpu_percent']:.1f}",
+                f"{TopCommand.size(row['mem_bytes'])} / {TopCommand.size(row['mem_limit'])}",
+                f"{row['mem_percent']:.1f}",
+                f"{TopCommand.size(row['net_rx_rate'])} / {TopCommand.size(row['net_tx_rate'])}",
+                f"{TopCommand.size(row['block_read_rate'])} / {TopCommand.size(row['block_write_rate'])}",
+            )
+        return table
+
+    @staticmethod
+    def size(value: float) -> str:
+        for unit in ("B", "KiB", "MiB", "GiB"):
+            if value < 1024:
+                return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+            value /= 1024
+        return f"{value:.1f} TiB"
@@ -0,0 +1,89 @@
+import sys
+from typing import List, Optional
+from rich.console import Console
+from rich.table import Table
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.docker_manager import DockerManager
+from dockit.utilities.build_manager import BuildManager
+from dockit.utilities.build_fingerprint import BuildState
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.readiness import ReadinessWaiter
+from dockit.commands.build import BuildCommand
+
+class UpCommand:
+    def __init__(self):
+        self.messenger = Messenger()
+        self.console = Console()
+        self.docker_manager = DockerManager()
+        self.build_cmd = BuildCommand()
+
+    def run(self, services: Optional[List[str]] = None, force: bool = False, jobs: Optional[int] = None,
+            wait: bool = False, timeout: float = 120, project_dir: str = '.'):
+        try:
+            build_manager = BuildManager(project_dir)
+            definition, fingerprints = self.build_cmd.load_definition(build_manager, services)
+
+            if not self.docker_manager.is_docker_installed():
+                self.messenger.error("Docker not found. Please make sure Docker is installed and running.")
+                sys.exit(1)
+
+            if not self.build_stale(build_manager, definition, fingerprints, services, force, jobs):
+                sys.exit(1)
+
+            if not self.docker_manager.start_containers(build=False):
+                sys.exit(1)
+
+            if wait and not self.wait_until_ready(build_manager.load_compose(), timeout, project_dir):
+                sys.exit(1)
+        except KeyboardInterrupt:
+            self.messenger.info("\nOperation cancelled by user")
+            sys.exit(0)
+
+    def build_stale(self, build_manager: BuildManager, definition: dict, fingerprints: dict,
+                    services: Optional[List[str]] = None, force: bool = False, jobs: Optional[int] = None) -> bool:
+        """Build the images whose build inputs changed since they were built; returns False if a build failed"""
+        if not definition['target']:
+            return True
+
+        # Images the requested ones build on are checked too: their fingerprints feed into them
+        candidates = [name for wave in build_manager.build_order(definition, services) for name in wave]
+        if force:
+            stale = candidates
+        else:
+            stale = build_manager.stale_targets(
+                definition, fingerprints, BuildState(build_manager.project_dir), self.docker_manager, candidates
+            )
+
+        for name in candidates:
+            if name not in stale:
+                self.messenger.info(f"{name} is up to date")
+        return not stale or self.build_cmd.build_images(build_manager, definition, fingerprints, stale, jobs)
+
+    def wait_until_ready(self, compose: dict, timeout: float, project_dir: str = '.') -> bool:
+        """Wait for every started service concurrently and report how long each took"""
+        project = compose.get('name') or PathResolver.get_project_name(project_dir)
+        containers = {
+            name: service.get('container_name') or f"{project}-{name}-1"
+            for name, service in compose['services'].items()
+            # Shared base images are only built, never started
+            if (service or {}).get('scale') != 0
+        }
+
+        self.messenger.info(f"Waiting for {len(containers)} service(s) to become ready...")
+        results = ReadinessWaiter(self.docker_manager, timeout).wait_all(containers)
+
+        table = Table(title="Service readiness")
+        table.add_column("Service")
+        table.add_column("Ready after", justify="right")
+        table.add_column("State")
+        for name, result in sorted(results.items(), key=lambda item: item[1]['seconds']):
+            state = f"[green]{result['state']}[/green]" if result['ready'] else f"[red]{result['state']}[/red]"
+            table.add_row(name, f"{result['seconds']:.1f} s", state)
+        self.console.print(table)
+
+        not_ready = [name for name, result in results.items() if not result['ready']]
+        if not_ready:
+            self.messenger.error(f"Not ready: {', '.join(not_ready)}")
+            return False
+        self.messenger.success("All services are ready!")
+        return True
@@ -0,0 +1,68 @@
+import sys
+import time
+from typing import List, Optional
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.service_manager import ServiceManager
+from dockit.utilities.catalog_validator import CatalogValidator
+
+class ValidateCommand:
+    def __init__(self):
+        self.messenger = Messenger()
+        self.console = Console()
+
+    def run(self, services: Optional[List[str]] = None, jobs: Optional[int] = None, use_cache: bool = True):
+        try:
+            ServiceManager().initialize_services()
+            validator = CatalogValidator()
+            started_at = time.perf_counter()
+            report = validator.run(services, jobs=jobs, use_cache=use_cache)
+            elapsed = time.perf_counter() - started_at
+
+            unknown = [service for service in services or [] if service not in report]
+            for service in unknown:
+                self.messenger.error(f"Unknown service '{service}'")
+            if not report:
+                self.messenger.warning("No services to validate")
+                sys.exit(1 if unknown else 0)
+
+            warned = {service: result for service, result in report.items() if result["warnings"]}
+            if warned:
+                self.show_problems(warned, "warnings", "Unknown keys (ignored)")
+            failed = {service: result for service, result in report.items() if result["errors"]}
+            if failed:
+                self.show_problems(failed, "errors", "Invalid services")
+
+            versions = sum(len(result["versions"]) for result in report.values())
+            self.messenger.note(
+                f"{len(report)} service(s), {versions} version(s) in {elapsed * 1000:.0f} ms "
+                f"({len(validator.checked)} checked, {len(validator.cached)} unchanged since the last run)"
+            )
+            if warned:
+                warnings = sum(len(result["warnings"]) for result in warned.values())
+                self.messenger.warning(f"{warnings} unknown key(s) in {len(warned)} service(s); they are ignored")
+            if failed or unknown:
+                errors = sum(len(result["errors"]) for result in failed.values())
+                self.messenger.error(f"{errors} problem(s) in {len(failed)} service(s)")
+                sys.exit(1)
+            self.messenger.success("All services are valid!")
+        except KeyboardInterrupt:
+            self.messenger.info("\nOperation cancelled by user")
+            sys.exit(0)
+
+    def show_problems(self, services: dict, kind: str, title: str):
+        """Print one row per problem of a kind ("errors" or "warnings"), grouped by service and version"""
+        table = Table(title=title)
+        table.add_column("Service")
+        table.add_column("Version")
+        table.add_column("Problem")
+
+        for service, result in services.items():
+            for error in result[kind]:
+                table.add_row(service, error["version"] or "-", escape(CatalogValidator.describe(error["path"], error["message"])))
+
+        self.console.print(table)
+        for service, result in services.items():
+            self.messenger.note(f"{service}: {', '.join(result['sources'])}")
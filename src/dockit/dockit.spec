@@ -5,8 +5,24 @@ a = Analysis(
     ['app.py'],
     pathex=[],
     binaries=[],
-    datas=[('services', 'services'), ('templates', 'templates')],
-    hiddenimports=[],
+    datas=[('services', 'services'), ('templates', 'templates'), ('compiled_templates', 'compiled_templates'), ('bundled_history.json', '.')],
+    hiddenimports=[
+        # Commands are imported lazily by name from app.COMMANDS
+        'dockit.commands.init',
+        'dockit.commands.generate',
+        'dockit.commands.build',
+        'dockit.commands.up',
+        'dockit.commands.plan',
+        'dockit.commands.status',
+        'dockit.commands.logs',
+        'dockit.commands.top',
+        'dockit.commands.add_service',
+        'dockit.commands.delete_service',
+        'dockit.commands.validate',
+        'dockit.commands.publish',
+        'dockit.commands.about',
+        'dockit.commands.version',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,62 @@
+import unittest
+import os
+import sys
+import time
+import subprocess
+
+# Upper bound for a full `dockit version` process, interpreter startup included
+STARTUP_BUDGET_MS = 1500
+
+# Modules that only the commands which need them may import
+HEAVY_MODULES = [
+    "questionary",
+    "jinja2",
+    "dockit.utilities.service_manager",
+    "dockit.commands.init",
+    "dockit.commands.generator",
+]
+
+class TestApp(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        # The src directory (parent of the dockit package) must be importable by the child process
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        self.env = dict(os.environ, PYTHONPATH=os.path.dirname(project_root))
+
+    def run_cli(self, *args) -> subprocess.CompletedProcess:
+        """Run the CLI in a fresh interpreter and report which heavy modules got imported"""
+        script = (
+            "import sys\n"
+            "from dockit.app import DockitCLI\n"
+            f"DockitCLI().app({list(args)!r}, standalone_mode=False)\n"
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+        )
+        return subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env=self.env,
+            check=True
+        )
+
+    def test_version_does_not_load_catalog(self):
+        """Test that `version` imports none of the heavy modules"""
+        result = self.run_cli("version")
+        self.assertIn("2.2.3", result.stdout)
+        self.assertTrue(result.stdout.strip().endswith("[]"), result.stdout)
+
+    def test_help_does_not_load_catalog(self):
+        """Test that `--help` imports none of the heavy modules"""
+        result = self.run_cli("--help")
+        self.assertIn("init", result.stdout)
+        self.assertTrue(result.stdout.strip().endswith("[]"), result.stdout)
+
+    def test_version_startup_budget(self):
+        """Test that `version` stays within the startup time budget"""
+        start = time.perf_counter()
+        self.run_cli("version")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.assertLess(elapsed_ms, STARTUP_BUDGET_MS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import os
+import shutil
+from utilities.build_manager import BuildManager, FINGERPRINT_LABEL
+from utilities.build_fingerprint import BuildFingerprint, BuildState
+
+class FakeDockerManager:
+    """Answers image label lookups from a dict instead of the Docker daemon"""
+
+    def __init__(self, labels: dict):
+        self.labels = labels
+
+    def get_image_label(self, image: str, label: str):
+        return self.labels.get(image, {}).get(label)
+
+class TestBuildFingerprint(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        for context in ('dockit-base-abc', 'php-8.4', 'worker-8.4'):
+            os.makedirs(os.path.join(self.test_dir, 'dockit', context), exist_ok=True)
+            self.write(context, 'Dockerfile', f'FROM scratch\n# {context}\n')
+        self.write('php-8.4', 'xdebug.ini', 'xdebug.mode=debug\n')
+
+        contexts = {'dockit-base-abc': 'target:dockit-base-abc'}
+        self.definition = {
+            'group': {'default': {'targets': ['php', 'worker', 'dockit-base-abc']}},
+            'target': {
+                'php': {'context': './dockit/php-8.4', 'dockerfile': 'Dockerfile',
+                        'tags': ['dockit-php-8.4'], 'contexts': dict(contexts)},
+                'worker': {'context': './dockit/worker-8.4', 'dockerfile': 'Dockerfile',
+                           'tags': ['dockit-worker-8.4'], 'contexts': dict(contexts)},
+                'dockit-base-abc': {'context': './dockit/dockit-base-abc', 'dockerfile': 'Dockerfile',
+                                    'tags': ['dockit-base-abc']},
+            },
+        }
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def write(self, context: str, name: str, content: str):
+        with open(os.path.join(self.test_dir, 'dockit', context, name), 'w') as f:
+            f.write(content)
+
+    def test_fingerprint_follows_context_changes(self):
+        """Test that only the images whose context changed get a new fingerprint"""
+        before = BuildFingerprint.compute(self.definition, self.test_dir)
+        self.assertEqual(before, BuildFingerprint.compute(self.definition, self.test_dir))
+
+        self.write('php-8.4', 'xdebug.ini', 'xdebug.mode=off\n')
+        after = BuildFingerprint.compute(self.definition, self.test_dir)
+        self.assertNotEqual(before['php'], after['php'])
+        self.assertEqual(before['worker'], after['worker'])
+
+    def test_base_change_propagates(self):
+        """Test that changing a shared base changes the fingerprints built on it"""
+        before = BuildFingerprint.compute(self.definition, self.test_dir)
+        self.write('dockit-base-abc', 'Dockerfile', 'FROM busybox\n')
+        after = BuildFingerprint.compute(self.definition, self.test_dir)
+        for name in ('dockit-base-abc', 'php', 'worker'):
+            self.assertNotEqual(before[name], after[name])
+
+    def test_state_round_trip(self):
+        """Test that recorded fingerprints survive a reload"""
+        state = BuildState(self.test_dir)
+        self.assertIsNone(state.get('php'))
+        state.set('php', 'abc')
+        state.save()
+        self.assertEqual(BuildState(self.test_dir).get('php'), 'abc')
+
+    def test_stale_targets(self):
+        """Test that images are stale when the state file or the image label disagree"""
+        fingerprints = BuildFingerprint.compute(self.definition, self.test_dir)
+        state = BuildState(self.test_dir)
+        for name, fingerprint in fingerprints.items():
+            state.set(name, fingerprint)
+        labels = {
+            'dockit-php-8.4': {FINGERPRINT_LABEL: fingerprints['php']},
+            'dockit-base-abc': {FINGERPRINT_LABEL: fingerprints['dockit-base-abc']},
+            # The worker image was removed or rebuilt by hand
+            'dockit-worker-8.4': {FINGERPRINT_LABEL: 'something else'},
+        }
+        stale = BuildManager.stale_targets(self.definition, fingerprints, state, FakeDockerManager(labels))
+        self.assertEqual(stale, ['worker'])
+
+        state.set('php', 'old')
+        stale = BuildManager.stale_targets(self.definition, fingerprints, state, FakeDockerManager(labels))
+        self.assertEqual(stale, ['php', 'worker'])
+
+    def test_limit_to_builds_only_stale_targets(self):
+        """Test that only stale images are built while their bases stay resolvable"""
+        fingerprints = BuildFingerprint.compute(self.definition, self.test_dir)
+        limited = BuildManager.limit_to(self.definition, fingerprints, ['php'])
+        self.assertEqual(limited['group']['default']['targets'], ['php'])
+        php = limited['target']['php']
+        self.assertEqual(php['contexts'], {'dockit-base-abc': 'target:dockit-base-abc'})
+        self.assertEqual(php['labels'], {FINGERPRINT_LABEL: fingerprints['php']})
+        self.assertIn('dockit-base-abc', limited['target'])
+        self.assertEqual(BuildManager.build_order(limited, ['php'], dependencies_too=False), [['php']])
+
+if __name__ == '__main__':
+    unittest.main()
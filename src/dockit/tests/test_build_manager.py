@@ -0,0 +1,106 @@
+import unittest
+import os
+import json
+import time
+import shutil
+import threading
+from unittest.mock import patch, MagicMock
+from utilities.build_manager import BuildManager
+
+COMPOSE = """
+name: app
+services:
+  php:
+    image: dockit-php-8.4
+    build:
+      context: ./dockit/php-8.4
+      dockerfile: Dockerfile
+      args:
+        - UID=1000
+      additional_contexts:
+        dockit-base-abc: service:dockit-base-abc
+  worker:
+    image: dockit-worker-8.4
+    build:
+      context: ./dockit/worker-8.4
+      dockerfile: Dockerfile
+      additional_contexts:
+        dockit-base-abc: service:dockit-base-abc
+  mysql:
+    image: mysql:latest
+  dockit-base-abc:
+    image: dockit-base-abc
+    build:
+      context: ./dockit/dockit-base-abc
+      dockerfile: Dockerfile
+    scale: 0
+"""
+
+class TestBuildManager(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        os.makedirs(self.test_dir, exist_ok=True)
+        with open(os.path.join(self.test_dir, 'docker-compose.yml'), 'w') as f:
+            f.write(COMPOSE)
+        self.build_manager = BuildManager(self.test_dir)
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_bake_definition(self):
+        """Test that every built service becomes a bake target"""
+        definition = self.build_manager.bake_definition(self.build_manager.load_compose())
+        self.assertEqual(definition['group']['default']['targets'], ['php', 'worker', 'dockit-base-abc'])
+        php = definition['target']['php']
+        self.assertEqual(php['context'], './dockit/php-8.4')
+        self.assertEqual(php['tags'], ['dockit-php-8.4'])
+        self.assertEqual(php['args'], {'UID': '1000'})
+        self.assertEqual(php['contexts'], {'dockit-base-abc': 'target:dockit-base-abc'})
+
+        path = self.build_manager.write_bake_file(definition)
+        with open(path, 'r') as f:
+            self.assertEqual(json.load(f), definition)
+
+    def test_build_order(self):
+        """Test that shared bases build before the services using them"""
+        definition = self.build_manager.bake_definition(self.build_manager.load_compose())
+        self.assertEqual(BuildManager.build_order(definition), [['dockit-base-abc'], ['php', 'worker']])
+        self.assertEqual(BuildManager.build_order(definition, ['worker']), [['dockit-base-abc'], ['worker']])
+
+    def test_concurrency_is_limited(self):
+        """Test that no more than `jobs` targets build at the same time"""
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def build_target(bake_file, target, no_cache=False):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.05)
+            with lock:
+                state['running'] -= 1
+            return {'target': target, 'ok': True, 'error': None, 'seconds': 0.05}
+
+        self.build_manager.build_target = build_target
+        results = self.build_manager.build('bake.json', [[f'svc{i}' for i in range(6)]], jobs=2)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(state['peak'], 2)
+
+    def test_failed_wave_stops_build(self):
+        """Test that services are not built when their base image failed"""
+        failed = MagicMock(returncode=1, stderr="ERROR: failed to solve\n", stdout="")
+        with patch('subprocess.run', return_value=failed) as run:
+            results = self.build_manager.build('bake.json', [['dockit-base-abc'], ['php', 'worker']], jobs=4)
+
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0]['ok'])
+        self.assertEqual(results[0]['error'], 'ERROR: failed to solve')
+        command = run.call_args[0][0]
+        self.assertEqual(command[:3], ['docker', 'buildx', 'bake'])
+        self.assertEqual(command[-1], 'dockit-base-abc')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+import unittest
+import os
+import shutil
+import json
+import tracemalloc
+from utilities.catalog_index import CatalogIndex, LazyCatalog
+from utilities.service_definition import ServiceDefinition
+from utilities.messenger import Messenger
+
+class TestCatalogIndex(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        self.services_dir = os.path.join(self.test_dir, 'services')
+        self.index_path = os.path.join(self.test_dir, 'cache', 'catalog.json')
+
+        # Get the project root directory (two levels up from tests)
+        project_root = os.path.dirname(os.path.dirname(__file__))
+
+        # Copy the actual service catalog
+        shutil.copytree(os.path.join(project_root, 'services'), self.services_dir, dirs_exist_ok=True)
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        if os.path.exists(self.test_dir):
+            try:
+                shutil.rmtree(self.test_dir)
+            except OSError:
+                pass  # Ignore cleanup errors
+
+    def write_service(self, service_name: str, data: dict):
+        """Write a service.json, making sure its size changes so the stamp is always fresh"""
+        service_dir = os.path.join(self.services_dir, service_name)
+        os.makedirs(service_dir, exist_ok=True)
+        with open(os.path.join(service_dir, 'service.json'), 'w') as f:
+            json.dump(data, f, indent=4)
+
+    def test_refresh_sorts_by_priority(self):
+        """Test that services are listed by priority descending"""
+        index = CatalogIndex(self.services_dir, self.index_path)
+        entries = index.refresh()
+        priorities = [entry['priority'] for entry in entries.values()]
+        self.assertEqual(priorities, sorted(priorities, reverse=True))
+        self.assertEqual(index.get_service_names()[0], 'nginx')
+        self.assertIn('8.4', index.get_versions('php'))
+        self.assertNotIn('priority', index.get_versions('php'))
+        self.assertTrue(os.path.exists(self.index_path))
+
+    def test_refresh_only_rebuilds_changed_services(self):
+        """Test that a second refresh reuses the persisted index"""
+        first = CatalogIndex(self.services_dir, self.index_path)
+        first.refresh()
+        self.assertIn('php', first.rebuilt)
+
+        second = CatalogIndex(self.services_dir, self.index_path)
+        second.refresh()
+        self.assertEqual(second.rebuilt, [])
+        self.assertEqual(second.entries, first.entries)
+        self.assertEqual(second.load_service('php'), first.load_service('php'))
+
+        self.write_service('redis', {'priority': 5, '7.2': {'image': 'redis:7.2', 'compose': {}}})
+        third = CatalogIndex(self.services_dir, self.index_path)
+        third.refresh()
+        self.assertEqual(third.rebuilt, ['redis'])
+        self.assertEqual(third.get_versions('redis'), ['7.2'])
+
+    def test_refresh_drops_removed_services(self):
+        """Test that deleted services disappear from the index"""
+        CatalogIndex(self.services_dir, self.index_path).refresh()
+        shutil.rmtree(os.path.join(self.services_dir, 'mongo'))
+
+        index = CatalogIndex(self.services_dir, self.index_path)
+        index.refresh()
+        self.assertNotIn('mongo', index.get_service_names())
+
+    def test_corrupt_index_is_rebuilt(self):
+        """Test that an unreadable index is treated as empty"""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        with open(self.index_path, 'w') as f:
+            f.write('{not json')
+
+        index = CatalogIndex(self.services_dir, self.index_path)
+        index.refresh()
+        self.assertIn('php', index.get_service_names())
+
+    def test_load_version_materializes_single_version(self):
+        """Test that a version read from the blob matches service.json"""
+        with open(os.path.join(self.services_dir, 'php', 'service.json'), 'r') as f:
+            expected = ServiceDefinition.resolve(json.load(f))
+
+        index = CatalogIndex(self.services_dir, self.index_path)
+        index.refresh()
+        catalog = LazyCatalog(index)
+        self.assertEqual(index.load_version('php', '8.2'), expected['8.2'])
+        self.assertEqual(catalog['php']['7.4'], expected['7.4'])
+        self.assertIsNone(index.load_version('php', '5.6'))
+        self.assertNotIn('5.6', catalog['php'])
+
+    def test_lazy_catalog_memory(self):
+        """Benchmark the memory held by the lazy catalog against fully loaded service definitions"""
+        with open(os.path.join(self.services_dir, 'php', 'service.json'), 'r') as f:
+            template = ServiceDefinition.resolve(json.load(f))['8.4']
+
+        # Synthetic catalog: 40 services x 100 versions
+        for i in range(40):
+            self.write_service(f'synthetic{i}', {
+                'priority': i,
+                **{f'{i}.{v}': template for v in range(100)}
+            })
+        CatalogIndex(self.services_dir, self.index_path).refresh()
+
+        tracemalloc.start()
+        eager = {}
+        for service_name in os.listdir(self.services_dir):
+            service_json = os.path.join(self.services_dir, service_name, 'service.json')
+            if os.path.exists(service_json):
+                with open(service_json, 'r') as f:
+                    eager[service_name] = json.load(f)
+        eager_bytes = tracemalloc.get_traced_memory()[0]
+        del eager
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        index = CatalogIndex(self.services_dir, self.index_path)
+        index.refresh()
+        catalog = LazyCatalog(index)
+        lazy_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        self.assertEqual(index.rebuilt, [])
+        self.assertEqual(len(catalog['synthetic7']), 100)
+        self.assertEqual(catalog['synthetic7']['7.42'], template)
+        self.assertLess(lazy_bytes * 5, eager_bytes)
+
+    def test_user_layer_merges_with_bundled(self):
+        """Test that a service.json in an earlier layer is merged version by version over later ones"""
+        user_dir = os.path.join(self.test_dir, 'user')
+        layers = [user_dir, self.services_dir]
+        index = CatalogIndex(layers, self.index_path)
+        index.refresh()
+        self.assertIn('8.4', index.get_versions('php'))
+
+        override = {'priority': 1, '9.0': {'image': 'php:9.0-fpm', 'compose': {}}}
+        os.makedirs(os.path.join(user_dir, 'php'))
+        with open(os.path.join(user_dir, 'php', 'service.json'), 'w') as f:
+            json.dump(override, f)
+        # A user directory with no service.json does not hide a bundled service
+        os.makedirs(os.path.join(user_dir, 'mysql', 'conf'))
+
+        index = CatalogIndex(layers, self.index_path)
+        index.refresh()
+        self.assertEqual(index.rebuilt, ['php'])
+        self.assertIn('9.0', index.get_versions('php'))
+        self.assertIn('8.4', index.get_versions('php'))
+        self.assertEqual(index.entries['php']['priority'], 1)
+        self.assertEqual(index.load_version('php', '9.0')['image'], 'php:9.0-fpm')
+        self.assertIn('mysql', index.get_service_names())
+
+    def test_user_layer_replaces_and_hides_versions(self):
+        """Test that a user version replaces the bundled one and null hides it"""
+        user_dir = os.path.join(self.test_dir, 'user')
+        os.makedirs(os.path.join(user_dir, 'php'))
+        override = {'8.4': {'image': 'php:8.4-custom', 'compose': {}}, '8.3': None}
+        with open(os.path.join(user_dir, 'php', 'service.json'), 'w') as f:
+            json.dump(override, f)
+
+        index = CatalogIndex([user_dir, self.services_dir], self.index_path)
+        index.refresh()
+        self.assertNotIn('8.3', index.get_versions('php'))
+        self.assertIn('8.2', index.get_versions('php'))
+        self.assertEqual(index.load_version('php', '8.4'), {'image': 'php:8.4-custom', 'compose': {}})
+
+    def test_broken_service_is_skipped(self):
+        """Test that a service.json that cannot be resolved leaves the rest of the catalog indexed"""
+        self.write_service('foo', {'1': {'extends': 'nope'}})
+        os.makedirs(os.path.join(self.services_dir, 'bar'))
+        with open(os.path.join(self.services_dir, 'bar', 'service.json'), 'w') as f:
+            f.write('{"1": ')
+
+        index = CatalogIndex(self.services_dir, self.index_path)
+        Messenger.set_quiet(True)
+        try:
+            index.refresh()
+        finally:
+            Messenger.set_quiet(False)
+        self.assertEqual(sorted(index.broken), ['bar', 'foo'])
+        self.assertNotIn('foo', index.get_service_names())
+        self.assertIn('8.4', index.get_versions('php'))
+        self.assertIsNotNone(index.load_version('redis', 'latest'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import json
+import shutil
+import unittest
+from utilities.catalog_validator import CatalogValidator
+
+class TestCatalogValidator(unittest.TestCase):
+    def setUp(self):
+        """Set up a copy of the bundled catalog and a validation cache"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        self.services_dir = os.path.join(self.test_dir, 'services')
+        self.cache_path = os.path.join(self.test_dir, 'cache', 'validation.json')
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        shutil.copytree(os.path.join(project_root, 'services'), self.services_dir, dirs_exist_ok=True)
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def validator(self):
+        return CatalogValidator([self.services_dir], self.cache_path)
+
+    def write_service(self, service_name: str, data: dict):
+        service_dir = os.path.join(self.services_dir, service_name)
+        os.makedirs(service_dir, exist_ok=True)
+        with open(os.path.join(service_dir, 'service.json'), 'w') as f:
+            json.dump(data, f, indent=4)
+
+    def problems(self, report: dict, service_name: str, kind: str = 'errors') -> list:
+        return [(error['version'], CatalogValidator.describe(error['path'], error['message']))
+                for error in report[service_name][kind]]
+
+    def test_bundled_catalog_is_valid(self):
+        """Test that every bundled version passes, checked in parallel"""
+        report = self.validator().run(jobs=2)
+        self.assertIn('php', report)
+        self.assertEqual({name: result['errors'] for name, result in report.items() if result['errors']}, {})
+
+    def test_schema_errors_are_reported_per_version(self):
+        """Test that types, required keys and empty values are errors, and unknown keys warnings"""
+        self.write_service('broken', {
+            '1': {'image': '', 'compose': {}, 'ports': []},
+            '2': {'build': {'base_image': 'debian', 'apt': ['curl', 3]}, 'compose': []},
+            '3': {'compose': {}},
+        })
+        report = self.validator().run(['broken'])
+        self.assertEqual(self.problems(report, 'broken'), [
+            ('1', 'image must not be empty'),
+            ('2', "build 'command' is required"),
+            ('2', 'build.apt[1] must be of type string'),
+            ('2', 'compose must be of type object'),
+            ('3', "'build' is required or 'image' is required"),
+        ])
+        self.assertEqual(self.problems(report, 'broken', 'warnings'), [('1', 'ports is not a known key')])
+
+    def test_publishable_files_are_known(self):
+        """Test that the publishable_files the generator maps are accepted"""
+        self.write_service('web', {'1.0': {'image': 'web', 'compose': {}, 'publishable_files': [
+            {'source': './web.conf', 'target': '/etc/web.conf'},
+        ]}})
+        report = self.validator().run(['web'])
+        self.assertEqual(report['web']['errors'], [])
+        self.assertEqual(report['web']['warnings'], [])
+
+    def test_missing_published_file_is_reported(self):
+        """Test that every publishes.source must exist in the catalog"""
+        self.write_service('web', {'1.0': {'image': 'web:{version}', 'compose': {}, 'publishes': {
+            'web.conf': {'source': 'conf/{version}/web.conf', 'destination': '/etc/web.conf'},
+        }}})
+        problems = self.problems(self.validator().run(['web']), 'web')
+        self.assertEqual(problems, [('1.0', 'publishes.web.conf.source file not found: web/conf/1.0/web.conf')])
+
+        os.makedirs(os.path.join(self.services_dir, 'web', 'conf', '1.0'))
+        open(os.path.join(self.services_dir, 'web', 'conf', '1.0', 'web.conf'), 'w').close()
+        self.assertEqual(self.validator().run(['web'])['web']['errors'], [])
+
+    def test_unresolvable_file_is_reported(self):
+        """Test that invalid json and broken extends fail the whole file"""
+        self.write_service('loop', {'1': {'extends': '2'}, '2': {'extends': '1'}})
+        problems = self.problems(self.validator().run(['loop']), 'loop')
+        self.assertEqual(problems, [(None, 'Circular extends: 1 -> 2 -> 1')])
+
+    def test_unchanged_files_come_from_the_cache(self):
+        """Test that only edited service.json files are checked again"""
+        first = self.validator()
+        first.run()
+        self.assertEqual(first.cached, [])
+
+        self.write_service('redis', {'latest': {'image': 'redis', 'compose': {}, 'extra': True}})
+        second = self.validator()
+        report = second.run()
+        self.assertEqual(second.checked, ['redis'])
+        self.assertEqual(len(second.cached), len(report) - 1)
+        self.assertEqual(self.problems(report, 'redis', 'warnings'), [('latest', 'extra is not a known key')])
+
+        # Cached problems are reported just the same
+        third = self.validator()
+        self.assertEqual(self.problems(third.run(), 'redis', 'warnings'), [('latest', 'extra is not a known key')])
+        self.assertEqual(third.checked, [])
+
+    def test_no_cache_checks_everything(self):
+        """Test that use_cache=False checks every file but keeps the cache of the others"""
+        self.validator().run()
+        validator = self.validator()
+        validator.run(['php'], use_cache=False)
+        self.assertEqual(validator.checked, ['php'])
+
+        validator = self.validator()
+        validator.run()
+        self.assertEqual(validator.checked, [])
+
+if __name__ == '__main__':
+    unittest.main()
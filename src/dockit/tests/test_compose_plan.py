@@ -0,0 +1,119 @@
+import os
+import shutil
+import unittest
+from utilities.compose_plan import ComposePlan, PlanWriter
+from utilities.content_store import ContentStore
+from utilities.file_writer import FileWriter
+
+class TestComposePlan(unittest.TestCase):
+    def setUp(self):
+        """Set up a running stack of php (built, with a published php.ini) and mysql"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), "test_data")
+        self.current = {
+            "name": "shop",
+            "services": {
+                "php": {
+                    "image": "dockit-php-8.4",
+                    "build": {"context": "./dockit/php-8.4", "dockerfile": "Dockerfile"},
+                    "volumes": ["./:/var/www/html", "./dockit/php-8.4/php.ini:/usr/local/etc/php/php.ini"],
+                    "depends_on": {"mysql": {"condition": "service_healthy"}},
+                },
+                "mysql": {
+                    "image": "mysql:latest",
+                    "volumes": ["mysql_data:/var/lib/mysql", "./dockit/data/mysql:/docker-entrypoint-initdb.d"],
+                    "environment": ["MYSQL_DATABASE=shop"],
+                },
+            },
+        }
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def planned(self) -> dict:
+        return {"name": "shop", "services": {name: dict(service) for name, service in self.current["services"].items()}}
+
+    def test_nothing_changed(self):
+        """Test that an identical stack recreates nothing"""
+        plan = ComposePlan(self.current, self.planned(), {})
+        self.assertFalse(plan.has_changes())
+        self.assertEqual(plan.with_action("keep"), ["php", "mysql"])
+
+    def test_changed_published_file_only_recreates_its_service(self):
+        """Test that a new php.ini recreates php and leaves the database running"""
+        plan = ComposePlan(self.current, self.planned(), {"dockit/php-8.4/php.ini": "~"})
+        self.assertEqual(plan.affected, ["php"])
+        self.assertEqual(plan.services["php"]["changes"], ["~ dockit/php-8.4/php.ini"])
+        self.assertEqual(plan.services["mysql"]["action"], "keep")
+
+    def test_compose_changes_per_service(self):
+        """Test that added, changed and removed compose keys and services are reported"""
+        planned = self.planned()
+        planned["services"]["mysql"]["environment"] = ["MYSQL_DATABASE=store"]
+        planned["services"]["mysql"]["ports"] = ["3306:3306"]
+        del planned["services"]["php"]
+        planned["services"]["redis"] = {"image": "redis:latest"}
+
+        plan = ComposePlan(self.current, planned, {})
+        self.assertEqual(plan.services["mysql"], {"action": "recreate", "changes": ["~ environment", "+ ports"]})
+        self.assertEqual(plan.services["redis"]["action"], "create")
+        self.assertEqual(plan.removed, ["php"])
+        self.assertEqual(plan.affected, ["mysql", "redis"])
+
+    def test_shared_base_is_only_built(self):
+        """Test that a changed shared base image is built, not started"""
+        planned = self.planned()
+        planned["services"]["base-1a2b"] = {"image": "base-1a2b", "build": {"context": "./dockit/base-1a2b"}, "scale": 0}
+        plan = ComposePlan(self.current, planned, {"dockit/base-1a2b/Dockerfile": "+"})
+        self.assertEqual(plan.with_action("build"), ["base-1a2b"])
+        self.assertEqual(plan.affected, [])
+
+    def test_rebuilt_base_recreates_its_dependents(self):
+        """Test that a service built on a shared base is recreated when only the base changed"""
+        base = {"image": "base-1a2b", "build": {"context": "./dockit/base-1a2b"}, "scale": 0}
+        self.current["services"]["base-1a2b"] = base
+        self.current["services"]["php"]["build"] = dict(
+            self.current["services"]["php"]["build"], additional_contexts={"base-1a2b": "service:base-1a2b"}
+        )
+        plan = ComposePlan(self.current, self.planned(), {"dockit/base-1a2b/Dockerfile": "~"})
+        self.assertEqual(plan.with_action("build"), ["base-1a2b"])
+        self.assertEqual(plan.affected, ["php"])
+        self.assertEqual(plan.services["php"]["changes"], ["~ base base-1a2b"])
+        self.assertEqual(plan.services["mysql"]["action"], "keep")
+
+    def test_renamed_project_recreates_everything(self):
+        """Test that a new project name recreates every service"""
+        planned = self.planned()
+        planned["name"] = "store"
+        self.assertEqual(ComposePlan(self.current, planned, {}).affected, ["php", "mysql"])
+
+    def test_without_a_current_stack_everything_is_created(self):
+        """Test that a first plan creates every service"""
+        plan = ComposePlan(None, self.planned(), {})
+        self.assertEqual(plan.with_action("create"), ["php", "mysql"])
+
+    def test_plan_writer_writes_nothing_until_committed(self):
+        """Test that planned files are only recorded, then written by commit"""
+        source = os.path.join(self.test_dir, "services", "php.ini")
+        os.makedirs(os.path.dirname(source))
+        with open(source, "w") as f:
+            f.write("memory_limit = 512M\n")
+        unchanged = os.path.join(self.test_dir, "project", "docker-compose.yml")
+        FileWriter().write(unchanged, "name: shop\n")
+
+        writer = PlanWriter()
+        dockerfile = os.path.join(self.test_dir, "project", "dockit", "php-8.4", "Dockerfile")
+        php_ini = os.path.join(self.test_dir, "project", "dockit", "php-8.4", "php.ini")
+        self.assertTrue(writer.write(dockerfile, "FROM php:8.4-fpm\n"))
+        self.assertTrue(writer.place(source, php_ini, None))
+        self.assertFalse(writer.write(unchanged, "name: shop\n"))
+        self.assertFalse(os.path.exists(os.path.dirname(dockerfile)))
+        self.assertEqual(writer.created, [dockerfile, php_ini])
+
+        store = ContentStore(os.path.join(self.test_dir, "store"))
+        self.assertEqual(sorted(writer.commit(FileWriter(), store)), sorted([dockerfile, php_ini]))
+        with open(php_ini) as f:
+            self.assertEqual(f.read(), "memory_limit = 512M\n")
+
+if __name__ == "__main__":
+    unittest.main()
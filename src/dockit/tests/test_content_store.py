@@ -0,0 +1,87 @@
+import os
+import shutil
+import unittest
+from unittest.mock import patch
+from utilities.content_store import ContentStore
+from utilities.directory_sync import DirectorySync
+from utilities.file_writer import FileWriter
+
+class TestContentStore(unittest.TestCase):
+    def setUp(self):
+        """Set up a store and two identical config files from different versions"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), "test_data")
+        self.store = ContentStore(os.path.join(self.test_dir, "store"))
+        self.sources = []
+        for version in ("8.3", "8.4"):
+            path = os.path.join(self.test_dir, "services", "php", "conf", version, "php.ini")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("memory_limit = 512M\n")
+            self.sources.append(path)
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def project_file(self, project):
+        return os.path.join(self.test_dir, project, "dockit", "php-8.4", "php.ini")
+
+    def blobs(self):
+        return [name for _, _, names in os.walk(self.store.root) for name in names]
+
+    def test_identical_content_is_stored_once(self):
+        """Test that equal files share one read-only blob"""
+        digests = {self.store.add(source) for source in self.sources}
+        self.assertEqual(len(digests), 1)
+        self.assertEqual(len(self.blobs()), 1)
+        blob = self.store.blob_path(digests.pop())
+        self.assertEqual(os.stat(blob).st_mode & 0o222, 0)
+
+    def test_place_gives_projects_their_own_files(self):
+        """Test that project files are materialized from the store and left alone when up to date"""
+        self.assertTrue(self.store.place(self.sources[0], self.project_file("shop")))
+        self.assertTrue(self.store.place(self.sources[1], self.project_file("blog")))
+        self.assertFalse(self.store.place(self.sources[1], self.project_file("shop")))
+
+        with open(self.project_file("blog")) as f:
+            self.assertEqual(f.read(), "memory_limit = 512M\n")
+        blob = self.store.blob_path(self.store.digest(self.sources[0]))
+        self.assertFalse(os.path.samefile(self.project_file("shop"), blob))
+        self.assertEqual(os.stat(blob).st_nlink, 1)
+
+        # Editing one project's file changes neither the blob nor the other project
+        with open(self.project_file("shop"), "a") as f:
+            f.write("display_errors = On\n")
+        with open(self.project_file("blog")) as f:
+            self.assertEqual(f.read(), "memory_limit = 512M\n")
+        self.assertEqual(self.store.digest(blob), self.store.digest(self.sources[0]))
+
+    def test_changed_content_replaces_the_file(self):
+        """Test that a new content gets a new blob and replaces the project file"""
+        self.store.place(self.sources[0], self.project_file("shop"))
+        with open(self.sources[0], "a") as f:
+            f.write("upload_max_filesize = 64M\n")
+        self.assertTrue(self.store.place(self.sources[0], self.project_file("shop")))
+        with open(self.project_file("shop")) as f:
+            self.assertIn("upload_max_filesize", f.read())
+        self.assertEqual(len(self.blobs()), 2)
+        # Placing a new content never changes a blob other projects may be linked to
+        with open(self.store.blob_path(self.store.digest(self.sources[1]))) as f:
+            self.assertEqual(f.read(), "memory_limit = 512M\n")
+
+    def test_streamed_copy_fallback(self):
+        """Test that without reflinks the file is copied and stays editable"""
+        with patch.object(DirectorySync, "reflink", return_value=False):
+            self.assertTrue(self.store.place(self.sources[0], self.project_file("shop")))
+        self.assertFalse(os.path.samefile(self.project_file("shop"), self.store.blob_path(self.store.digest(self.sources[0]))))
+        self.assertTrue(os.access(self.project_file("shop"), os.W_OK))
+
+    def test_file_writer_accounting(self):
+        """Test that placed files are counted like written ones"""
+        writer = FileWriter()
+        writer.place(self.sources[0], self.project_file("shop"), self.store)
+        writer.place(self.sources[0], self.project_file("shop"), self.store)
+        self.assertEqual(writer.summary(), "1 file(s) written, 1 unchanged")
+
+if __name__ == '__main__':
+    unittest.main()
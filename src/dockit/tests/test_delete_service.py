@@ -0,0 +1,94 @@
+import unittest
+import os
+import shutil
+import json
+from commands.delete_service import DeleteServiceCommand
+from utilities.catalog_index import CatalogIndex, LazyCatalog
+from utilities.messenger import Messenger
+
+class TestDeleteServiceCommand(unittest.TestCase):
+    def setUp(self):
+        """Set up a user layer over a copy of the bundled catalog"""
+        Messenger.set_quiet(True)
+
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        self.user_dir = os.path.join(self.test_dir, 'user')
+        self.bundled_dir = os.path.join(self.test_dir, 'bundled')
+        os.makedirs(self.user_dir, exist_ok=True)
+
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        shutil.copytree(os.path.join(project_root, 'services', 'php'), os.path.join(self.bundled_dir, 'php'))
+
+        self.command = DeleteServiceCommand()
+        self.command.services_dir = self.user_dir
+        # ServiceManager is a singleton: point it at the test layers and restore it afterwards
+        manager = self.command.service_manager
+        self.original_state = (manager.services_dir, manager.service_layers, manager.catalog, manager.services)
+        manager.services_dir = self.user_dir
+        manager.service_layers = [self.user_dir, self.bundled_dir]
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        manager = self.command.service_manager
+        manager.services_dir, manager.service_layers, manager.catalog, manager.services = self.original_state
+        Messenger.set_quiet(False)
+
+        if os.path.exists(self.test_dir):
+            try:
+                shutil.rmtree(self.test_dir)
+            except OSError:
+                pass  # Ignore cleanup errors
+
+    def refresh(self) -> CatalogIndex:
+        """Index the test layers the way ServiceManager.load_all_services does"""
+        manager = self.command.service_manager
+        manager.catalog = CatalogIndex(manager.service_layers, os.path.join(self.test_dir, 'cache', 'catalog.json'))
+        manager.catalog.refresh()
+        manager.services = LazyCatalog(manager.catalog)
+        return manager.catalog
+
+    def user_config(self) -> dict:
+        with open(os.path.join(self.user_dir, 'php', 'service.json'), 'r') as f:
+            return json.load(f)
+
+    def test_deleting_bundled_version_hides_it(self):
+        """Test that a bundled version is hidden in the user's layer, leaving the bundled files alone"""
+        bundled_json = os.path.join(self.bundled_dir, 'php', 'service.json')
+        with open(bundled_json, 'r') as f:
+            bundled = f.read()
+        self.refresh()
+
+        self.assertTrue(self.command._delete_service_version('php', '7.4', delete_files=True))
+        self.assertEqual(self.user_config(), {'7.4': None})
+        with open(bundled_json, 'r') as f:
+            self.assertEqual(f.read(), bundled)
+
+        index = self.refresh()
+        self.assertNotIn('7.4', index.get_versions('php'))
+        self.assertIn('8.4', index.get_versions('php'))
+
+    def test_deleting_user_version_removes_it(self):
+        """Test that a version only the user defines is removed, and its empty directory with it"""
+        os.makedirs(os.path.join(self.user_dir, 'php'))
+        with open(os.path.join(self.user_dir, 'php', 'service.json'), 'w') as f:
+            json.dump({'9.0': {'image': 'php:9.0-fpm', 'compose': {}}}, f)
+        self.assertIn('9.0', self.refresh().get_versions('php'))
+
+        self.assertTrue(self.command._delete_service_version('php', '9.0', delete_files=False))
+        self.assertFalse(os.path.exists(os.path.join(self.user_dir, 'php')))
+        self.assertNotIn('9.0', self.refresh().get_versions('php'))
+
+    def test_extended_version_is_kept(self):
+        """Test that a version other versions extend is not deleted"""
+        with open(os.path.join(self.bundled_dir, 'php', 'service.json'), 'r') as f:
+            data = json.load(f)
+        data['9.0'] = {'extends': '8.4'}
+        with open(os.path.join(self.bundled_dir, 'php', 'service.json'), 'w') as f:
+            json.dump(data, f)
+        self.refresh()
+
+        self.assertFalse(self.command._delete_service_version('php', '8.4', delete_files=False))
+        self.assertFalse(os.path.exists(os.path.join(self.user_dir, 'php', 'service.json')))
+
+if __name__ == '__main__':
+    unittest.main()
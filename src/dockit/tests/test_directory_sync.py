@@ -0,0 +1,80 @@
+import os
+import shutil
+import unittest
+from utilities.directory_sync import DirectorySync
+
+class TestDirectorySync(unittest.TestCase):
+    def setUp(self):
+        """Set up a source tree and its published copy"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), "test_data")
+        self.source = os.path.join(self.test_dir, "source")
+        self.target = os.path.join(self.test_dir, "target")
+        self.write(os.path.join(self.source, "service.json"), '{"name": "php"}')
+        self.write(os.path.join(self.source, "conf", "php.ini"), "memory_limit = 512M\n")
+        self.write(os.path.join(self.source, "conf", "entrypoint.sh"), "#!/bin/sh\n")
+        os.chmod(os.path.join(self.source, "conf", "entrypoint.sh"), 0o755)
+        self.sync = DirectorySync()
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    @staticmethod
+    def write(path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def read(self, *parts):
+        with open(os.path.join(self.target, *parts)) as f:
+            return f.read()
+
+    def test_first_sync(self):
+        """Test that a missing target is created as a full copy with modes kept"""
+        self.assertTrue(self.sync.sync(self.source, self.target))
+        self.assertEqual(self.read("conf", "php.ini"), "memory_limit = 512M\n")
+        self.assertTrue(os.access(os.path.join(self.target, "conf", "entrypoint.sh"), os.X_OK))
+        self.assertEqual(len(self.sync.copied), 3)
+
+    def test_unchanged_is_left_alone(self):
+        """Test that syncing identical trees does not touch the target"""
+        self.sync.sync(self.source, self.target)
+        inode = os.stat(self.target).st_ino
+        self.assertFalse(self.sync.sync(self.source, self.target))
+        self.assertEqual(os.stat(self.target).st_ino, inode)
+
+    def test_only_changes_are_copied(self):
+        """Test that changed files are copied, unchanged ones reused and stale ones removed"""
+        self.sync.sync(self.source, self.target)
+        kept_inode = os.stat(os.path.join(self.target, "service.json")).st_ino
+        self.write(os.path.join(self.source, "conf", "php.ini"), "memory_limit = 1G\n")
+        self.write(os.path.join(self.target, "conf", "stale.ini"), "old")
+
+        sync = DirectorySync()
+        self.assertTrue(sync.sync(self.source, self.target))
+        self.assertEqual(sync.copied, [os.path.join(self.target, "conf", "php.ini")])
+        self.assertEqual(sync.removed, [os.path.join(self.target, "conf", "stale.ini")])
+        self.assertEqual(self.read("conf", "php.ini"), "memory_limit = 1G\n")
+        self.assertEqual(os.stat(os.path.join(self.target, "service.json")).st_ino, kept_inode)
+        # Neither the staged copy nor the previous target are left behind
+        self.assertEqual(sorted(os.listdir(self.test_dir)), ["source", "target"])
+
+    def test_recovers_interrupted_swap(self):
+        """Test that a target moved aside by an interrupted sync is put back"""
+        self.sync.sync(self.source, self.target)
+        os.rename(self.target, DirectorySync.backup_path(self.target))
+        self.assertFalse(self.sync.sync(self.source, self.target))
+        self.assertEqual(self.read("service.json"), '{"name": "php"}')
+
+    def test_copy_file(self):
+        """Test that the kernel copy paths produce the same bytes"""
+        source = os.path.join(self.test_dir, "big.bin")
+        with open(source, "wb") as f:
+            f.write(os.urandom(3 * 1024 * 1024 + 7))
+        target = os.path.join(self.test_dir, "copy", "big.bin")
+        DirectorySync.copy_file(source, target)
+        with open(source, "rb") as a, open(target, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import threading
+import socketserver
+import struct
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import patch
+from utilities.docker_manager import DockerManager
+from utilities.messenger import Messenger
+
+EVENTS = [
+    {"Type": "container", "Action": "die", "Actor": {"Attributes": {"name": "app_php"}}, "time": 1700000000},
+    {"Type": "container", "Action": "start", "Actor": {"Attributes": {"name": "app_php"}}, "time": 1700000001},
+]
+
+class FakeEngineHandler(BaseHTTPRequestHandler):
+    """Answers the few Engine API endpoints DockerManager uses"""
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        path = self.path.split("?")[0]
+        if path == "/version":
+            self.reply(200, {"ApiVersion": "1.43", "Version": "24.0.0"})
+        elif path.endswith("/_ping"):
+            self.reply(200, "OK")
+        elif path.endswith("/containers/json"):
+            self.reply(200, [{
+                "Names": ["/app_php"],
+                "Labels": {"com.docker.compose.project": "app", "com.docker.compose.service": "php"},
+                "State": "running",
+                "Status": "Up 2 minutes (healthy)",
+            }])
+        elif path.endswith("/containers/app_php/json"):
+            self.reply(200, {"Config": {"Tty": False}, "State": {"Status": "running"}})
+        elif path.endswith("/containers/app_php/logs"):
+            # Output of a container without a TTY comes in frames: stream, size, payload
+            self.frames([(1, b"ready to handle connections\nNOTICE: fpm is "), (2, b"running\n")])
+        elif path.endswith("/events"):
+            self.stream([json.dumps(event) + "\n" for event in EVENTS])
+        elif path.endswith("/images/dockit-php-8.4/json"):
+            self.reply(200, {"Config": {"Labels": {"dockit.fingerprint": "abc"}}})
+        else:
+            self.reply(404, {"message": "not found"})
+
+    def reply(self, status: int, body):
+        data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain" if isinstance(body, str) else "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def frames(self, frames):
+        """Send multiplexed log frames; the daemon ends such a stream by closing the connection"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.docker.raw-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for stream, payload in frames:
+            self.wfile.write(struct.pack(">BxxxL", stream, len(payload)) + payload)
+        self.close_connection = True
+
+    def stream(self, chunks):
+        """Send a chunked response the way the daemon streams events, then end it"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str):
+        super().__init__(path, FakeEngineHandler)
+        self.connections = 0
+        self.requests = []
+
+class TestDockerManager(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        Messenger.set_quiet(True)
+        DockerManager._alive.clear()
+        self.socket_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.socket_dir, 'docker.sock')
+        self.server = FakeEngine(self.socket_path)
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.docker_manager = DockerManager(f"unix://{self.socket_path}")
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.socket_dir)
+        DockerManager._alive.clear()
+        Messenger.set_quiet(False)
+
+    def test_requests_share_one_connection(self):
+        """Test that consecutive API calls reuse a single socket connection"""
+        self.assertTrue(self.docker_manager.is_docker_installed())
+        self.assertEqual(self.docker_manager.get_image_label('dockit-php-8.4', 'dockit.fingerprint'), 'abc')
+        self.assertIsNone(self.docker_manager.get_image_label('missing', 'dockit.fingerprint'))
+        self.assertEqual(self.server.connections, 1)
+
+    def test_liveness_is_checked_once(self):
+        """Test that the daemon is pinged once per process, whatever the number of managers"""
+        self.assertTrue(self.docker_manager.is_docker_installed())
+        self.assertTrue(DockerManager(f"unix://{self.socket_path}").is_docker_installed())
+        self.docker_manager.get_image_label('dockit-php-8.4', 'dockit.fingerprint')
+        pings = [path for path in self.server.requests if path.endswith('/_ping')]
+        self.assertEqual(len(pings), 1)
+
+    def test_container_status(self):
+        """Test that the project containers are listed through the API"""
+        status = self.docker_manager.get_container_status(os.path.join(self.socket_dir, 'app'))
+        self.assertEqual(status, [{
+            'name': 'app_php', 'service': 'php', 'state': 'running',
+            'status': 'Up 2 minutes (healthy)', 'health': 'healthy',
+        }])
+        query = [path for path in self.server.requests if '/containers/json' in path][0]
+        self.assertIn('com.docker.compose.project%3Dapp', query)
+
+    def test_watch_events(self):
+        """Test that the container events of the project are streamed and decoded"""
+        events = self.docker_manager.watch_events(os.path.join(self.socket_dir, 'app'), since=1700000000)
+        self.assertEqual([event['Action'] for event in events], ['die', 'start'])
+        query = [path for path in self.server.requests if '/events' in path][0]
+        self.assertIn('since=1700000000', query)
+        self.assertIn('com.docker.compose.project%3Dapp', query)
+
+    def test_container_logs(self):
+        """Test that a container's output is streamed with stdout and stderr demultiplexed"""
+        stream = self.docker_manager.container_logs('app_php', tail=10)
+        self.assertEqual(b"".join(stream), b"ready to handle connections\nNOTICE: fpm is running\n")
+        query = [path for path in self.server.requests if '/logs' in path][0]
+        self.assertIn('tail=10', query)
+
+    def test_parse_health(self):
+        """Test that the health is read from both status text forms"""
+        self.assertEqual(DockerManager.parse_health('Up 1 second (health: starting)'), 'starting')
+        self.assertEqual(DockerManager.parse_health('Up 3 hours (unhealthy)'), 'unhealthy')
+        self.assertIsNone(DockerManager.parse_health('Exited (1) 2 minutes ago'))
+
+    def test_unreachable_daemon(self):
+        """Test that a missing socket reports Docker as unavailable without raising"""
+        docker_manager = DockerManager(f"unix://{os.path.join(self.socket_dir, 'missing.sock')}")
+        self.assertFalse(docker_manager.is_docker_installed())
+        self.assertEqual(docker_manager.get_container_status(), [])
+
+    def test_compose_uses_cli(self):
+        """Test that compose operations still go through the docker CLI"""
+        with patch('subprocess.run') as run:
+            self.assertTrue(self.docker_manager.start_containers(build=False))
+        run.assert_called_once_with(["docker", "compose", "up", "-d", "--no-build"], check=True)
+
+if __name__ == '__main__':
+    unittest.main()
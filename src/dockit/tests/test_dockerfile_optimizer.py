@@ -0,0 +1,70 @@
+import unittest
+import os
+import json
+from utilities.dockerfile_optimizer import DockerfileOptimizer
+from utilities.template_loader import TemplateLoader
+from utilities.service_definition import ServiceDefinition
+
+class TestDockerfileOptimizer(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        # Get the project root directory (two levels up from tests)
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        with open(os.path.join(project_root, 'services', 'php', 'service.json'), 'r') as f:
+            self.php = ServiceDefinition.resolve(json.load(f))['8.4']
+
+        self.env = TemplateLoader.create_environment(
+            os.path.join(project_root, 'templates'),
+            compiled_dir=os.path.join(os.path.dirname(__file__), 'no_precompiled')
+        )
+
+    def render(self, optimize: bool) -> str:
+        build = self.php['build']
+        return self.env.get_template('Dockerfile.j2').render(
+            build=build,
+            compose=self.php['compose'],
+            optimize=optimize,
+            plan=DockerfileOptimizer.optimize(build) if optimize else None
+        )
+
+    def test_apt_installs_are_merged(self):
+        """Test that every apt package is installed by one RUN with cache mounts"""
+        dockerfile = self.render(optimize=True)
+        self.assertTrue(dockerfile.startswith('# syntax=docker/dockerfile:1'))
+        self.assertEqual(dockerfile.count('apt-get install'), 1)
+        self.assertIn('--no-install-recommends', dockerfile)
+        self.assertIn('--mount=type=cache,target=/var/cache/apt', dockerfile)
+        for package in ['git', 'jpegoptim', 'gifsicle', 'libicu-dev']:
+            self.assertIn(f'        {package}', dockerfile)
+
+    def test_cleanup_made_redundant_by_mounts_is_dropped(self):
+        """Test that apt cleanup is dropped and pecl keeps its cache mount intact"""
+        run = DockerfileOptimizer.run_instructions(self.php['build']['run'])
+        self.assertFalse(any('apt-get clean' in cmd for cmd in run))
+        pecl = [cmd for cmd in run if 'pecl install' in cmd][0]
+        self.assertTrue(pecl.startswith('--mount=type=cache,target=/tmp/pear '))
+        self.assertNotIn('rm -rf /tmp/pear', pecl)
+        self.assertIn('docker-php-ext-enable redis', pecl)
+
+    def test_composer_cache_is_mounted(self):
+        """Test that composer commands use a mounted cache directory"""
+        run = DockerfileOptimizer.run_instructions(['composer global require laravel/installer'])
+        self.assertEqual(run, [
+            '--mount=type=cache,target=/tmp/composer-cache '
+            'COMPOSER_CACHE_DIR=/tmp/composer-cache composer global require laravel/installer'
+        ])
+
+    def test_copies_from_images_come_first(self):
+        """Test that copies from other images are ordered before build context copies"""
+        copies = DockerfileOptimizer.order_copies(['./php.ini /etc/php.ini', '--from=composer:latest /a /b'])
+        self.assertEqual(copies, ['--from=composer:latest /a /b', './php.ini /etc/php.ini'])
+
+    def test_layer_count_is_reduced(self):
+        """Test the layer count of the optimized Dockerfile against the standard one"""
+        standard = DockerfileOptimizer.count_layers(self.render(optimize=False))
+        optimized = DockerfileOptimizer.count_layers(self.render(optimize=True))
+        self.assertEqual(standard, 38)
+        self.assertEqual(optimized, 17)
+
+if __name__ == '__main__':
+    unittest.main()
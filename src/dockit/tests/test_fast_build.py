@@ -0,0 +1,58 @@
+import unittest
+import os
+import json
+from utilities.fast_build import FastBuild
+from utilities.dockerfile_optimizer import DockerfileOptimizer
+from utilities.service_definition import ServiceDefinition
+
+class TestFastBuild(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        # Get the project root directory (two levels up from tests)
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        with open(os.path.join(project_root, 'services', 'php', 'service.json'), 'r') as f:
+            self.php = ServiceDefinition.resolve(json.load(f))['8.4']
+
+    def test_extension_installs_are_collapsed(self):
+        """Test that every extension is installed by a single install-php-extensions call"""
+        build = FastBuild.rewrite(self.php['build'])
+        installs = [cmd for cmd in build['run'] if 'install-php-extensions' in cmd]
+        self.assertEqual(installs, [
+            'MAKEFLAGS="-j$(nproc)" install-php-extensions '
+            'pdo_mysql mbstring exif pcntl bcmath opcache intl zip redis gd xdebug'
+        ])
+        self.assertFalse(any('docker-php-ext-' in cmd or 'pecl' in cmd for cmd in build['run']))
+        self.assertIn('docker-php-source delete', build['run'])
+
+    def test_dev_packages_are_dropped(self):
+        """Test that -dev packages are left to the installer while runtime tools stay"""
+        apt = FastBuild.rewrite(self.php['build'])['apt']
+        self.assertFalse(any('-dev' in entry for entry in apt))
+        self.assertIn('jpegoptim optipng pngquant gifsicle', apt)
+        self.assertIn('git', apt)
+
+    def test_source_build_is_left_untouched(self):
+        """Test that the service definition itself is not modified"""
+        original = json.dumps(self.php['build'], sort_keys=True)
+        rewritten = FastBuild.rewrite(self.php['build'])
+        self.assertEqual(json.dumps(self.php['build'], sort_keys=True), original)
+        self.assertEqual(rewritten['runtime'], self.php['build']['runtime'])
+
+    def test_installer_is_copied_in(self):
+        """Test that the installer binary is added when the build does not copy it"""
+        build = FastBuild.rewrite({'base_image': 'php:8.4-fpm', 'run': ['pecl install redis-6.0.2']})
+        self.assertEqual(build['copies'][0].split()[0], '--from=mlocati/php-extension-installer')
+        self.assertEqual(build['run'], ['MAKEFLAGS="-j$(nproc)" install-php-extensions redis@6.0.2'])
+
+    def test_build_without_extensions_is_unchanged(self):
+        """Test that builds which install no extensions are returned as they are"""
+        build = {'base_image': 'node:20', 'run': ['npm ci', 'make build']}
+        self.assertIs(FastBuild.rewrite(build), build)
+
+    def test_optimizer_mounts_apt_for_installer(self):
+        """Test that the optimized plan mounts the apt caches for the collapsed install"""
+        run = DockerfileOptimizer.run_instructions(FastBuild.rewrite(self.php['build'])['run'])
+        self.assertTrue(run[-1].startswith('--mount=type=cache,target=/var/cache/apt'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import os
+import shutil
+from utilities.file_writer import FileWriter
+
+class TestFileWriter(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.path = os.path.join(self.test_dir, 'nested', 'Dockerfile')
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        if os.path.exists(self.test_dir):
+            try:
+                shutil.rmtree(self.test_dir)
+            except OSError:
+                pass  # Ignore cleanup errors
+
+    def test_write_creates_file(self):
+        """Test that a new file is written with default permissions"""
+        writer = FileWriter()
+        self.assertTrue(writer.write(self.path, 'FROM php:8.4-fpm\n'))
+        with open(self.path, 'r') as f:
+            self.assertEqual(f.read(), 'FROM php:8.4-fpm\n')
+        self.assertEqual(writer.written, [self.path])
+        self.assertNotEqual(os.stat(self.path).st_mode & 0o044, 0)
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.path)) if name.endswith('.tmp')], [])
+
+    def test_unchanged_file_is_not_touched(self):
+        """Test that identical content leaves the file and its mtime alone"""
+        FileWriter().write(self.path, 'FROM php:8.4-fpm\n')
+        os.utime(self.path, ns=(1_000_000_000, 1_000_000_000))
+
+        writer = FileWriter()
+        self.assertFalse(writer.write(self.path, 'FROM php:8.4-fpm\n'))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1_000_000_000)
+        self.assertEqual(writer.unchanged, [self.path])
+        self.assertEqual(writer.summary(), '0 file(s) written, 1 unchanged')
+
+    def test_changed_file_is_replaced(self):
+        """Test that different content replaces the file and keeps its mode"""
+        FileWriter().write(self.path, 'FROM php:8.3-fpm\n')
+        os.chmod(self.path, 0o600)
+
+        writer = FileWriter()
+        self.assertTrue(writer.write(self.path, 'FROM php:8.4-fpm\n'))
+        with open(self.path, 'r') as f:
+            self.assertEqual(f.read(), 'FROM php:8.4-fpm\n')
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,16 @@ import unittest
 import os
 import shutil
 import json
+import copy
+import yaml
 from commands.generator import Generator
 from utilities.service_manager import ServiceManager
 from utilities.path_resolver import PathResolver
 from utilities.messenger import Messenger
+from utilities.build_manager import BuildManager
+from utilities.service_definition import ServiceDefinition
+from commands.generate import generate_project
+from unittest.mock import patch
 
 class TestGenerator(unittest.TestCase):
     def setUp(self):
@@ -35,7 +41,7 @@ class TestGenerator(unittest.TestCase):
             
         # Load the actual service configuration
         with open(os.path.join(target_service_dir, 'service.json'), 'r') as f:
-            self.test_service = json.load(f)
+            self.test_service = ServiceDefinition.resolve(json.load(f))
             
         # Copy actual templates
         self.copy_actual_templates()
@@ -138,5 +144,82 @@ class TestGenerator(unittest.TestCase):
         self.assertTrue(os.path.exists(os.path.join('dockit', 'php-8.2', 'Dockerfile')))
         self.assertTrue(os.path.exists(os.path.join('dockit', 'php-8.2', 'php.ini')))
 
+    def test_run_in_project_dir(self):
+        """Test generating into a project directory other than the working directory"""
+        project_dir = os.path.join(self.test_dir, 'My App')
+        generator = Generator({"php": "8.2"}, project_dir)
+        generator.service_manager = self.service_manager
+        self.assertTrue(generator.run())
+
+        self.assertFalse(os.path.exists('docker-compose.yml'))
+        self.assertTrue(os.path.exists(os.path.join(project_dir, 'dockit', 'php-8.2', 'Dockerfile')))
+        self.assertTrue(os.path.exists(os.path.join(project_dir, 'dockit', 'php-8.2', 'php.ini')))
+        with open(os.path.join(project_dir, 'docker-compose.yml'), 'r') as f:
+            content = f.read()
+            self.assertIn('name: my-app', content)
+            self.assertIn('context: ./dockit/php-8.2', content)
+
+    def test_rerun_leaves_unchanged_files(self):
+        """Test that regenerating the same stack does not rewrite any file"""
+        generator = Generator({"php": "8.2"})
+        generator.service_manager = self.service_manager
+        self.service_manager.services = {'php': copy.deepcopy(self.test_service)}
+        generator.run()
+        dockerfile_mtime = os.stat(os.path.join('dockit', 'php-8.2', 'Dockerfile')).st_mtime_ns
+
+        generator = Generator({"php": "8.2"})
+        generator.service_manager = self.service_manager
+        self.service_manager.services = {'php': copy.deepcopy(self.test_service)}
+        self.assertTrue(generator.run())
+        self.assertEqual(generator.writer.written, [])
+        self.assertEqual(os.stat(os.path.join('dockit', 'php-8.2', 'Dockerfile')).st_mtime_ns, dockerfile_mtime)
+
+    def test_build_cache_entries(self):
+        """Test that each built image gets its own local cache directory in the compose file"""
+        project_dir = os.path.join(self.test_dir, 'app')
+        cache_dir = os.path.join(self.test_dir, 'buildcache')
+        generator = Generator({"php": "8.2"}, project_dir, build_cache=cache_dir)
+        generator.service_manager = self.service_manager
+        self.service_manager.services = {'php': copy.deepcopy(self.test_service)}
+        self.assertTrue(generator.run())
+
+        with open(os.path.join(project_dir, 'docker-compose.yml'), 'r') as f:
+            compose = yaml.safe_load(f)
+        build = compose['services']['php']['build']
+        directory = os.path.join(os.path.abspath(cache_dir), 'php-8.2')
+        self.assertEqual(build['cache_from'], [f"type=local,src={directory}"])
+        self.assertEqual(build['cache_to'], [f"type=local,dest={directory},mode=max"])
+
+        # The bake file built from the compose file uses the same caches
+        definition = BuildManager(project_dir).bake_definition(compose)
+        self.assertEqual(definition['target']['php']['cache-from'], build['cache_from'])
+
+    def test_dependency_conditions(self):
+        """Test that dependencies with a healthcheck are waited for until healthy"""
+        services = {
+            'mysql': {'compose': {'healthcheck': {'test': ['CMD', 'mysqladmin', 'ping']}}},
+            'mailhog': {'compose': {}},
+            'phpmyadmin': {'compose': {'depends_on': ['mysql', 'mailhog']}},
+        }
+        self.assertEqual(
+            Generator.dependency_conditions(services['phpmyadmin'], services),
+            {'mysql': 'service_healthy', 'mailhog': 'service_started'}
+        )
+        self.assertEqual(Generator.dependency_conditions(services['mysql'], services), {})
+
+    def test_generate_project_reports_unexpected_errors(self):
+        """Test that any error while generating one project lands in its result instead of stopping the batch"""
+        project_dir = os.path.join(self.test_dir, 'project')
+        os.makedirs(project_dir)
+        with open(os.path.join(project_dir, 'dockit.yml'), 'w') as f:
+            f.write('services:\n  php: "8.2"\n')
+
+        with patch('commands.generate.ServiceManager') as service_manager, \
+                patch('commands.generate.Generator', side_effect=KeyError('compose')):
+            service_manager.return_value.find_selection_error.return_value = None
+            result = generate_project(project_dir, 'dockit.yml', {})
+        self.assertFalse(result['ok'])
+        self.assertEqual(result['error'], "KeyError: 'compose'")
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,130 @@
+import os
+import unittest
+import threading
+from utilities.log_multiplexer import LogFilter, LogBuffer, LogMultiplexer
+
+class FakeStream:
+    """Yields the given chunks, then blocks like a followed log until closed"""
+
+    def __init__(self, chunks, block: bool = False):
+        self.chunks = chunks
+        self.block = block
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield chunk
+        if self.block:
+            self.closed.wait(5)
+            raise OSError("stream closed")
+
+    def close(self):
+        self.closed.set()
+
+class FakeDockerManager:
+    def __init__(self, logs, block: bool = False):
+        self.logs = logs
+        self.block = block
+        self.requests = []
+
+    def container_logs(self, container, tail="all", follow=False):
+        self.requests.append((container, tail, follow))
+        return FakeStream(self.logs[container], self.block)
+
+CONTAINERS = [{"name": "app_php", "service": "php"}, {"name": "app_mysql", "service": "mysql"}]
+LOGS = {
+    "app_php": [b"NOTICE: fpm is running\n[18-Oct-2026] WARNING: [pool www] ser", b"ver reached max_children\n"],
+    "app_mysql": [b"[Note] InnoDB: ready\n", b"[ERROR] Access denied for user 'root'\n", b"[Warning] deprecated\n"],
+}
+
+class TestLogFilter(unittest.TestCase):
+    def test_levels(self):
+        """Test that level names are read as services spell them"""
+        self.assertEqual(LogFilter.level_of("[Warning] deprecated"), "warning")
+        self.assertEqual(LogFilter.level_of("2026/10/18 [crit] 7#7: open() failed"), "critical")
+        self.assertEqual(LogFilter.level_of("FATAL:  password authentication failed"), "critical")
+        self.assertIsNone(LogFilter.level_of("    at Illuminate\\Foundation\\Http\\Kernel"))
+
+    def test_matches(self):
+        """Test that pattern and level have to match together"""
+        log_filter = LogFilter(r"denied|deprecated", "error")
+        self.assertTrue(log_filter.matches("[ERROR] Access denied for user 'root'"))
+        self.assertFalse(log_filter.matches("[Warning] deprecated"))
+        self.assertFalse(log_filter.matches("[ERROR] Table missing"))
+
+    def test_unknown_level(self):
+        """Test that an unknown level is rejected and aliases are accepted"""
+        with self.assertRaises(ValueError):
+            LogFilter(level="loud")
+        self.assertEqual(LogFilter(level="WARN").level, "warning")
+
+class TestLogBuffer(unittest.TestCase):
+    def test_bounded(self):
+        """Test that a full buffer drops its oldest lines and counts them"""
+        buffer = LogBuffer(2)
+        for line in ["a", "b", "c", "d"]:
+            buffer.append(line)
+        self.assertEqual(buffer.drain(), (["c", "d"], 2))
+        self.assertEqual(buffer.drain(), ([], 0))
+
+class TestLogMultiplexer(unittest.TestCase):
+    def test_tail(self):
+        """Test that the last lines of every service are read, split on line ends"""
+        docker_manager = FakeDockerManager(LOGS)
+        lines = LogMultiplexer(docker_manager, CONTAINERS).tail(2)
+        self.assertEqual(lines["php"], [
+            "NOTICE: fpm is running",
+            "[18-Oct-2026] WARNING: [pool www] server reached max_children",
+        ])
+        self.assertEqual(lines["mysql"], ["[ERROR] Access denied for user 'root'", "[Warning] deprecated"])
+        self.assertIn(("app_php", 2, False), docker_manager.requests)
+
+    def test_tail_filtered(self):
+        """Test that with a filter the whole log is searched for the last matching lines"""
+        docker_manager = FakeDockerManager(LOGS)
+        lines = LogMultiplexer(docker_manager, CONTAINERS, log_filter=LogFilter(level="warning")).tail(1)
+        self.assertEqual(lines["php"], ["[18-Oct-2026] WARNING: [pool www] server reached max_children"])
+        self.assertEqual(lines["mysql"], ["[Warning] deprecated"])
+        self.assertIn(("app_mysql", "all", False), docker_manager.requests)
+
+    def test_follow_until_closed(self):
+        """Test that following hands lines over as they come and stops once closed"""
+        multiplexer = LogMultiplexer(FakeDockerManager(LOGS, block=True), CONTAINERS, interval=0.01)
+        received = {}
+        seen_all = threading.Event()
+
+        def on_lines(service, lines, dropped):
+            received.setdefault(service, []).extend(lines)
+            if sum(len(lines) for lines in received.values()) == 5:
+                seen_all.set()
+
+        threading.Thread(target=lambda: seen_all.wait(5) and multiplexer.close(), daemon=True).start()
+        multiplexer.follow(on_lines, tail=10)
+        self.assertEqual(len(received["php"]), 2)
+        self.assertEqual(len(received["mysql"]), 3)
+        # Stopping on purpose is not a read error
+        self.assertEqual(multiplexer.errors, {})
+
+    def test_follow_more_containers_than_default_threads(self):
+        """Test that every container is followed, even more than the default executor has threads"""
+        count = min(32, (os.cpu_count() or 1) + 4) + 2
+        containers = [{"name": f"app_{i}", "service": f"svc{i}"} for i in range(count)]
+        logs = {container["name"]: [b"[Note] ready\n"] for container in containers}
+        multiplexer = LogMultiplexer(FakeDockerManager(logs, block=True), containers, interval=0.01)
+        received = set()
+        seen_all = threading.Event()
+
+        def on_lines(service, lines, dropped):
+            received.add(service)
+            if len(received) == count:
+                seen_all.set()
+
+        followed = []
+        threading.Thread(target=lambda: (followed.append(seen_all.wait(2)), multiplexer.close()), daemon=True).start()
+        multiplexer.follow(on_lines, tail=10)
+        # Every container was read while the others were still being followed
+        self.assertEqual(followed, [True])
+        self.assertEqual(len(received), count)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import os
+import shutil
+import json
+import hashlib
+from utilities.override_migration import OverrideMigration
+from utilities.path_resolver import PathResolver
+
+class TestOverrideMigration(unittest.TestCase):
+    def setUp(self):
+        """Set up a ~/.dockit holding a full copy of the catalog, as older releases left it"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        self.services_dir = os.path.join(self.test_dir, 'services')
+        self.templates_dir = os.path.join(self.test_dir, 'templates')
+        self.history_path = os.path.join(self.test_dir, 'bundled_history.json')
+
+        shutil.copytree(PathResolver.get_predefined_services_path(), self.services_dir)
+        shutil.copytree(PathResolver.get_predefined_templates_path(), self.templates_dir)
+        os.makedirs(os.path.join(self.services_dir, '__pycache__'), exist_ok=True)
+        with open(os.path.join(self.services_dir, '__pycache__', '__init__.cpython-311.pyc'), 'wb') as f:
+            f.write(b'\0')
+
+        # An older release shipped a different redis service.json
+        self.old_redis = b'{"7.0": {"image": "redis:7.0", "compose": {}}}'
+        with open(os.path.join(self.services_dir, 'redis', 'service.json'), 'wb') as f:
+            f.write(self.old_redis)
+        with open(self.history_path, 'w') as f:
+            json.dump({'services/redis/service.json': [hashlib.sha256(self.old_redis).hexdigest()]}, f)
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        if os.path.exists(self.test_dir):
+            try:
+                shutil.rmtree(self.test_dir)
+            except OSError:
+                pass  # Ignore cleanup errors
+
+    def migration(self) -> OverrideMigration:
+        return OverrideMigration(self.services_dir, self.templates_dir, self.history_path)
+
+    def test_shipped_copies_are_removed(self):
+        """Test that copies of current and past bundled files go, and edited or added files stay"""
+        edited = os.path.join(self.services_dir, 'php', 'service.json')
+        with open(edited, 'w') as f:
+            json.dump({'8.4': {'image': 'php:8.4-custom', 'compose': {}}}, f)
+        added = os.path.join(self.services_dir, 'custom', 'service.json')
+        os.makedirs(os.path.dirname(added))
+        with open(added, 'w') as f:
+            json.dump({'1.0': {'image': 'custom:1.0', 'compose': {}}}, f)
+
+        migration = self.migration()
+        removed = migration.run()
+
+        self.assertIn(os.path.join(self.services_dir, 'redis', 'service.json'), removed)
+        self.assertIn(os.path.join(self.templates_dir, 'Dockerfile.j2'), removed)
+        self.assertEqual(sorted(migration.kept), sorted([edited, added]))
+        self.assertFalse(os.path.exists(os.path.join(self.services_dir, 'redis')))
+        self.assertFalse(os.path.exists(os.path.join(self.services_dir, '__pycache__')))
+        self.assertEqual(os.listdir(self.templates_dir), [])
+        # The layers themselves stay, ready for overrides
+        self.assertTrue(os.path.isdir(self.services_dir))
+
+    def test_runs_once(self):
+        """Test that a migrated layout is left alone, even when files match the bundled ones again"""
+        self.assertTrue(self.migration().run())
+        shutil.copy2(os.path.join(PathResolver.get_predefined_templates_path(), 'Dockerfile.j2'), self.templates_dir)
+
+        self.assertFalse(self.migration().needed())
+        self.assertEqual(self.migration().run(), [])
+        self.assertTrue(os.path.exists(os.path.join(self.templates_dir, 'Dockerfile.j2')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -65,6 +65,7 @@ class TestPublishCommand(unittest.TestCase):
     def tearDown(self):
         """Clean up test environment after each test"""
         # Restore original PathResolver methods
+        PathResolver.get_home_dir = self.original_home_dir
         PathResolver.get_services_dir = self.original_services_dir
         PathResolver.get_templates_dir = self.original_templates_dir
         
@@ -119,8 +120,8 @@ class TestPublishCommand(unittest.TestCase):
         publish_cmd.initialize_directories()
         
         # Check if directories were created
-        self.assertTrue(os.path.exists(PathResolver.get_services_dir()))
-        self.assertTrue(os.path.exists(PathResolver.get_templates_dir()))
+        self.assertTrue(os.path.exists(publish_cmd.services_dir))
+        self.assertTrue(os.path.exists(publish_cmd.templates_dir))
 
     def test_publish_services(self):
         """Test service publishing"""
@@ -185,5 +186,24 @@ class TestPublishCommand(unittest.TestCase):
         result = publish_cmd.publish(force=True)
         self.assertTrue(result)  # Should return True as force is enabled
 
+    def test_force_publish_is_incremental(self):
+        """Test that force publishing copies nothing when up to date and restores edited files"""
+        publish_cmd = PublishCommand()
+        publish_cmd.initialize_directories()
+        publish_cmd.publish_services(force=True)
+
+        # Published for reference, never into the override layer
+        self.assertNotEqual(publish_cmd.services_dir, publish_cmd.service_manager.services_dir)
+        service_path = os.path.join(publish_cmd.services_dir, 'php', 'service.json')
+        self.assertFalse(PublishCommand().publish_services(force=True))
+
+        with open(service_path, 'w') as f:
+            f.write('{}')
+        republish_cmd = PublishCommand()
+        self.assertTrue(republish_cmd.publish_services(force=True))
+        self.assertEqual(republish_cmd.sync.copied, [service_path])
+        with open(service_path, 'r') as f:
+            self.assertEqual(json.load(f), self.test_service)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
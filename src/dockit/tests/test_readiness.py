@@ -0,0 +1,74 @@
+import unittest
+import time
+import threading
+from utilities.readiness import ReadinessWaiter
+
+class ScriptedDockerManager:
+    """Reports container states from a script, one entry per poll (the last one repeats)"""
+
+    def __init__(self, scripts: dict, delay: float = 0.0):
+        self.scripts = scripts
+        self.delay = delay
+        self.polls = {name: 0 for name in scripts}
+        self.lock = threading.Lock()
+
+    def get_container_state(self, container: str):
+        time.sleep(self.delay)
+        with self.lock:
+            script = self.scripts[container]
+            state = script[min(self.polls[container], len(script) - 1)]
+            self.polls[container] += 1
+        return state
+
+def state(status, health=None):
+    return {'status': status, 'health': health}
+
+class TestReadinessWaiter(unittest.TestCase):
+    def test_waits_for_health(self):
+        """Test that services with a healthcheck are ready only once healthy"""
+        docker_manager = ScriptedDockerManager({
+            'app_mysql': [None, state('running', 'starting'), state('running', 'starting'), state('running', 'healthy')],
+            'app_nginx': [state('running')],
+        })
+        results = ReadinessWaiter(docker_manager, timeout=5, interval=0.01).wait_all(
+            {'mysql': 'app_mysql', 'nginx': 'app_nginx'}
+        )
+        self.assertTrue(results['mysql']['ready'])
+        self.assertEqual(results['mysql']['state'], 'healthy')
+        self.assertEqual(docker_manager.polls['app_mysql'], 4)
+        self.assertTrue(results['nginx']['ready'])
+        self.assertEqual(docker_manager.polls['app_nginx'], 1)
+        self.assertLessEqual(results['nginx']['seconds'], results['mysql']['seconds'])
+
+    def test_failures_and_timeout(self):
+        """Test that unhealthy or exited containers fail at once and slow ones time out"""
+        docker_manager = ScriptedDockerManager({
+            'app_redis': [state('running', 'unhealthy')],
+            'app_php': [state('exited')],
+            'app_mongo': [state('running', 'starting')],
+        })
+        results = ReadinessWaiter(docker_manager, timeout=0.1, interval=0.01).wait_all(
+            {'redis': 'app_redis', 'php': 'app_php', 'mongo': 'app_mongo'}
+        )
+        self.assertEqual([result['ready'] for result in results.values()], [False, False, False])
+        self.assertEqual(results['redis']['state'], 'unhealthy')
+        self.assertEqual(results['php']['state'], 'exited')
+        self.assertEqual(results['mongo']['state'], 'timed out (starting)')
+
+    def test_services_are_waited_for_concurrently(self):
+        """Test that slow state lookups overlap instead of adding up"""
+        names = {f'svc{i}': f'app_svc{i}' for i in range(8)}
+        docker_manager = ScriptedDockerManager(
+            {container: [state('running', 'starting'), state('running', 'healthy')] for container in names.values()},
+            delay=0.1
+        )
+        started_at = time.perf_counter()
+        results = ReadinessWaiter(docker_manager, timeout=5, interval=0.01).wait_all(names)
+        elapsed = time.perf_counter() - started_at
+
+        self.assertTrue(all(result['ready'] for result in results.values()))
+        # 16 lookups of 0.1s each would take 1.6s one after the other
+        self.assertLess(elapsed, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
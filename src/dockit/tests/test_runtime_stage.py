@@ -0,0 +1,81 @@
+import unittest
+import os
+import json
+from utilities.dockerfile_optimizer import DockerfileOptimizer
+from utilities.runtime_stage import RuntimeStage
+from utilities.template_loader import TemplateLoader
+from utilities.service_definition import ServiceDefinition
+
+class TestRuntimeStage(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        # Get the project root directory (two levels up from tests)
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        with open(os.path.join(project_root, 'services', 'php', 'service.json'), 'r') as f:
+            self.php = ServiceDefinition.resolve(json.load(f))['8.4']
+
+        self.env = TemplateLoader.create_environment(
+            os.path.join(project_root, 'templates'),
+            compiled_dir=os.path.join(os.path.dirname(__file__), 'no_precompiled')
+        )
+
+    def render(self, build: dict, optimize: bool = False) -> str:
+        return self.env.get_template('Dockerfile.j2').render(
+            build=build,
+            compose=self.php['compose'],
+            optimize=optimize,
+            plan=DockerfileOptimizer.optimize(build) if optimize else None,
+            runtime=RuntimeStage.plan(build, optimize)
+        )
+
+    def test_single_stage_without_runtime(self):
+        """Test that a build without a runtime block renders a single stage"""
+        build = dict(self.php['build'])
+        del build['runtime']
+        self.assertIsNone(RuntimeStage.plan(build))
+
+        dockerfile = self.render(build)
+        self.assertEqual(dockerfile.count('FROM '), 1)
+        self.assertNotIn('AS builder', dockerfile)
+
+    def test_runtime_stage_keeps_only_artifacts(self):
+        """Test that the final stage copies the artifacts instead of installing -dev packages"""
+        dockerfile = self.render(self.php['build'])
+        builder, runtime = dockerfile.split('# Runtime stage')
+
+        self.assertIn('FROM php:8.4-fpm AS builder', builder)
+        self.assertIn('libicu-dev', builder)
+        self.assertIn('/dockit/base-libs.txt', builder)
+        self.assertIn('ldd', builder)
+
+        self.assertIn('FROM php:8.4-fpm\n', runtime)
+        self.assertNotIn('libicu-dev', runtime)
+        self.assertNotIn('docker-php-ext-install', runtime)
+        self.assertIn('COPY --from=builder /usr/local/lib/php/extensions /usr/local/lib/php/extensions', runtime)
+        self.assertIn('COPY --from=builder /usr/local/etc/php/conf.d /usr/local/etc/php/conf.d', runtime)
+        self.assertIn('COPY --from=builder /dockit/runtime-libs/ /', runtime)
+        self.assertIn('COPY --from=composer:latest /usr/bin/composer /usr/bin/composer', runtime)
+        self.assertEqual(runtime.count('apt-get install'), 1)
+        self.assertIn('WORKDIR /var/www/html', runtime)
+        self.assertIn('CMD ["/bin/bash"', runtime)
+
+    def test_runtime_apt_uses_cache_mounts_when_optimized(self):
+        """Test that the runtime apt install mounts the apt caches in optimized mode"""
+        standard = RuntimeStage.apt_instruction(['git', 'zip unzip'], optimize=False)
+        self.assertEqual(
+            standard,
+            'apt-get update && apt-get install -y --no-install-recommends git unzip zip && rm -rf /var/lib/apt/lists/*'
+        )
+
+        optimized = RuntimeStage.apt_instruction(['git'], optimize=True)
+        self.assertTrue(optimized.startswith('--mount=type=cache,target=/var/cache/apt'))
+        self.assertNotIn('rm -rf /var/lib/apt/lists', optimized)
+        self.assertEqual(RuntimeStage.apt_instruction([], optimize=True), '')
+
+    def test_runtime_base_image_can_differ(self):
+        """Test that the runtime stage may start from its own base image"""
+        build = dict(self.php['build'], runtime=dict(self.php['build']['runtime'], base_image='php:8.4-fpm-bookworm'))
+        self.assertEqual(RuntimeStage.plan(build)['base_image'], 'php:8.4-fpm-bookworm')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import json
+import unittest
+from utilities.service_definition import ServiceDefinition
+
+class TestServiceDefinition(unittest.TestCase):
+    def setUp(self):
+        """Set up a service.json with an abstract template and versions extending it"""
+        self.data = {
+            "priority": 3,
+            "_fpm": {
+                "image": "php:{version}-fpm",
+                "container_name": "php_${PROJECT_NAME}",
+                "environment": {"APP_ENV": "local", "XDEBUG_MODE": "off"},
+                "volumes": ["./dockit/php-{version}/php.ini:/usr/local/etc/php/php.ini"],
+            },
+            "8.4": {"extends": "_fpm"},
+            "8.3": {"extends": "8.4", "environment": {"XDEBUG_MODE": "debug", "APP_ENV": None}},
+        }
+
+    def test_resolve_lists_concrete_versions_only(self):
+        """Test that priority and abstract templates are not offered as versions"""
+        self.assertEqual(list(ServiceDefinition.resolve(self.data)), ["8.4", "8.3"])
+
+    def test_version_placeholder_is_substituted(self):
+        """Test that {version} becomes each version's name and ${...} is left alone"""
+        resolved = ServiceDefinition.resolve(self.data)
+        self.assertEqual(resolved["8.4"]["image"], "php:8.4-fpm")
+        self.assertEqual(resolved["8.3"]["image"], "php:8.3-fpm")
+        self.assertEqual(resolved["8.3"]["volumes"], ["./dockit/php-8.3/php.ini:/usr/local/etc/php/php.ini"])
+        self.assertEqual(resolved["8.3"]["container_name"], "php_${PROJECT_NAME}")
+        self.assertNotIn("extends", resolved["8.3"])
+
+    def test_mappings_merge_and_null_removes_a_key(self):
+        """Test that an extending version overrides key by key and null drops inherited keys"""
+        resolved = ServiceDefinition.resolve(self.data)
+        self.assertEqual(resolved["8.4"]["environment"], {"APP_ENV": "local", "XDEBUG_MODE": "off"})
+        self.assertEqual(resolved["8.3"]["environment"], {"XDEBUG_MODE": "debug"})
+
+    def test_resolve_does_not_modify_the_data(self):
+        """Test that resolving leaves the loaded json as it was"""
+        ServiceDefinition.resolve(self.data)
+        self.assertEqual(self.data["_fpm"]["environment"], {"APP_ENV": "local", "XDEBUG_MODE": "off"})
+        self.assertEqual(self.data["8.3"]["extends"], "8.4")
+
+    def test_invalid_extends_raise(self):
+        """Test that circular and unknown parents are reported"""
+        with self.assertRaisesRegex(ValueError, "Circular extends"):
+            ServiceDefinition.resolve({"1": {"extends": "2"}, "2": {"extends": "1"}})
+        with self.assertRaisesRegex(ValueError, "unknown version '9'"):
+            ServiceDefinition.resolve({"1": {"extends": "9"}})
+
+    def test_dependents(self):
+        """Test that versions extending another are found"""
+        self.assertEqual(ServiceDefinition.dependents(self.data, "_fpm"), ["8.4"])
+        self.assertEqual(ServiceDefinition.dependents(self.data, "8.4"), ["8.3"])
+        self.assertEqual(ServiceDefinition.dependents(self.data, "8.3"), [])
+
+    def test_bundled_versions_only_extend_templates(self):
+        """Test that no bundled version extends another one, so each can be deleted or hidden alone"""
+        services_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'services')
+        for service_name in sorted(os.listdir(services_dir)):
+            service_json = os.path.join(services_dir, service_name, 'service.json')
+            if not os.path.isfile(service_json):
+                continue
+            with open(service_json, 'r') as f:
+                data = json.load(f)
+            for version in ServiceDefinition.resolve(data):
+                self.assertEqual(ServiceDefinition.dependents(data, version), [], f"{service_name} {version}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import json
 from utilities.service_manager import ServiceManager
 from utilities.path_resolver import PathResolver
 from utilities.messenger import Messenger
+from utilities.service_definition import ServiceDefinition
 
 class TestServiceManager(unittest.TestCase):
     def setUp(self):
@@ -29,8 +30,7 @@ class TestServiceManager(unittest.TestCase):
 
         # Load and clean test service config (remove priority if exists)
         with open(os.path.join(target_service_dir, 'service.json'), 'r') as f:
-            self.test_service = json.load(f)
-            self.test_service.pop("priority", None)
+            self.test_service = ServiceDefinition.resolve(json.load(f))
 
         # Patch PathResolver
         self.original_services_dir = PathResolver.get_services_dir
@@ -91,6 +91,9 @@ class TestServiceManager(unittest.TestCase):
         self.assertTrue(service_manager.validate_service_config('php', self.test_service['8.2']))
         invalid_config = {"compose": {}}
         self.assertFalse(service_manager.validate_service_config('php', invalid_config))
+        # Keys the schema does not know only warn, as the baseline accepted them
+        legacy_config = dict(self.test_service['8.2'], publishable_files=[], notes="pinned")
+        self.assertTrue(service_manager.validate_service_config('php', legacy_config))
 
     def test_handle_service_files(self):
         """Test handling service files"""
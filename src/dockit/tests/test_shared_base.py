@@ -0,0 +1,91 @@
+import unittest
+import os
+import json
+import copy
+import shutil
+from commands.generator import Generator
+from utilities.messenger import Messenger
+from utilities.shared_base import SharedBase
+from utilities.service_definition import ServiceDefinition
+
+class TestSharedBase(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        Messenger.set_quiet(True)
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+
+        # Get the project root directory (two levels up from tests)
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        with open(os.path.join(project_root, 'services', 'php', 'service.json'), 'r') as f:
+            self.php = ServiceDefinition.resolve(json.load(f))['8.4']
+
+        # A queue worker built from the same image with a subset of the steps
+        self.worker = copy.deepcopy(self.php)
+        self.worker['build']['apt'].append('supervisor')
+        self.worker['build']['run'] = self.worker['build']['run'][:3]
+        self.worker['compose']['context'] = './dockit/worker-8.4'
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_common_prefix(self):
+        """Test that shared packages and leading image copies make up the base"""
+        prefix = SharedBase.common_prefix([self.php['build'], self.worker['build']])
+        self.assertEqual(prefix['base_image'], 'php:8.4-fpm')
+        self.assertIn('libicu-dev', prefix['apt'])
+        self.assertNotIn('supervisor', prefix['apt'])
+        self.assertEqual(len(prefix['copies']), 2)
+        # xdebug.ini comes from the build context, so the commands stay with the services
+        self.assertEqual(prefix['run'], [])
+
+    def test_run_prefix_is_shared_without_context_copies(self):
+        """Test that common leading commands are shared when nothing is copied from the context"""
+        builds = [
+            {'base_image': 'node:20', 'apt': ['git'], 'run': ['npm i -g pnpm', 'pnpm i']},
+            {'base_image': 'node:20', 'apt': ['git', 'curl'], 'run': ['npm i -g pnpm', 'pnpm build']},
+        ]
+        prefix = SharedBase.common_prefix(builds)
+        self.assertEqual(prefix['run'], ['npm i -g pnpm'])
+
+        remainder = SharedBase.remainder(builds[1], prefix, 'dockit-base-abc')
+        self.assertEqual(remainder['base_image'], 'dockit-base-abc')
+        self.assertEqual(remainder['apt'], ['curl'])
+        self.assertEqual(remainder['run'], ['pnpm build'])
+
+    def test_different_base_images_are_not_grouped(self):
+        """Test that builds FROM different images never share a base"""
+        other = copy.deepcopy(self.worker['build'])
+        other['base_image'] = 'php:8.3-fpm'
+        self.assertEqual(SharedBase.plan({'php': self.php['build'], 'worker': other}), [])
+
+    def test_generate_shared_base(self):
+        """Test that both services build FROM one generated base image"""
+        generator = Generator({'php': '8.4', 'worker': '8.4'}, self.test_dir)
+        services = {'php': copy.deepcopy(self.php), 'worker': self.worker}
+        self.assertTrue(generator.generate_docker_compose(services))
+
+        bases = [name for name in os.listdir(os.path.join(self.test_dir, 'dockit')) if name.startswith('dockit-base-')]
+        self.assertEqual(len(bases), 1)
+        with open(os.path.join(self.test_dir, 'dockit', bases[0], 'Dockerfile'), 'r') as f:
+            base = f.read()
+        self.assertIn('FROM php:8.4-fpm\n', base)
+        self.assertIn('/dockit/base-libs.txt', base)
+        self.assertEqual(bases[0], SharedBase.image_name(base))
+
+        for service in ('php', 'worker'):
+            with open(os.path.join(self.test_dir, 'dockit', f'{service}-8.4', 'Dockerfile'), 'r') as f:
+                dockerfile = f.read()
+            self.assertIn(f'FROM {bases[0]} AS builder', dockerfile)
+            self.assertNotIn('libicu-dev', dockerfile)
+            # The runtime stage still starts from the PHP image
+            self.assertIn('FROM php:8.4-fpm\n', dockerfile)
+
+        with open(os.path.join(self.test_dir, 'docker-compose.yml'), 'r') as f:
+            compose = f.read()
+        self.assertIn(f'{bases[0]}: service:{bases[0]}', compose)
+        self.assertIn('scale: 0', compose)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import shutil
+from utilities.stack_spec import StackSpec
+
+class TestStackSpec(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.spec_path = os.path.join(self.test_dir, 'stack.yml')
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        if os.path.exists(self.test_dir):
+            try:
+                shutil.rmtree(self.test_dir)
+            except OSError:
+                pass  # Ignore cleanup errors
+
+    def write_spec(self, content: str):
+        with open(self.spec_path, 'w') as f:
+            f.write(content)
+
+    def test_load(self):
+        """Test loading a spec file"""
+        self.write_spec('services:\n  php: "8.4"\n  mysql: latest\n  node: "22"\nstart: true\n')
+        spec = StackSpec.load(self.spec_path)
+        self.assertEqual(spec.services, {'php': '8.4', 'mysql': 'latest', 'node': '22'})
+        self.assertTrue(spec.start)
+
+    def test_load_invalid(self):
+        """Test that malformed specs are rejected"""
+        self.write_spec('- php\n')
+        with self.assertRaises(ValueError):
+            StackSpec.load(self.spec_path)
+
+        self.write_spec('services:\n  php:\n')
+        with self.assertRaises(ValueError):
+            StackSpec.load(self.spec_path)
+
+    def test_unquoted_versions_are_rejected(self):
+        """Test that numeric versions, which YAML may have rounded, must be quoted"""
+        self.write_spec('services:\n  php: 8.10\n')
+        with self.assertRaisesRegex(ValueError, 'quote the version'):
+            StackSpec.load(self.spec_path)
+
+    def test_start_must_be_a_boolean(self):
+        """Test that a quoted "false" is not taken as true"""
+        self.write_spec('services:\n  php: "8.4"\nstart: "false"\n')
+        with self.assertRaisesRegex(ValueError, "'start' must be true or false"):
+            StackSpec.load(self.spec_path)
+
+    def test_parse_services(self):
+        """Test parsing --service options"""
+        self.assertEqual(
+            StackSpec.parse_services(['php=8.4', 'mysql = latest']),
+            {'php': '8.4', 'mysql': 'latest'}
+        )
+        with self.assertRaises(ValueError):
+            StackSpec.parse_services(['php'])
+
+if __name__ == '__main__':
+    unittest.main()
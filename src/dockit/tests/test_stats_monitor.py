@@ -0,0 +1,127 @@
+import os
+import shutil
+import threading
+import unittest
+from commands.top import TopCommand
+from utilities.stats_monitor import StatsMonitor
+
+def reading(total_usage, system_usage, rx, write, usage=300 * 1024 * 1024):
+    return {
+        "pids_stats": {"current": 4},
+        "cpu_stats": {"cpu_usage": {"total_usage": total_usage}, "system_cpu_usage": system_usage, "online_cpus": 4},
+        "precpu_stats": {"cpu_usage": {"total_usage": 0}, "system_cpu_usage": 0},
+        "memory_stats": {"usage": usage, "limit": 1024 * 1024 * 1024, "stats": {"inactive_file": 44 * 1024 * 1024}},
+        "networks": {"eth0": {"rx_bytes": rx, "tx_bytes": 100}, "eth1": {"rx_bytes": rx, "tx_bytes": 0}},
+        "blkio_stats": {"io_service_bytes_recursive": [
+            {"major": 8, "op": "read", "value": 4096},
+            {"major": 8, "op": "write", "value": write},
+        ]},
+    }
+
+class FakeDockerManager:
+    def __init__(self, readings):
+        self.readings = readings
+
+    def container_stats(self, container):
+        return iter(self.readings[container])
+
+class FollowedStats:
+    """Yields the given readings, then blocks like a followed stats stream until closed"""
+
+    def __init__(self, readings):
+        self.readings = readings
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        yield from self.readings
+        self.closed.wait(5)
+        raise OSError("stream closed")
+
+    def close(self):
+        self.closed.set()
+
+class FollowingDockerManager(FakeDockerManager):
+    def container_stats(self, container):
+        return FollowedStats(self.readings[container])
+
+class TestStatsMonitor(unittest.TestCase):
+    def test_parse(self):
+        """Test that a stats reading is turned into CPU %, memory without page cache and I/O counters"""
+        sample = StatsMonitor.parse(reading(50, 1000, rx=1000, write=8192))
+        self.assertEqual(sample["cpu_percent"], 20.0)
+        self.assertEqual(sample["mem_bytes"], 256 * 1024 * 1024)
+        self.assertEqual(sample["net_rx_bytes"], 2000)
+        self.assertEqual(sample["net_tx_bytes"], 100)
+        self.assertEqual(sample["block_read_bytes"], 4096)
+        self.assertEqual(sample["block_write_bytes"], 8192)
+
+    def test_sample_per_service(self):
+        """Test that containers of a service are summed and rates follow the counters"""
+        monitor = StatsMonitor(None, {"app_php": "php", "app_php_2": "php", "app_mysql": "mysql"})
+        monitor.latest = {
+            "app_php": StatsMonitor.parse(reading(50, 1000, rx=1000, write=0)),
+            "app_php_2": StatsMonitor.parse(reading(25, 1000, rx=1000, write=0)),
+            "app_mysql": StatsMonitor.parse(reading(0, 1000, rx=0, write=1024)),
+        }
+        first = monitor.sample(10.0, "2026-10-18T12:00:00")
+        self.assertEqual([row["service"] for row in first], ["mysql", "php"])
+        php = first[1]
+        self.assertEqual(php["containers"], 2)
+        self.assertEqual(php["cpu_percent"], 30.0)
+        self.assertEqual(php["mem_percent"], 25.0)
+        self.assertEqual(php["net_rx_rate"], 0.0)
+
+        monitor.latest["app_php"]["net_rx_bytes"] += 4000
+        php = monitor.sample(12.0)[1]
+        self.assertEqual(php["net_rx_rate"], 2000.0)
+
+    def test_run(self):
+        """Test that the streams are sampled at the interval and stop after the count"""
+        docker_manager = FakeDockerManager({"app_php": [reading(50, 1000, rx=0, write=0)]})
+        monitor = StatsMonitor(docker_manager, {"app_php": "php"}, interval=0.01)
+        samples = []
+        monitor.run(samples.append, count=1)
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(samples[0][0]["cpu_percent"], 20.0)
+
+    def test_run_more_containers_than_default_threads(self):
+        """Test that every container is sampled, even more than the default executor has threads"""
+        count = min(32, (os.cpu_count() or 1) + 4) + 2
+        containers = {f"app_{i}": f"svc{i}" for i in range(count)}
+        docker_manager = FollowingDockerManager({name: [reading(50, 1000, rx=0, write=0)] for name in containers})
+        monitor = StatsMonitor(docker_manager, containers, interval=0.01)
+        samples = []
+
+        def on_sample(rows):
+            samples.append(rows)
+            if len(rows) == count:
+                monitor.close()
+
+        monitor.run(on_sample, count=200)
+        self.assertEqual(len(samples[-1]), count)
+
+class TestTopCommand(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = os.path.join(os.path.dirname(__file__), "test_data")
+        os.makedirs(self.test_dir, exist_ok=True)
+        with open(os.path.join(self.test_dir, "docker-compose.yml"), "w") as f:
+            f.write(
+                "name: shop\n"
+                "services:\n"
+                "  dockit-base-abc:\n    image: dockit-base-abc\n    scale: 0\n"
+                "  php:\n    container_name: shop_php\n"
+                "  mysql:\n    image: mysql:8.0\n"
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_project_containers(self):
+        """Test that containers are named like the compose template names them, base images left out"""
+        self.assertEqual(TopCommand.project_containers(self.test_dir), {"shop_php": "php", "shop_mysql": "mysql"})
+        self.assertEqual(TopCommand.project_containers(self.test_dir, ["php"]), {"shop_php": "php"})
+        with self.assertRaises(ValueError):
+            TopCommand.project_containers(self.test_dir, ["redis"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from utilities.status_board import StatusBoard
+
+def event(action, name="app_mysql", service="mysql", time=1700000000):
+    return {
+        "Type": "container",
+        "Action": action,
+        "Actor": {"Attributes": {"name": name, "com.docker.compose.service": service}},
+        "time": time,
+    }
+
+class TestStatusBoard(unittest.TestCase):
+    def setUp(self):
+        """Set up a board from a container listing"""
+        self.board = StatusBoard([
+            {"name": "app_mysql", "service": "mysql", "state": "running", "health": "healthy"},
+            {"name": "app_php", "service": "php", "state": "running", "health": None},
+        ])
+
+    def test_state_changes(self):
+        """Test that lifecycle events move a container between states"""
+        self.assertTrue(self.board.apply(event("die")))
+        self.assertEqual(self.board.rows["app_mysql"]["state"], "exited")
+        self.assertTrue(self.board.apply(event("start", time=1700000005)))
+        self.assertEqual(self.board.rows["app_mysql"]["state"], "running")
+        # A container with a healthcheck is checked again after a start
+        self.assertEqual(self.board.rows["app_mysql"]["health"], "starting")
+        self.assertEqual(self.board.rows["app_mysql"]["since"].timestamp(), 1700000005)
+
+    def test_health_status(self):
+        """Test that health_status events update the health column"""
+        self.assertTrue(self.board.apply(event("health_status: unhealthy")))
+        self.assertEqual(self.board.rows["app_mysql"]["health"], "unhealthy")
+        self.assertEqual(self.board.rows["app_mysql"]["state"], "running")
+
+    def test_containers_come_and_go(self):
+        """Test that new containers are added and destroyed ones removed"""
+        self.assertTrue(self.board.apply(event("create", name="app_redis", service="redis")))
+        self.assertEqual(self.board.rows["app_redis"]["service"], "redis")
+        self.assertEqual(self.board.rows["app_redis"]["state"], "created")
+        self.assertTrue(self.board.apply(event("destroy", name="app_php", service="php")))
+        self.assertNotIn("app_php", self.board.rows)
+
+    def test_ignored_events(self):
+        """Test that events that do not change the state leave the board alone"""
+        self.assertFalse(self.board.apply(event("exec_start: mysqladmin ping")))
+        self.assertFalse(self.board.apply(event("kill")))
+        self.assertFalse(self.board.apply({"Action": "start", "Actor": {"Attributes": {}}}))
+
+    def test_render(self):
+        """Test that the table has one row per container"""
+        table = self.board.render("app")
+        self.assertEqual(table.row_count, 2)
+        self.assertEqual(list(table.columns[1].cells), ["app_mysql", "app_php"])
+
+if __name__ == '__main__':
+    unittest.main()
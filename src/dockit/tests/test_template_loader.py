@@ -0,0 +1,104 @@
+import unittest
+import os
+import json
+import shutil
+from utilities.template_loader import TemplateLoader, PrecompiledLoader
+
+class TestTemplateLoader(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.test_dir = os.path.join(os.path.dirname(__file__), 'test_data')
+        self.templates_dir = os.path.join(self.test_dir, 'templates')
+        self.cache_dir = os.path.join(self.test_dir, 'cache')
+        self.compiled_dir = os.path.join(self.test_dir, 'compiled_templates')
+
+        # Get the project root directory (two levels up from tests)
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        shutil.copytree(os.path.join(project_root, 'templates'), self.templates_dir, dirs_exist_ok=True)
+
+        self.context = {
+            'build': {'base_image': 'php:8.2-fpm', 'apt': ['git'], 'command': ['php-fpm']},
+            'compose': {},
+        }
+
+    def tearDown(self):
+        """Clean up test environment after each test"""
+        if os.path.exists(self.test_dir):
+            try:
+                shutil.rmtree(self.test_dir)
+            except OSError:
+                pass  # Ignore cleanup errors
+
+    def create_environment(self):
+        return TemplateLoader.create_environment(self.templates_dir, self.cache_dir, self.compiled_dir)
+
+    def test_bytecode_cache_is_written(self):
+        """Test that rendering stores bytecode and a new environment reuses it"""
+        expected = self.create_environment().get_template('Dockerfile.j2').render(**self.context)
+        self.assertTrue(os.listdir(self.cache_dir))
+
+        rendered = self.create_environment().get_template('Dockerfile.j2').render(**self.context)
+        self.assertEqual(rendered, expected)
+        self.assertIn('FROM php:8.2-fpm', rendered)
+
+    def test_precompiled_templates_are_used_when_unchanged(self):
+        """Test that precompiled modules render the same output as the source templates"""
+        expected = self.create_environment().get_template('Dockerfile.j2').render(**self.context)
+
+        manifest = TemplateLoader.compile_templates(self.templates_dir, self.compiled_dir)
+        self.assertIn('Dockerfile.j2', manifest)
+        self.assertIn('docker-compose.yml.j2', manifest)
+
+        env = self.create_environment()
+        self.assertIsInstance(env.loader.loaders[0], PrecompiledLoader)
+        self.assertEqual(env.get_template('Dockerfile.j2').render(**self.context), expected)
+
+    def test_edited_template_bypasses_precompiled(self):
+        """Test that a template edited after compilation is rendered from source"""
+        TemplateLoader.compile_templates(self.templates_dir, self.compiled_dir)
+        with open(os.path.join(self.templates_dir, 'Dockerfile.j2'), 'a') as f:
+            f.write('\n# customized\n')
+
+        names = TemplateLoader.get_precompiled_names(self.templates_dir, self.compiled_dir)
+        self.assertNotIn('Dockerfile.j2', names)
+        self.assertIn('docker-compose.yml.j2', names)
+
+        rendered = self.create_environment().get_template('Dockerfile.j2').render(**self.context)
+        self.assertIn('# customized', rendered)
+
+    def test_other_jinja_version_bypasses_precompiled(self):
+        """Test that modules compiled by another Jinja2 version are not loaded"""
+        TemplateLoader.compile_templates(self.templates_dir, self.compiled_dir)
+        manifest_path = os.path.join(self.compiled_dir, TemplateLoader.MANIFEST)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest['runtime']['jinja2'] = '2.11.3'
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+
+        self.assertEqual(TemplateLoader.get_precompiled_names(self.templates_dir, self.compiled_dir), [])
+        self.assertEqual(len(self.create_environment().loader.loaders), 1)
+
+    def test_compiling_leaves_no_cache_behind(self):
+        """Test that the build-time bytecode cache is removed from the build tree"""
+        TemplateLoader.compile_templates(self.templates_dir, self.compiled_dir)
+        self.assertEqual(sorted(os.listdir(self.test_dir)), ['compiled_templates', 'templates'])
+
+    def test_override_layer(self):
+        """Test that a template in the override layer replaces the bundled one, including its precompiled module"""
+        TemplateLoader.compile_templates(self.templates_dir, self.compiled_dir)
+        override_dir = os.path.join(self.test_dir, 'overrides')
+        os.makedirs(override_dir)
+        with open(os.path.join(override_dir, 'Dockerfile.j2'), 'w') as f:
+            f.write('FROM {{ build.base_image }} # overridden\n')
+
+        layers = [override_dir, self.templates_dir]
+        names = TemplateLoader.get_precompiled_names(layers, self.compiled_dir)
+        self.assertEqual(names, ['docker-compose.yml.j2'])
+
+        env = TemplateLoader.create_environment(layers, self.cache_dir, self.compiled_dir)
+        self.assertIn('# overridden', env.get_template('Dockerfile.j2').render(**self.context))
+        self.assertIn('services:', env.get_template('docker-compose.yml.j2').render(services={}, project_name='app', bases=[]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, Optional
+from dockit.utilities.build_manager import BuildManager, FINGERPRINT_LABEL
+
+STATE_FILE = os.path.join("dockit", ".build-state.json")
+
+class BuildFingerprint:
+    """Hashes everything an image is built from: the build context (Dockerfile included),
+    the build args and the fingerprints of the images it uses as build contexts"""
+
+    @staticmethod
+    def context_digest(context_dir: str) -> str:
+        """Hash the names, executable bits and contents of every file under a build context"""
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(context_dir):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, context_dir).replace(os.sep, "/")
+                executable = os.access(path, os.X_OK)
+                digest.update(f"{relative}\0{int(executable)}\0".encode("utf-8"))
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+                digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def compute(definition: dict, project_dir: str = ".") -> Dict[str, str]:
+        """Fingerprint every target of a bake definition, dependencies before their dependents"""
+        fingerprints = {}
+        for wave in BuildManager.build_order(definition):
+            for name in wave:
+                target = definition["target"][name]
+                contexts = {
+                    context: fingerprints.get(value[len("target:"):], value)
+                    for context, value in target.get("contexts", {}).items()
+                }
+                inputs = {
+                    "context": BuildFingerprint.context_digest(os.path.join(project_dir, target["context"])),
+                    "dockerfile": target.get("dockerfile", "Dockerfile"),
+                    "args": target.get("args", {}),
+                    "contexts": contexts,
+                }
+                fingerprints[name] = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+        return fingerprints
+
+class BuildState:
+    """The fingerprints of the images last built for a project, kept in dockit/.build-state.json"""
+
+    def __init__(self, project_dir: str = "."):
+        self.path = os.path.join(project_dir, STATE_FILE)
+        self.fingerprints: Dict[str, str] = {}
+        try:
+            with open(self.path, "r") as f:
+                self.fingerprints = json.load(f).get("fingerprints", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, target: str) -> Optional[str]:
+        return self.fingerprints.get(target)
+
+    def set(self, target: str, fingerprint: str):
+        self.fingerprints[target] = fingerprint
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".build-state.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"fingerprints": self.fingerprints}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+__all__ = ["BuildFingerprint", "BuildState", "FINGERPRINT_LABEL"]
@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import yaml
+from dockit.utilities.messenger import Messenger
+
+# Image label holding the fingerprint of the inputs an image was built from
+FINGERPRINT_LABEL = "dockit.fingerprint"
+
+BAKE_FILE = "docker-bake.json"
+SERVICE_CONTEXT = "service:"
+
+class BuildManager:
+    """Builds the images of a generated project through a BuildKit bake file
+
+    Every compose service with a `build` section becomes a bake target. Targets are
+    built by separate `docker buildx bake` runs so that their number in flight can be
+    limited and each one can be timed; shared base images are built first.
+    """
+
+    def __init__(self, project_dir: str = "."):
+        self.project_dir = project_dir
+        self.messenger = Messenger()
+
+    def load_compose(self) -> dict:
+        """Read the generated docker-compose.yml"""
+        path = os.path.join(self.project_dir, "docker-compose.yml")
+        with open(path, "r") as f:
+            compose = yaml.safe_load(f) or {}
+        if not isinstance(compose.get("services"), dict):
+            raise ValueError(f"{path} defines no services")
+        return compose
+
+    def bake_definition(self, compose: dict) -> dict:
+        """Bake file definition with one target per compose service that is built"""
+        targets = {}
+        for service_name, service in compose["services"].items():
+            build = (service or {}).get("build")
+            if not build:
+                continue
+            if isinstance(build, str):
+                build = {"context": build}
+
+            target = {
+                "context": build.get("context", "."),
+                "dockerfile": build.get("dockerfile", "Dockerfile"),
+            }
+            if service.get("image"):
+                target["tags"] = [service["image"]]
+            if build.get("args"):
+                target["args"] = self.parse_args(build["args"])
+            if build.get("additional_contexts"):
+                target["contexts"] = {
+                    # Compose's "service:<name>" is bake's "target:<name>"
+                    name: f"target:{value[len(SERVICE_CONTEXT):]}" if value.startswith(SERVICE_CONTEXT) else value
+                    for name, value in build["additional_contexts"].items()
+                }
+            if build.get("cache_from"):
+                target["cache-from"] = list(build["cache_from"])
+            if build.get("cache_to"):
+                target["cache-to"] = list(build["cache_to"])
+            targets[service_name] = target
+
+        return {
+            "group": {"default": {"targets": list(targets)}},
+            "target": targets,
+        }
+
+    @staticmethod
+    def parse_args(args) -> Dict[str, str]:
+        """Compose build args come as a mapping or as a list of NAME=value"""
+        if isinstance(args, dict):
+            return {name: str(value) for name, value in args.items()}
+        return dict(arg.split("=", 1) if "=" in arg else (arg, "") for arg in args)
+
+    def write_bake_file(self, definition: dict) -> str:
+        path = os.path.join(self.project_dir, BAKE_FILE)
+        with open(path, "w") as f:
+            json.dump(definition, f, indent=2)
+            f.write("\n")
+        return os.path.abspath(path)
+
+    @staticmethod
+    def build_order(definition: dict, names: Optional[List[str]] = None,
+                    dependencies_too: bool = True) -> List[List[str]]:
+        """Split the targets into waves; a target only builds once the targets it uses as contexts are done"""
+        targets = definition["target"]
+        wanted = set(names or targets)
+        requested = set(wanted)
+
+        def dependencies(name: str) -> List[str]:
+            contexts = targets[name].get("contexts", {}).values()
+            return [value[len("target:"):] for value in contexts if value.startswith("target:")]
+
+        # Include what the requested targets build on
+        pending = list(wanted)
+        while pending:
+            for dependency in dependencies(pending.pop()):
+                if dependency not in wanted:
+                    wanted.add(dependency)
+                    pending.append(dependency)
+
+        waves, done = [], set()
+        while len(done) < len(wanted):
+            wave = [name for name in targets if name in wanted and name not in done
+                    and all(dependency in done for dependency in dependencies(name))]
+            if not wave:
+                raise ValueError("Build targets depend on each other in a cycle")
+            waves.append(wave)
+            done.update(wave)
+
+        if not dependencies_too:
+            waves = [[name for name in wave if name in requested] for wave in waves]
+            waves = [wave for wave in waves if wave]
+        return waves
+
+    @staticmethod
+    def stale_targets(definition: dict, fingerprints: Dict[str, str], state, docker_manager,
+                      names: Optional[List[str]] = None) -> List[str]:
+        """Targets whose last build (per the state file and the image label) used other inputs"""
+        stale = []
+        for name in names or definition["target"]:
+            fingerprint = fingerprints[name]
+            tags = definition["target"][name].get("tags", [])
+            if state.get(name) != fingerprint or any(
+                docker_manager.get_image_label(tag, FINGERPRINT_LABEL) != fingerprint for tag in tags
+            ):
+                stale.append(name)
+        return stale
+
+    @staticmethod
+    def limit_to(definition: dict, fingerprints: Dict[str, str], targets: List[str]) -> dict:
+        """Definition whose default group builds only the given targets, each labelled with its fingerprint
+
+        The other targets stay defined so `target:` contexts still resolve; an up-to-date
+        base they refer to comes straight out of the builder's cache.
+        """
+        labelled = {
+            name: dict(target, labels=dict(target.get("labels", {}), **{FINGERPRINT_LABEL: fingerprints[name]}))
+            for name, target in definition["target"].items()
+        }
+        return {"group": {"default": {"targets": list(targets)}}, "target": labelled}
+
+    def build_target(self, bake_file: str, target: str, no_cache: bool = False) -> dict:
+        """Build one bake target and time it"""
+        command = ["docker", "buildx", "bake", "--file", bake_file, "--load"]
+        if no_cache:
+            command.append("--no-cache")
+        command.append(target)
+
+        started_at = time.perf_counter()
+        result = subprocess.run(command, cwd=self.project_dir, capture_output=True, text=True)
+        error = None
+        if result.returncode != 0:
+            output = (result.stderr or result.stdout).strip().splitlines()
+            error = output[-1] if output else f"exit code {result.returncode}"
+        return {"target": target, "ok": error is None, "error": error, "seconds": time.perf_counter() - started_at}
+
+    def build(self, bake_file: str, waves: List[List[str]], jobs: int, no_cache: bool = False) -> List[dict]:
+        """Build the targets wave by wave, at most `jobs` at a time; a failed wave stops the build"""
+        results = []
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for wave in waves:
+                wave_results = list(pool.map(lambda target: self.build_target(bake_file, target, no_cache), wave))
+                results.extend(wave_results)
+                if not all(result["ok"] for result in wave_results):
+                    break
+        return results
+
+__all__ = ["BuildManager"]
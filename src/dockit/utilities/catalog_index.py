@@ -0,0 +1,237 @@
+import os
+import json
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Union
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.messenger import Messenger
+from dockit.utilities.service_definition import ServiceDefinition
+
+class CatalogIndex:
+    """Persistent index of the service catalog, rebuilt only for services that changed
+
+    The catalog can be layered: the service.json files a service has in the services
+    directories are merged version by version, so a user's versions add to or
+    replace the bundled ones (see ServiceDefinition.load).
+    Blobs hold resolved versions (`extends` merged, `{version}` filled in), so the
+    inheritance is only worked out when a service.json changes.
+    """
+
+    # Bump whenever the layout of an index entry or blob changes
+    FORMAT = 5
+
+    def __init__(self, services_dirs: Union[str, List[str]], index_path: Optional[str] = None):
+        self.layers = [services_dirs] if isinstance(services_dirs, str) else list(services_dirs)
+        self.index_path = index_path or os.path.join(PathResolver.get_cache_dir(), "catalog.json")
+        # Each service gets one blob file holding its versions back to back; the index keeps the offsets
+        self.blobs_dir = os.path.join(os.path.dirname(self.index_path), "catalog")
+        self.entries = {}
+        self.rebuilt = []
+        # Services left out of the index because their service.json cannot be read, with the reason
+        self.broken: Dict[str, str] = {}
+        self.messenger = Messenger()
+
+    def refresh(self) -> Dict[str, dict]:
+        """Sync the index with the services directory and return entries sorted by priority descending"""
+        cached = self._read()
+        entries = {}
+        self.rebuilt = []
+        self.broken = {}
+
+        for service_name, sources in self.discover().items():
+            try:
+                stamp = [self._stamp(source) for source in sources]
+            except OSError:
+                continue
+
+            entry = cached.get(service_name)
+            if (entry is None or entry["stamp"] != stamp or entry["sources"] != sources
+                    or not os.path.exists(self._blob_path(service_name))):
+                try:
+                    entry = self._compile(service_name, sources, stamp)
+                except (OSError, ValueError) as e:
+                    # One broken service.json must not take the rest of the catalog down with it
+                    self.broken[service_name] = str(e)
+                    self.messenger.warning(f"Skipping service '{service_name}': {str(e)} (run 'dockit validate' for details)")
+                    continue
+                self.rebuilt.append(service_name)
+            # Every version hidden by the user's layer: the service is gone
+            if entry["versions"]:
+                entries[service_name] = entry
+
+        self.entries = dict(sorted(entries.items(), key=lambda x: (-x[1]["priority"], x[0])))
+
+        for service_name in cached.keys() - entries.keys():
+            self._remove_blob(service_name)
+
+        # Only touch the index file when something was added, changed or removed
+        if self.rebuilt or cached.keys() != entries.keys():
+            self._write()
+
+        return self.entries
+
+    def discover(self) -> Dict[str, List[str]]:
+        """Service name -> its service.json in every layer that has one, upper layers first"""
+        found: Dict[str, List[str]] = {}
+        for layer in self.layers:
+            if not os.path.isdir(layer):
+                continue
+            with os.scandir(layer) as it:
+                for item in sorted(it, key=lambda item: item.name):
+                    service_json = os.path.join(item.path, "service.json")
+                    if item.is_dir() and os.path.isfile(service_json):
+                        found.setdefault(item.name, []).append(service_json)
+        return found
+
+    def get_service_names(self) -> List[str]:
+        """Get service names sorted by priority descending"""
+        return list(self.entries.keys())
+
+    def get_versions(self, service_name: str) -> Optional[List[str]]:
+        """Get the version list of a service"""
+        entry = self.entries.get(service_name)
+        return list(entry["versions"]) if entry else None
+
+    def get_sources(self, service_name: str) -> Optional[List[str]]:
+        """Get the service.json files a service is merged from, upper layers first"""
+        entry = self.entries.get(service_name)
+        return list(entry["sources"]) if entry else None
+
+    def load_version(self, service_name: str, version: str) -> Optional[dict]:
+        """Materialize a single version of a service from its blob"""
+        entry = self.entries.get(service_name)
+        if not entry or version not in entry["versions"]:
+            return None
+
+        offset, length = entry["versions"][version]
+        try:
+            with open(self._blob_path(service_name), "rb") as f:
+                f.seek(offset)
+                return json.loads(f.read(length))
+        except (OSError, ValueError):
+            # The blob vanished or was rewritten under us; parse the sources again
+            try:
+                return ServiceDefinition.resolve(ServiceDefinition.load(entry["sources"])).get(version)
+            except (OSError, ValueError):
+                return None
+
+    def load_service(self, service_name: str) -> Optional[dict]:
+        """Materialize every version of a service"""
+        versions = self.get_versions(service_name)
+        if versions is None:
+            return None
+        return {version: self.load_version(service_name, version) for version in versions}
+
+    @staticmethod
+    def _stamp(path: str) -> list:
+        """Cheap change detector for a file: mtime, ctime and size"""
+        stat = os.stat(path)
+        return [stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size]
+
+    def _blob_path(self, service_name: str) -> str:
+        return os.path.join(self.blobs_dir, f"{service_name}.blob")
+
+    def _compile(self, service_name: str, sources: List[str], stamp: list) -> dict:
+        """Merge and resolve the service.json layers of a service into an index entry and rewrite its blob"""
+        data = ServiceDefinition.load(sources)
+        priority = data.get("priority", 0)
+
+        blob = bytearray()
+        versions = {}
+        for version, config in ServiceDefinition.resolve(data).items():
+            encoded = json.dumps(config, separators=(",", ":")).encode("utf-8")
+            versions[version] = [len(blob), len(encoded)]
+            blob += encoded
+
+        self._write_atomic(self._blob_path(service_name), bytes(blob))
+
+        return {
+            "stamp": stamp,
+            "sources": sources,
+            "priority": priority,
+            "versions": versions,
+        }
+
+    def _remove_blob(self, service_name: str):
+        try:
+            os.remove(self._blob_path(service_name))
+        except OSError:
+            pass
+
+    def _read(self) -> Dict[str, dict]:
+        """Read the index file, treating a missing, corrupt or outdated index as empty"""
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get("format") != self.FORMAT:
+            return {}
+        if index.get("services_dirs") != [os.path.abspath(layer) for layer in self.layers]:
+            return {}
+        return index.get("services", {})
+
+    def _write(self):
+        """Write the index file so concurrent runs never read a partial index"""
+        content = json.dumps({
+            "format": self.FORMAT,
+            "services_dirs": [os.path.abspath(layer) for layer in self.layers],
+            "services": self.entries,
+        })
+        self._write_atomic(self.index_path, content.encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(path: str, content: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The index is only a cache; failing to persist it must not break the CLI
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+class LazyServiceVersions(Mapping):
+    """Read-only view of a service's versions that loads a version only when it is accessed"""
+
+    def __init__(self, index: CatalogIndex, service_name: str):
+        self.index = index
+        self.service_name = service_name
+
+    def __getitem__(self, version: str) -> dict:
+        config = self.index.load_version(self.service_name, version)
+        if config is None:
+            raise KeyError(version)
+        return config
+
+    def __iter__(self):
+        return iter(self.index.entries[self.service_name]["versions"])
+
+    def __len__(self) -> int:
+        return len(self.index.entries[self.service_name]["versions"])
+
+    def __contains__(self, version) -> bool:
+        return version in self.index.entries[self.service_name]["versions"]
+
+class LazyCatalog(Mapping):
+    """Read-only view of the whole catalog backed by a CatalogIndex"""
+
+    def __init__(self, index: CatalogIndex):
+        self.index = index
+
+    def __getitem__(self, service_name: str) -> LazyServiceVersions:
+        if service_name not in self.index.entries:
+            raise KeyError(service_name)
+        return LazyServiceVersions(self.index, service_name)
+
+    def __iter__(self):
+        return iter(self.index.entries)
+
+    def __len__(self) -> int:
+        return len(self.index.entries)
+
+    def __contains__(self, service_name) -> bool:
+        return service_name in self.index.entries
+
+__all__ = ["CatalogIndex", "LazyCatalog", "LazyServiceVersions"]
@@ -0,0 +1,280 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.catalog_index import CatalogIndex
+from dockit.utilities.file_writer import FileWriter
+from dockit.utilities.service_definition import ServiceDefinition
+
+NON_EMPTY_STRING = {"type": "string", "minLength": 1}
+STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+# Schema of one resolved version of a service.json (a subset of JSON Schema)
+SERVICE_SCHEMA = {
+    "type": "object",
+    "required": ["compose"],
+    "anyOf": [{"required": ["build"]}, {"required": ["image"]}],
+    "properties": {
+        "image": NON_EMPTY_STRING,
+        "build": {
+            "type": "object",
+            "required": ["base_image", "command"],
+            "properties": {
+                "base_image": NON_EMPTY_STRING,
+                "copies": STRING_LIST,
+                "apt": STRING_LIST,
+                "run": STRING_LIST,
+                "working_dir": {"type": "string"},
+                "command": {"type": ["string", "array"], "minLength": 1, "items": {"type": "string"}},
+                "runtime": {
+                    "type": "object",
+                    "properties": {
+                        "base_image": NON_EMPTY_STRING,
+                        "copies": STRING_LIST,
+                        "apt": STRING_LIST,
+                        "artifacts": STRING_LIST,
+                    },
+                    "additionalProperties": False,
+                },
+            },
+            "additionalProperties": False,
+        },
+        # Handed to docker compose as it is, so any compose key is allowed
+        "compose": {"type": "object"},
+        # Extra files mounted into the container, as the generator maps them
+        "publishable_files": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["source", "target"],
+                "properties": {"source": NON_EMPTY_STRING, "target": NON_EMPTY_STRING},
+            },
+        },
+        "publishes": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "required": ["source", "destination"],
+                "properties": {
+                    "source": NON_EMPTY_STRING,
+                    "destination": NON_EMPTY_STRING,
+                    "skipVolumes": {"type": "boolean"},
+                },
+                "additionalProperties": False,
+            },
+        },
+    },
+    "additionalProperties": False,
+}
+
+TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "integer": int,
+}
+
+# (path, message) pairs; the path is dotted from the version's root, "" for the root itself
+Errors = List[Tuple[str, str]]
+
+# Keys the schema does not know are ignored by the generator: reported, but not fatal
+UNKNOWN_KEY = "is not a known key"
+
+class CatalogValidator:
+    """Validates every version of every service in the catalog
+
+    The schema is compiled once per process into nested checks. Each service is
+    checked on its own (in parallel when there are several), with its service.json
+    layers merged as the catalog merges them, and the outcome is cached under the
+    hash of those files, so only services with an edited file are checked again.
+    Whether the files a version publishes exist is looked up on every run: they
+    can appear or disappear without the service.json changing.
+    """
+
+    # Bump whenever what is cached per service changes
+    FORMAT = 3
+
+    _check: Optional[Callable[[Any, str], Errors]] = None
+
+    def __init__(self, layers: Optional[List[str]] = None, cache_path: Optional[str] = None):
+        self.layers = layers or PathResolver.get_service_layers()
+        self.cache_path = cache_path or os.path.join(PathResolver.get_cache_dir(), "validation.json")
+        self.checked: List[str] = []
+        self.cached: List[str] = []
+
+    @staticmethod
+    def compile(schema: dict) -> Callable[[Any, str], Errors]:
+        """Turn a schema into a function returning the errors of a value"""
+        names = schema.get("type")
+        allowed = tuple(TYPES[name] for name in ([names] if isinstance(names, str) else names or []))
+        required = schema.get("required", [])
+        min_length = schema.get("minLength")
+        alternatives = [CatalogValidator.compile(option) for option in schema.get("anyOf", [])]
+        properties = {key: CatalogValidator.compile(option) for key, option in schema.get("properties", {}).items()}
+        additional = schema.get("additionalProperties", True)
+        check_additional = CatalogValidator.compile(additional) if isinstance(additional, dict) else None
+        check_items = CatalogValidator.compile(schema["items"]) if "items" in schema else None
+
+        def check(value: Any, path: str) -> Errors:
+            # JSON has no booleans among its numbers
+            if allowed and (not isinstance(value, allowed) or (isinstance(value, bool) and bool not in allowed)):
+                return [(path, f"must be of type {' or '.join(name for name, kind in TYPES.items() if kind in allowed)}")]
+
+            errors = []
+            if min_length is not None and isinstance(value, (str, list)) and len(value) < min_length:
+                errors.append((path, "must not be empty"))
+            if isinstance(value, dict):
+                errors.extend((path, f"'{key}' is required") for key in required if key not in value)
+                if alternatives:
+                    failures = [alternative(value, path) for alternative in alternatives]
+                    if all(failures):
+                        errors.append((path, " or ".join(failure[0][1] for failure in failures)))
+                for key, item in value.items():
+                    item_path = f"{path}.{key}" if path else key
+                    if key in properties:
+                        errors.extend(properties[key](item, item_path))
+                    elif check_additional:
+                        errors.extend(check_additional(item, item_path))
+                    elif additional is False:
+                        errors.append((item_path, UNKNOWN_KEY))
+            if isinstance(value, list) and check_items:
+                for position, item in enumerate(value):
+                    errors.extend(check_items(item, f"{path}[{position}]"))
+            return errors
+
+        return check
+
+    @classmethod
+    def schema_problems(cls, config: Any) -> Tuple[Errors, Errors]:
+        """Errors and warnings (unknown keys) of one resolved version against the service schema"""
+        if cls._check is None:
+            cls._check = cls.compile(SERVICE_SCHEMA)
+        problems = cls._check(config, "")
+        errors = [problem for problem in problems if problem[1] != UNKNOWN_KEY]
+        warnings = [problem for problem in problems if problem[1] == UNKNOWN_KEY]
+        return errors, warnings
+
+    @staticmethod
+    def describe(path: str, message: str) -> str:
+        return f"{path} {message}" if path else message
+
+    @staticmethod
+    def schema_digest() -> str:
+        """Identifies the schema, so cached results are dropped when it changes"""
+        return hashlib.sha256(json.dumps(SERVICE_SCHEMA, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def sources_hash(sources: List[str]) -> str:
+        """Identifies the content of a service's service.json layers"""
+        stamp = [[source, FileWriter.hash_file(source)] for source in sources]
+        return FileWriter.hash_bytes(json.dumps(stamp).encode("utf-8"))
+
+    @staticmethod
+    def check_service(sources: List[str]) -> dict:
+        """Schema errors and warnings of every version of a service and the files each version publishes"""
+        result = {"hash": CatalogValidator.sources_hash(sources), "errors": [], "warnings": [], "versions": {}}
+        try:
+            data = ServiceDefinition.load(sources)
+            if isinstance(data.get("priority", 0), bool) or not isinstance(data.get("priority", 0), int):
+                raise ValueError("'priority' must be an integer")
+            versions = ServiceDefinition.resolve(data)
+        except ValueError as e:
+            result["errors"].append({"version": None, "path": "", "message": str(e)})
+            return result
+
+        for version, config in versions.items():
+            errors, warnings = CatalogValidator.schema_problems(config)
+            result["errors"].extend({"version": version, "path": path, "message": message} for path, message in errors)
+            result["warnings"].extend({"version": version, "path": path, "message": message} for path, message in warnings)
+
+            publishes = {}
+            if isinstance(config, dict) and isinstance(config.get("publishes"), dict):
+                for name, file_config in config["publishes"].items():
+                    if isinstance(file_config, dict) and isinstance(file_config.get("source"), str):
+                        publishes[name] = file_config["source"]
+            result["versions"][version] = publishes
+        return result
+
+    def run(self, services: Optional[List[str]] = None, jobs: Optional[int] = None, use_cache: bool = True) -> Dict[str, dict]:
+        """Validate the catalog (or some of its services); returns service -> {"sources", "versions", "errors", "warnings"}"""
+        sources = CatalogIndex(self.layers).discover()
+        if services:
+            sources = {name: paths for name, paths in sources.items() if name in services}
+
+        schema = self.schema_digest()
+        cache = self._read(schema)
+        hashes = {name: self.sources_hash(paths) for name, paths in sources.items()}
+
+        results = {}
+        pending = []
+        for name in sources:
+            if use_cache and hashes[name] in cache:
+                results[name] = cache[hashes[name]]
+                self.cached.append(name)
+            else:
+                pending.append(name)
+
+        jobs = max(1, min(jobs or os.cpu_count() or 1, len(pending)))
+        if jobs == 1:
+            checked = [self.check_service(sources[name]) for name in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                checked = list(pool.map(self.check_service, [sources[name] for name in pending]))
+        for name, result in zip(pending, checked):
+            results[name] = result
+            self.checked.append(name)
+
+        if pending or (not services and set(cache) != set(hashes.values())):
+            # Checking a few services must not forget the results of the others
+            files = dict(cache) if services else {}
+            files.update((result["hash"], result) for result in results.values())
+            self._write(schema, files)
+
+        report = {}
+        for name in sorted(results):
+            result = results[name]
+            errors = [dict(error) for error in result["errors"]]
+            for version, publishes in result["versions"].items():
+                for file_name, source in publishes.items():
+                    error = self.missing_source(name, version, source)
+                    if error:
+                        errors.append({"version": version, "path": f"publishes.{file_name}.source", "message": error})
+            order = list(result["versions"])
+            errors.sort(key=lambda error: order.index(error["version"]) if error["version"] in order else -1)
+            report[name] = {"sources": sources[name], "versions": order, "errors": errors,
+                            "warnings": [dict(warning) for warning in result["warnings"]]}
+        return report
+
+    def missing_source(self, service_name: str, version: str, source: str) -> Optional[str]:
+        """Why a published file cannot be found, or None when it exists in one of the layers"""
+        try:
+            # Resolved the same way ServiceManager resolves it when publishing
+            relative = source.format(version=version)
+        except (KeyError, IndexError, ValueError) as e:
+            return f"invalid placeholder in '{source}': {e}"
+        if PathResolver.find_resource(self.layers, service_name, relative) is None:
+            return f"file not found: {os.path.join(service_name, relative)}"
+        return None
+
+    def _read(self, schema: str) -> Dict[str, dict]:
+        """Cached results by file hash, treating a missing, corrupt or outdated cache as empty"""
+        try:
+            with open(self.cache_path, "r") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict) or cache.get("format") != self.FORMAT or cache.get("schema") != schema:
+            return {}
+        return cache.get("files", {})
+
+    def _write(self, schema: str, files: Dict[str, dict]):
+        try:
+            FileWriter().write(self.cache_path, json.dumps({"format": self.FORMAT, "schema": schema, "files": files}))
+        except OSError:
+            # The cache only saves time; failing to persist it must not fail the validation
+            pass
+
+__all__ = ["CatalogValidator", "SERVICE_SCHEMA", "UNKNOWN_KEY"]
@@ -0,0 +1,180 @@
+import os
+from typing import Dict, List, Optional, Union
+from dockit.utilities.file_writer import FileWriter
+from dockit.utilities.build_manager import SERVICE_CONTEXT
+
+COMPOSE_FILE = "docker-compose.yml"
+
+class PlanWriter(FileWriter):
+    """A FileWriter that writes nothing and remembers what it would have changed
+
+    Running a Generator with it yields the new stack in memory; `commit` then
+    writes exactly what was planned through a real writer.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # Path -> new content, for generated files
+        self.pending: Dict[str, bytes] = {}
+        # Path -> source file, for files placed through the content store
+        self.placed: Dict[str, str] = {}
+        self.created: List[str] = []
+
+    def write(self, path: str, content: Union[str, bytes]) -> bool:
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        if self.is_unchanged(path, data):
+            self.unchanged.append(path)
+            return False
+        self.pending[path] = data
+        self._record(path)
+        return True
+
+    def place(self, source: str, path: str, store) -> bool:
+        with open(source, "rb") as f:
+            if self.is_unchanged(path, f.read()):
+                self.unchanged.append(path)
+                return False
+        self.placed[path] = source
+        self._record(path)
+        return True
+
+    def _record(self, path: str):
+        self.written.append(path)
+        if not os.path.exists(path):
+            self.created.append(path)
+
+    def commit(self, writer: FileWriter, store) -> List[str]:
+        """Write the planned files; returns the paths written"""
+        for path, data in self.pending.items():
+            writer.write(path, data)
+        for path, source in self.placed.items():
+            writer.place(source, path, store)
+        return writer.written
+
+class ComposePlan:
+    """The changes a regenerated stack brings, service by service
+
+    A service is recreated when its compose definition changed, or when a
+    generated file it uses changed: one in its build context (the Dockerfile)
+    or one it bind-mounts (a published php.ini, ...), or when a service it builds
+    on (a shared base, through `additional_contexts`) is built again. Every other
+    service is left running.
+    """
+
+    def __init__(self, current: Optional[dict], planned: dict, changed_files: Dict[str, str]):
+        """
+        :param current: the docker-compose.yml in place, or None when there is none
+        :param planned: the docker-compose.yml about to be written
+        :param changed_files: project-relative path -> "+" (new) or "~" (changed), docker-compose.yml excluded
+        """
+        current_services = (current or {}).get("services") or {}
+        planned_services = planned.get("services") or {}
+        # A renamed project gets new containers for everything
+        renamed = current is not None and current.get("name") != planned.get("name")
+
+        self.services: Dict[str, dict] = {}
+        for name, service in planned_services.items():
+            service = service or {}
+            if name in current_services:
+                changes = self.diff_keys(current_services[name] or {}, service)
+                if renamed:
+                    changes.insert(0, "~ name")
+                action = "recreate"
+            else:
+                changes = []
+                action = "create"
+            changes += [f"{mark} {path}" for path, mark in changed_files.items() if self.uses(service, path)]
+            if action == "recreate" and not changes:
+                action = "keep"
+            # Shared base images are only built, never started
+            if service.get("scale") == 0 and action != "keep":
+                action = "build"
+            self.services[name] = {"action": action, "changes": changes}
+
+        # An image built on a rebuilt base must be rebuilt too; bases can stack, so repeat until settled
+        rebuilt = True
+        while rebuilt:
+            rebuilt = False
+            for name, service in planned_services.items():
+                entry = self.services[name]
+                if entry["action"] != "keep":
+                    continue
+                bases = [base for base in self.bases(service or {})
+                         if self.services.get(base, {}).get("action") in ("build", "create", "recreate")]
+                if bases:
+                    entry["changes"] += [f"~ base {base}" for base in bases]
+                    entry["action"] = "build" if (service or {}).get("scale") == 0 else "recreate"
+                    rebuilt = True
+
+        for name in current_services:
+            if name not in planned_services:
+                self.services[name] = {"action": "remove", "changes": []}
+
+    @staticmethod
+    def diff_keys(current: dict, planned: dict) -> List[str]:
+        """Keys of a compose service that were added (+), removed (-) or changed (~)"""
+        changes = []
+        for key in planned:
+            if key not in current:
+                changes.append(f"+ {key}")
+            elif current[key] != planned[key]:
+                changes.append(f"~ {key}")
+        changes += [f"- {key}" for key in current if key not in planned]
+        return changes
+
+    @staticmethod
+    def local_paths(service: dict) -> List[str]:
+        """Project paths a compose service reads: its build context and its bind mounts"""
+        paths = []
+        build = service.get("build")
+        if isinstance(build, str):
+            paths.append(build)
+        elif isinstance(build, dict):
+            paths.append(build.get("context", "."))
+        for volume in service.get("volumes") or []:
+            source = volume.get("source") if isinstance(volume, dict) else str(volume).split(":", 1)[0]
+            # Named volumes are not files of the project, and the project root is
+            # mounted for the application's code, which the container reads live
+            if source and source.startswith((".", "/")) and os.path.normpath(source) != ".":
+                paths.append(source)
+        return [os.path.normpath(path) for path in paths]
+
+    @staticmethod
+    def bases(service: dict) -> List[str]:
+        """Services whose image a compose service builds on, through build.additional_contexts"""
+        build = service.get("build")
+        if not isinstance(build, dict):
+            return []
+        contexts = build.get("additional_contexts") or {}
+        if isinstance(contexts, list):
+            # The list form: "name=service:<base>"
+            contexts = dict(str(item).split("=", 1) for item in contexts if "=" in str(item))
+        return [
+            value[len(SERVICE_CONTEXT):] for value in contexts.values()
+            if isinstance(value, str) and value.startswith(SERVICE_CONTEXT)
+        ]
+
+    @staticmethod
+    def uses(service: dict, path: str) -> bool:
+        path = os.path.normpath(path)
+        return any(
+            used == "." or path == used or path.startswith(used + os.sep)
+            for used in ComposePlan.local_paths(service)
+        )
+
+    def with_action(self, *actions: str) -> List[str]:
+        return [name for name, entry in self.services.items() if entry["action"] in actions]
+
+    @property
+    def affected(self) -> List[str]:
+        """Services to (re)create"""
+        return self.with_action("create", "recreate")
+
+    @property
+    def removed(self) -> List[str]:
+        return self.with_action("remove")
+
+    def has_changes(self) -> bool:
+        return bool(self.with_action("create", "recreate", "build", "remove"))
+
+__all__ = ["ComposePlan", "PlanWriter", "COMPOSE_FILE"]
@@ -0,0 +1,96 @@
+import os
+import stat
+import hashlib
+import tempfile
+from typing import Dict, Optional, Tuple
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.directory_sync import DirectorySync
+
+class ContentStore:
+    """Content-addressed store of the config files dockit puts into projects
+
+    Each distinct content is kept once, as ~/.dockit/store/<sha[:2]>/<sha[2:]>, and
+    project files are made from it as a reflink (a copy-on-write clone) where the
+    filesystem supports it, else a streamed copy. Either way the project gets its
+    own writable file: editing it never reaches the blob or another project.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or PathResolver.get_store_dir()
+        # Source path -> (stat stamp, digest), so unchanged sources are hashed once per run
+        self._digests: Dict[str, Tuple[list, str]] = {}
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def digest(self, path: str) -> str:
+        info = os.stat(path)
+        stamp = [info.st_mtime_ns, info.st_size, info.st_ino]
+        cached = self._digests.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        self._digests[path] = (stamp, digest.hexdigest())
+        return digest.hexdigest()
+
+    def add(self, path: str) -> str:
+        """Store a file's content unless it is already there; returns its digest"""
+        digest = self.digest(path)
+        blob = self.blob_path(digest)
+        if not os.path.exists(blob):
+            directory = os.path.dirname(blob)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+            os.close(fd)
+            try:
+                DirectorySync.copy_file(path, tmp_path)
+                os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                # Concurrent runs storing the same content race harmlessly: both blobs are identical
+                os.replace(tmp_path, blob)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return digest
+
+    def place(self, source: str, target: str) -> bool:
+        """Give target the content of source through the store; returns True if target was (re)written"""
+        digest = self.add(source)
+        blob = self.blob_path(digest)
+        if self.holds(target, blob, digest):
+            return False
+
+        directory = os.path.dirname(target) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{os.path.basename(target)}.{os.getpid()}.tmp")
+        try:
+            self.materialize(blob, tmp_path)
+            # Replace in one step, so containers mounting the file never see it half-written
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+    def holds(self, target: str, blob: str, digest: str) -> bool:
+        """Whether target already has the blob's content"""
+        try:
+            if os.path.getsize(target) != os.path.getsize(blob):
+                return False
+            return self.digest(target) == digest
+        except OSError:
+            return False
+
+    @staticmethod
+    def materialize(blob: str, path: str):
+        """Create path from a blob as a writable file of its own: a reflink, else a streamed copy"""
+        DirectorySync.copy_file(blob, path)
+        # The project's own file, not the read-only blob; leave it editable
+        os.chmod(path, 0o644)
+
+__all__ = ["ContentStore"]
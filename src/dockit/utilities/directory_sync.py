@@ -0,0 +1,157 @@
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional
+from dockit.utilities.file_writer import FileWriter
+
+try:
+    import fcntl
+    # ioctl sharing the source's blocks with the copy (btrfs, XFS, ...) instead of duplicating them
+    FICLONE = 0x40049409
+except ImportError:
+    fcntl = None
+
+class DirectorySync:
+    """Makes a directory an exact copy of another, touching only what differs
+
+    Files are compared by size, then by content hash. When nothing differs the
+    target is left alone. Otherwise a new copy is staged next to the target
+    (unchanged files are hard-linked from it, changed ones copied) and swapped
+    in with two renames, so an interrupted sync never leaves a half-copied
+    directory behind; the next sync puts back a target that was moved aside.
+    """
+
+    def __init__(self):
+        self.copied: List[str] = []
+        self.removed: List[str] = []
+        self.unchanged: List[str] = []
+
+    @staticmethod
+    def list_files(directory: str) -> Dict[str, int]:
+        """Relative path -> size of every file under a directory"""
+        files = {}
+        for root, dirs, names in os.walk(directory):
+            dirs.sort()
+            for name in names:
+                path = os.path.join(root, name)
+                files[os.path.relpath(path, directory)] = os.path.getsize(path)
+        return files
+
+    def diff(self, source: str, target: str) -> Optional[Dict[str, List[str]]]:
+        """Files to copy, keep and remove to turn target into source, or None if they are the same"""
+        source_files = self.list_files(source)
+        target_files = self.list_files(target) if os.path.isdir(target) else {}
+
+        changes = {"copy": [], "keep": [], "remove": sorted(set(target_files) - set(source_files))}
+        for relative, size in sorted(source_files.items()):
+            same = target_files.get(relative) == size and (
+                FileWriter.hash_file(os.path.join(source, relative)) == FileWriter.hash_file(os.path.join(target, relative))
+                and self.same_mode(os.path.join(source, relative), os.path.join(target, relative))
+            )
+            changes["keep" if same else "copy"].append(relative)
+
+        if not changes["copy"] and not changes["remove"] and os.path.isdir(target):
+            return None
+        return changes
+
+    @staticmethod
+    def same_mode(source: str, target: str) -> bool:
+        """Whether both files have the same executable bits (scripts must stay runnable)"""
+        return (os.stat(source).st_mode & 0o111) == (os.stat(target).st_mode & 0o111)
+
+    def sync(self, source: str, target: str) -> bool:
+        """Make target a copy of source; returns True if anything had to change"""
+        backup = self.backup_path(target)
+        if not os.path.exists(target) and os.path.isdir(backup):
+            # A previous sync stopped between its two renames
+            os.rename(backup, target)
+
+        changes = self.diff(source, target)
+        if changes is None:
+            self.unchanged.append(target)
+            return False
+
+        parent = os.path.dirname(os.path.abspath(target))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(target)}.", suffix=".tmp")
+        try:
+            for root, dirs, _ in os.walk(source):
+                for name in dirs:
+                    os.makedirs(os.path.join(staging, os.path.relpath(os.path.join(root, name), source)), exist_ok=True)
+            for relative in changes["keep"]:
+                self.link_or_copy(os.path.join(target, relative), os.path.join(staging, relative))
+            for relative in changes["copy"]:
+                self.copy_file(os.path.join(source, relative), os.path.join(staging, relative))
+            shutil.copymode(source, staging)
+
+            if os.path.exists(target):
+                shutil.rmtree(backup, ignore_errors=True)
+                os.rename(target, backup)
+            os.rename(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        shutil.rmtree(backup, ignore_errors=True)
+
+        self.copied.extend(os.path.join(target, relative) for relative in changes["copy"])
+        self.removed.extend(os.path.join(target, relative) for relative in changes["remove"])
+        return True
+
+    @staticmethod
+    def backup_path(target: str) -> str:
+        target = os.path.abspath(target)
+        return os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.old")
+
+    @staticmethod
+    def link_or_copy(source: str, target: str):
+        """Reuse an unchanged file's inode in the staged copy; copy it where links are not possible"""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            DirectorySync.copy_file(source, target)
+
+    @staticmethod
+    def copy_file(source: str, target: str):
+        """Copy a file's bytes and mode, as a reflink where the filesystem can share blocks"""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            if not DirectorySync.reflink(src, dst):
+                DirectorySync.copy_range(src, dst)
+        shutil.copymode(source, target)
+
+    @staticmethod
+    def reflink(src, dst) -> bool:
+        if fcntl is None:
+            return False
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def copy_range(src, dst):
+        """Copy in the kernel with copy_file_range, falling back to a buffered copy"""
+        size = os.fstat(src.fileno()).st_size
+        if hasattr(os, "copy_file_range"):
+            try:
+                copied = 0
+                while copied < size:
+                    count = os.copy_file_range(src.fileno(), dst.fileno(), size - copied)
+                    if count == 0:
+                        break
+                    copied += count
+                if copied == size:
+                    return
+            except OSError:
+                pass
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+        shutil.copyfileobj(src, dst)
+
+    def summary(self) -> str:
+        return f"{len(self.copied)} file(s) copied, {len(self.removed)} removed, {len(self.unchanged)} directories unchanged"
+
+__all__ = ["DirectorySync"]
@@ -1,30 +1,82 @@
+import re
 import subprocess
+import threading
+from typing import Dict, List, Optional
 from dockit.utilities.messenger import Messenger
+from dockit.utilities.path_resolver import PathResolver
+
+HEALTH_STATUS = re.compile(r"\((?:health: )?(healthy|unhealthy|starting)\)")
 
 class DockerManager:
-    def __init__(self):
+    """Talks to the Docker Engine API over one pooled connection; compose still goes through the CLI"""
+
+    # Daemon liveness per endpoint, checked once per process
+    _alive: Dict[str, bool] = {}
+
+    def __init__(self, base_url: Optional[str] = None):
+        """
+        :param base_url: Engine API endpoint like "unix:///var/run/docker.sock" (default: DOCKER_HOST or the local socket)
+        """
         self.messenger = Messenger()
+        self.base_url = base_url
+        self._client = None
+        # Callers on several threads take turns on the one connection instead of opening more
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The Engine API client, created on first use; its session keeps the socket connection open"""
+        if self._client is None:
+            # The SDK is only imported by commands that talk to Docker
+            from docker.utils import kwargs_from_env
+            from dockit.utilities.engine_client import EngineClient
+
+            kwargs = kwargs_from_env()
+            if self.base_url:
+                kwargs["base_url"] = self.base_url
+            self._client = EngineClient(**kwargs)
+        return self._client
+
+    @property
+    def endpoint(self) -> str:
+        return self.base_url or "default"
 
     def is_docker_installed(self) -> bool:
-        """Check if Docker is installed and running"""
-        try:
-            subprocess.run(["docker", "info"], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        """Check if the Docker daemon is reachable (cached for the rest of the process)"""
+        if self.endpoint not in DockerManager._alive:
+            from docker.errors import DockerException
+            from requests.exceptions import RequestException
+
+            try:
+                DockerManager._alive[self.endpoint] = bool(self.client.ping())
+            except (DockerException, RequestException, OSError):
+                DockerManager._alive[self.endpoint] = False
+        return DockerManager._alive[self.endpoint]
 
-    def start_containers(self) -> bool:
-        """Start Docker containers in detached mode"""
+    def start_containers(self, build: bool = True, services: Optional[List[str]] = None,
+                         recreate: bool = False, remove_orphans: bool = False) -> bool:
+        """Start Docker containers in detached mode
+
+        :param build: let compose build images that are missing; off when the images were just built
+        :param services: only (re)start these services (and start what they depend on)
+        :param recreate: recreate the containers even when their compose definition did not change
+        :param remove_orphans: remove the containers of services no longer in docker-compose.yml
+        """
         if not self.is_docker_installed():
             self.messenger.error("Docker not found. Please make sure Docker is installed and running.")
             return False
 
         try:
             self.messenger.info("Starting containers...")
-            subprocess.run(["docker", "compose", "up", "-d"], check=True)
+            command = ["docker", "compose", "up", "-d"] + ([] if build else ["--no-build"])
+            if recreate:
+                command.append("--force-recreate")
+            if remove_orphans:
+                command.append("--remove-orphans")
+            subprocess.run(command + list(services or []), check=True)
             self.messenger.success("Containers started successfully!")
             return True
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
             self.messenger.error(f"Failed to start containers: {str(e)}")
             return False
 
@@ -39,27 +91,93 @@ class DockerManager:
             subprocess.run(["docker", "compose", "down"], check=True)
             self.messenger.success("Containers stopped successfully!")
             return True
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
             self.messenger.error(f"Failed to stop containers: {str(e)}")
             return False
 
-    def get_container_status(self) -> dict:
-        """Get status of all containers"""
+    def get_container_status(self, project_dir: str = ".") -> List[dict]:
+        """Get the containers of the compose project with their service, state and status"""
         if not self.is_docker_installed():
             self.messenger.error("Docker not found. Please make sure Docker is installed and running.")
-            return {}
+            return []
+
+        from docker.errors import APIError
+        from requests.exceptions import RequestException
 
+        project = PathResolver.get_project_name(project_dir)
         try:
-            result = subprocess.run(
-                ["docker", "compose", "ps", "--format", "json"],
-                capture_output=True,
-                text=True,
-                check=True
+            containers = self.client.containers(
+                all=True,
+                filters={"label": f"com.docker.compose.project={project}"}
             )
-            return result.stdout
-        except subprocess.CalledProcessError as e:
+        except (APIError, RequestException) as e:
             self.messenger.error(f"Failed to get container status: {str(e)}")
-            return {}
+            return []
+
+        return [
+            {
+                "name": (container.get("Names") or ["/"])[0].lstrip("/"),
+                "service": (container.get("Labels") or {}).get("com.docker.compose.service"),
+                "state": container.get("State"),
+                "status": container.get("Status"),
+                "health": self.parse_health(container.get("Status") or ""),
+            }
+            for container in containers
+        ]
+
+    @staticmethod
+    def parse_health(status: str) -> Optional[str]:
+        """Health from a status text like "Up 2 minutes (healthy)" or "Up 1 second (health: starting)" """
+        match = HEALTH_STATUS.search(status)
+        return match.group(1) if match else None
+
+    def watch_events(self, project_dir: str = ".", since: Optional[int] = None):
+        """Stream the container events of the compose project (a blocking, cancellable iterator of dicts)"""
+        project = PathResolver.get_project_name(project_dir)
+        return self.client.events(
+            since=since,
+            decode=True,
+            filters={"type": "container", "label": f"com.docker.compose.project={project}"}
+        )
+
+    def container_logs(self, container: str, tail="all", follow: bool = False):
+        """Stream the output of a container in byte chunks; close() the stream to stop following
+
+        Every stream gets a connection of its own, the shared one stays free for other calls.
+        """
+        if follow:
+            return self.client.follow_logs(container, tail)
+        return self.client.logs(container, stream=True, tail=tail)
+
+    def container_stats(self, container: str):
+        """Stream a container's resource usage, one decoded sample about every second; close() to stop"""
+        return self.client.stream_stats(container)
+
+    def get_container_state(self, container: str) -> Optional[dict]:
+        """Get a container's state and health ("healthy", "starting", ... or None without a healthcheck)"""
+        from docker.errors import APIError
+        from requests.exceptions import RequestException
+
+        try:
+            with self._lock:
+                state = self.client.inspect_container(container).get("State") or {}
+        except (APIError, RequestException):
+            return None
+        return {"status": state.get("Status"), "health": (state.get("Health") or {}).get("Status")}
+
+    def get_image_label(self, image: str, label: str) -> Optional[str]:
+        """Get a label of a local image, or None if the image or the label does not exist"""
+        if not self.is_docker_installed():
+            return None
+
+        from docker.errors import APIError
+        from requests.exceptions import RequestException
+
+        try:
+            config = self.client.inspect_image(image).get("Config") or {}
+        except (APIError, RequestException):
+            return None
+        return (config.get("Labels") or {}).get(label)
 
     def rebuild_containers(self) -> bool:
         """Rebuild and restart containers"""
@@ -72,7 +190,7 @@ class DockerManager:
             subprocess.run(["docker", "compose", "up", "-d", "--build"], check=True)
             self.messenger.success("Containers rebuilt successfully!")
             return True
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
             self.messenger.error(f"Failed to rebuild containers: {str(e)}")
             return False
 
@@ -0,0 +1,103 @@
+import re
+from typing import List
+
+# BuildKit cache mounts; `sharing=locked` serializes apt between parallel builds
+APT_MOUNTS = [
+    "--mount=type=cache,target=/var/cache/apt,sharing=locked",
+    "--mount=type=cache,target=/var/lib/apt/lists,sharing=locked",
+]
+PECL_MOUNT = "--mount=type=cache,target=/tmp/pear"
+COMPOSER_MOUNT = "--mount=type=cache,target=/tmp/composer-cache"
+
+# Command segments made redundant by the apt cache mounts
+APT_CLEANUP = re.compile(r"^(apt-get clean|apt clean|rm -rf /var/lib/apt/lists/?\*?)$")
+# Removing the pecl directory would try to delete the cache mount point itself
+PECL_CLEANUP = re.compile(r"^rm -rf /tmp/pear/?$")
+
+LAYER_INSTRUCTIONS = ("RUN", "COPY", "ADD")
+
+class DockerfileOptimizer:
+    """Turns a service `build` block into fewer, better cached Dockerfile instructions"""
+
+    @staticmethod
+    def optimize(build: dict) -> dict:
+        """Build the instruction plan rendered by Dockerfile.j2 in optimized mode"""
+        return {
+            "apt": DockerfileOptimizer.apt_instruction(build.get("apt", [])),
+            "copies": DockerfileOptimizer.order_copies(build.get("copies", [])),
+            "run": DockerfileOptimizer.run_instructions(build.get("run", [])),
+        }
+
+    @staticmethod
+    def apt_packages(entries: List[str]) -> List[str]:
+        """Flatten apt entries (which may list several packages) into a sorted, de-duplicated list"""
+        return sorted({package for entry in entries for package in entry.split()})
+
+    @staticmethod
+    def apt_instruction(entries: List[str]) -> str:
+        """One RUN body that updates and installs every apt package with the caches mounted"""
+        packages = DockerfileOptimizer.apt_packages(entries)
+        if not packages:
+            return ""
+
+        lines = [" ".join(APT_MOUNTS)]
+        # The base images' docker-clean hook would empty the mounted cache after every install
+        lines.append("rm -f /etc/apt/apt.conf.d/docker-clean")
+        lines.append("&& apt-get update")
+        lines.append("&& apt-get install -y --no-install-recommends")
+        lines.extend(f"    {package}" for package in packages)
+        return " \\\n    ".join(lines)
+
+    @staticmethod
+    def order_copies(copies: List[str]) -> List[str]:
+        """Copies from other images rarely change, so they go before copies from the build context"""
+        from_images = [copy for copy in copies if copy.startswith("--from=")]
+        from_context = [copy for copy in copies if not copy.startswith("--from=")]
+        return from_images + from_context
+
+    @staticmethod
+    def run_instructions(commands: List[str]) -> List[str]:
+        """Drop apt cleanup made redundant by the cache mounts and mount pecl/composer caches"""
+        instructions = []
+        for command in commands:
+            segments = [segment.strip() for segment in command.split("&&")]
+            segments = [segment for segment in segments if not APT_CLEANUP.match(segment)]
+
+            mounts = []
+            if any(segment.startswith("pecl ") for segment in segments):
+                mounts.append(PECL_MOUNT)
+                segments = [segment for segment in segments if not PECL_CLEANUP.match(segment)]
+            if any(segment.startswith("composer ") for segment in segments):
+                mounts.append(COMPOSER_MOUNT)
+                segments = [
+                    f"COMPOSER_CACHE_DIR=/tmp/composer-cache {segment}" if segment.startswith("composer ") else segment
+                    for segment in segments
+                ]
+            if any(DockerfileOptimizer.program(segment) == "install-php-extensions" for segment in segments):
+                # install-php-extensions installs its own apt dependencies
+                mounts.extend(APT_MOUNTS)
+
+            if not segments:
+                continue
+
+            body = " && ".join(segments)
+            instructions.append(f"{' '.join(mounts)} {body}" if mounts else body)
+        return instructions
+
+    @staticmethod
+    def program(segment: str) -> str:
+        """The program a command segment runs, skipping leading VAR=value assignments"""
+        for word in segment.split():
+            if "=" not in word:
+                return word
+        return ""
+
+    @staticmethod
+    def count_layers(dockerfile: str) -> int:
+        """Count the instructions of a Dockerfile that create filesystem layers"""
+        return sum(
+            1 for line in dockerfile.splitlines()
+            if line.split(" ", 1)[0].upper() in LAYER_INSTRUCTIONS
+        )
+
+__all__ = ["DockerfileOptimizer"]
@@ -0,0 +1,40 @@
+from docker import APIClient
+from docker.constants import MINIMUM_DOCKER_API_VERSION
+from docker.transport import UnixHTTPAdapter
+from docker.types import CancellableStream
+
+class SocketPoolAdapter(UnixHTTPAdapter):
+    """The SDK's adapter keeps a connection pool per request URL, so every endpoint
+    (/_ping, /images/<name>/json, ...) opens a new socket; this one pools per socket"""
+
+    def get_connection(self, url, proxies=None):
+        return super().get_connection(self.socket_path, proxies)
+
+class EngineClient(APIClient):
+    """Engine API client whose requests all go over one keep-alive Unix socket connection"""
+
+    def __init__(self, base_url=None, timeout=60, **kwargs):
+        # The real API version is negotiated below, once the shared pool is mounted
+        super().__init__(base_url=base_url, version=MINIMUM_DOCKER_API_VERSION, timeout=timeout, max_pool_size=1, **kwargs)
+
+        adapter = getattr(self, "_custom_adapter", None)
+        if isinstance(adapter, UnixHTTPAdapter):
+            adapter.close()
+            self._custom_adapter = SocketPoolAdapter(adapter.socket_path, timeout, max_pool_size=1)
+            self.mount("http+docker://", self._custom_adapter)
+
+        self._version = self._retrieve_server_version()
+
+    def follow_logs(self, container, tail="all"):
+        """logs(stream=True, follow=True) without the request timeout: a quiet container is not an error"""
+        params = {"stdout": 1, "stderr": 1, "follow": 1, "tail": tail}
+        response = self._get(self._url("/containers/{0}/logs", container), params=params, stream=True, timeout=None)
+        return CancellableStream(self._get_result(container, True, response), response)
+
+    def stream_stats(self, container):
+        """stats(stream=True, decode=True) that can be closed from another thread to stop it"""
+        response = self._get(self._url("/containers/{0}/stats", container), params={"stream": True}, stream=True, timeout=None)
+        self._raise_for_status(response)
+        return CancellableStream(self._stream_helper(response, decode=True), response)
+
+__all__ = ["EngineClient"]
@@ -0,0 +1,89 @@
+import os
+import hashlib
+import tempfile
+from typing import List, Union
+
+class FileWriter:
+    """Writes generated files only when their content changes, replacing them atomically
+
+    Leaving unchanged files untouched keeps their mtimes stable, so Docker build
+    contexts and layer caches are not invalidated by a re-run.
+    """
+
+    def __init__(self):
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def is_unchanged(self, path: str, data: bytes) -> bool:
+        """Check whether a file already holds exactly these bytes"""
+        try:
+            if os.path.getsize(path) != len(data):
+                return False
+            return self.hash_file(path) == self.hash_bytes(data)
+        except OSError:
+            return False
+
+    def write(self, path: str, content: Union[str, bytes]) -> bool:
+        """Write content to path unless it is already there; returns True if the file was written"""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        if self.is_unchanged(path, data):
+            self.unchanged.append(path)
+            return False
+
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file next to the target and rename it over, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp_path, self._file_mode(path))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.written.append(path)
+        return True
+
+    def copy(self, source: str, path: str) -> bool:
+        """Copy a file's bytes to path unless they are already there"""
+        with open(source, "rb") as f:
+            return self.write(path, f.read())
+
+    def place(self, source: str, path: str, store) -> bool:
+        """Put a file's content at path through a ContentStore, sharing it with other projects"""
+        if store.place(source, path):
+            self.written.append(path)
+            return True
+        self.unchanged.append(path)
+        return False
+
+    @staticmethod
+    def _file_mode(path: str) -> int:
+        """Keep the mode of an existing file, else use the default mode for new files"""
+        try:
+            return os.stat(path).st_mode & 0o7777
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    def summary(self) -> str:
+        return f"{len(self.written)} file(s) written, {len(self.unchanged)} unchanged"
+
+__all__ = ["FileWriter"]
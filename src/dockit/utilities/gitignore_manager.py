@@ -2,8 +2,9 @@ import os
 from dockit.utilities.messenger import Messenger
 
 class GitignoreManager:
-    def __init__(self):
+    def __init__(self, project_dir: str = '.'):
         self.messenger = Messenger()
+        self.project_dir = project_dir
 
 
     def add_pattern(self, pattern: str, comment: str = None) -> bool:
@@ -17,7 +18,7 @@ class GitignoreManager:
         Returns:
             bool: True if pattern was added or already exists, False if there was an error
         """
-        gitignore_path = '.gitignore'
+        gitignore_path = os.path.join(self.project_dir, '.gitignore')
         if not os.path.exists(gitignore_path):
             return False
 
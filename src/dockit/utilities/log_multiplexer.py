@@ -0,0 +1,175 @@
+import re
+import asyncio
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional
+from dockit.utilities.stream_readers import StreamReaders
+
+# Severity names as services spell them, mapped to one scale
+LEVELS = ["debug", "info", "notice", "warning", "error", "critical"]
+LEVEL_ALIASES = {
+    "warn": "warning",
+    "err": "error",
+    "crit": "critical",
+    "fatal": "critical",
+    "alert": "critical",
+    "emerg": "critical",
+    "emergency": "critical",
+    "panic": "critical",
+}
+LEVEL_PATTERN = re.compile(
+    r"\b(debug|info|notice|warn(?:ing)?|err(?:or)?|crit(?:ical)?|fatal|alert|emerg(?:ency)?|panic)\b",
+    re.IGNORECASE
+)
+
+class LogFilter:
+    """Keeps the log lines matching a regular expression and/or at or above a level"""
+
+    def __init__(self, pattern: Optional[str] = None, level: Optional[str] = None):
+        """
+        :param pattern: regular expression a line has to contain, or None
+        :param level: lowest level to keep ("warning" keeps warnings, errors and critical lines), or None
+        """
+        self.pattern = re.compile(pattern) if pattern else None
+        if level is not None:
+            level = LEVEL_ALIASES.get(level.lower(), level.lower())
+            if level not in LEVELS:
+                raise ValueError(f"Unknown log level '{level}', use one of: {', '.join(LEVELS)}")
+        self.level = level
+
+    @staticmethod
+    def level_of(line: str) -> Optional[str]:
+        """The first level name mentioned in a line ("[Warning]", "NOTICE:", "level=error", ...)"""
+        match = LEVEL_PATTERN.search(line)
+        if not match:
+            return None
+        name = match.group(1).lower()
+        return LEVEL_ALIASES.get(name, name)
+
+    def matches(self, line: str) -> bool:
+        if self.pattern and not self.pattern.search(line):
+            return False
+        if self.level:
+            # Lines without a level (stack traces, banners) are dropped when filtering on one
+            level = self.level_of(line)
+            return level is not None and LEVELS.index(level) >= LEVELS.index(self.level)
+        return True
+
+class LogBuffer:
+    """The latest lines of one service; once full, the oldest are dropped as new ones come in"""
+
+    def __init__(self, size: int):
+        self.lines = deque(maxlen=size)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, line: str):
+        with self._lock:
+            if len(self.lines) == self.lines.maxlen:
+                self.dropped += 1
+            self.lines.append(line)
+
+    def drain(self):
+        """Take the buffered lines out; returns (lines, number of lines dropped since the last drain)"""
+        with self._lock:
+            lines, dropped = list(self.lines), self.dropped
+            self.lines.clear()
+            self.dropped = 0
+        return lines, dropped
+
+class LogMultiplexer:
+    """Reads the logs of several containers at once into one bounded buffer per service
+
+    Each container is read on a thread of its own; lines are filtered there, before they
+    are buffered or rendered. While following, the buffers are flushed to the caller
+    every `interval` seconds, so a container flooding its output costs a bounded
+    amount of memory and rendering time: lines it outruns the renderer with are
+    dropped and counted.
+    """
+
+    def __init__(self, docker_manager, containers: List[dict], buffer_size: int = 1000,
+                 log_filter: Optional[LogFilter] = None, interval: float = 0.1):
+        """
+        :param containers: [{"name": ..., "service": ...}] as listed by DockerManager.get_container_status
+        """
+        self.docker_manager = docker_manager
+        self.containers = containers
+        self.filter = log_filter or LogFilter()
+        self.interval = interval
+        self.buffers: Dict[str, LogBuffer] = {
+            container["service"] or container["name"]: LogBuffer(buffer_size) for container in containers
+        }
+        self.errors: Dict[str, str] = {}
+        self._streams = []
+        self._closing = False
+
+    def tail(self, lines: int) -> Dict[str, List[str]]:
+        """The last `lines` matching lines of every service"""
+        # With a filter the whole log is searched; the buffer keeps the last matches
+        tail = "all" if self.filter.pattern or self.filter.level else lines
+        for buffer in self.buffers.values():
+            buffer.lines = deque(maxlen=lines)
+        asyncio.run(self._read_all(tail, follow=False))
+        return {service: buffer.drain()[0] for service, buffer in self.buffers.items()}
+
+    def follow(self, on_lines: Callable[[str, List[str], int], None], tail: int = 10):
+        """Follow every container until interrupted, calling on_lines(service, lines, dropped) as lines come in"""
+        asyncio.run(self._follow(on_lines, tail))
+
+    async def _follow(self, on_lines, tail):
+        reading = asyncio.ensure_future(self._read_all(tail, follow=True))
+        try:
+            while not reading.done():
+                await asyncio.wait([reading], timeout=self.interval)
+                self.flush(on_lines)
+        finally:
+            self.close()
+            await asyncio.gather(reading, return_exceptions=True)
+        self.flush(on_lines)
+
+    def flush(self, on_lines):
+        for service, buffer in self.buffers.items():
+            lines, dropped = buffer.drain()
+            if lines or dropped:
+                on_lines(service, lines, dropped)
+
+    async def _read_all(self, tail, follow: bool):
+        await StreamReaders.read_all(self.read, self.containers, tail, follow)
+
+    def read(self, container: dict, tail, follow: bool):
+        """Read one container's log (on a worker thread), buffering the lines that pass the filter"""
+        service = container["service"] or container["name"]
+        buffer = self.buffers[service]
+        pending = b""
+        try:
+            stream = self.docker_manager.container_logs(container["name"], tail=tail, follow=follow)
+            self._streams.append(stream)
+            if self._closing:
+                stream.close()
+            for chunk in stream:
+                # Chunks are whatever the container wrote at once, not necessarily whole lines
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    self.offer(buffer, line)
+            if pending:
+                self.offer(buffer, pending)
+        except Exception as e:
+            # Closing a stream to stop following makes its pending read fail
+            if not self._closing:
+                self.errors[service] = str(e)
+
+    def offer(self, buffer: LogBuffer, raw: bytes):
+        line = raw.decode("utf-8", errors="replace").rstrip("\r")
+        if self.filter.matches(line):
+            buffer.append(line)
+
+    def close(self):
+        """Stop following: closing the streams unblocks the reading threads"""
+        self._closing = True
+        for stream in self._streams:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+__all__ = ["LogFilter", "LogBuffer", "LogMultiplexer", "LEVELS"]
@@ -0,0 +1,97 @@
+import os
+import json
+from typing import Dict, List, Optional
+from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.file_writer import FileWriter
+
+class OverrideMigration:
+    """Clears the stale catalog copies older releases left in ~/.dockit
+
+    Releases that copied the whole bundled catalog into ~/.dockit on first run
+    (and `force-publish`, which did the same) left files there that now sit in
+    the override layers and hide what newer releases ship. Every file whose
+    content is one that dockit itself shipped at that path is removed; files
+    the user edited or added are kept. It runs once, then records the layout.
+    """
+
+    # Bump when ~/.dockit needs migrating again
+    LAYOUT = 2
+
+    def __init__(self, services_dir: Optional[str] = None, templates_dir: Optional[str] = None,
+                 history_path: Optional[str] = None):
+        services_dir = services_dir or PathResolver.get_services_dir()
+        templates_dir = templates_dir or PathResolver.get_templates_dir()
+        self.history_path = history_path or PathResolver.get_bundled_history_path()
+        self.marker_path = os.path.join(os.path.dirname(services_dir), "layout")
+        # Name in the history -> (override layer, the bundled directory it overrides)
+        self.layers = {
+            "services": (services_dir, PathResolver.get_predefined_services_path()),
+            "templates": (templates_dir, PathResolver.get_predefined_templates_path()),
+        }
+        self.removed: List[str] = []
+        self.kept: List[str] = []
+
+    def needed(self) -> bool:
+        try:
+            with open(self.marker_path, "r") as f:
+                return f.read().strip() != str(self.LAYOUT)
+        except OSError:
+            return True
+
+    def run(self) -> List[str]:
+        """Remove the shipped copies from the override layers; returns the files removed"""
+        if not self.needed():
+            return []
+
+        history = self.load_history(self.history_path)
+        for name, (layer, bundled_dir) in self.layers.items():
+            if not os.path.isdir(layer):
+                continue
+            for root, dirs, files in os.walk(layer):
+                # Left behind by older releases that copied the catalog with its bytecode
+                dirs[:] = [d for d in dirs if d != "__pycache__"]
+                for file_name in files:
+                    path = os.path.join(root, file_name)
+                    relative = os.path.relpath(path, layer)
+                    shipped = history.get(f"{name}/{relative.replace(os.sep, '/')}", [])
+                    if self.was_shipped(path, os.path.join(bundled_dir, relative), shipped):
+                        os.remove(path)
+                        self.removed.append(path)
+                    else:
+                        self.kept.append(path)
+            self.prune(layer)
+
+        FileWriter().write(self.marker_path, f"{self.LAYOUT}\n")
+        return self.removed
+
+    @staticmethod
+    def was_shipped(path: str, bundled_path: str, hashes: List[str]) -> bool:
+        """Whether a file holds content dockit shipped at its path, now or in an earlier release"""
+        digest = FileWriter.hash_file(path)
+        if digest in hashes:
+            return True
+        return os.path.isfile(bundled_path) and FileWriter.hash_file(bundled_path) == digest
+
+    @staticmethod
+    def prune(layer: str):
+        """Remove the directories of a layer left empty (or holding only bytecode), keeping the layer itself"""
+        for root, dirs, files in os.walk(layer, topdown=False):
+            if root == layer:
+                continue
+            if os.path.basename(root) == "__pycache__":
+                for file_name in files:
+                    os.remove(os.path.join(root, file_name))
+            if not os.listdir(root):
+                os.rmdir(root)
+
+    @staticmethod
+    def load_history(path: str) -> Dict[str, List[str]]:
+        """Bundled path ("services/php/service.json") -> sha256 of every content it was shipped with"""
+        try:
+            with open(path, "r") as f:
+                history = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return history if isinstance(history, dict) else {}
+
+__all__ = ["OverrideMigration"]
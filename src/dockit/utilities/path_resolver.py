@@ -1,5 +1,7 @@
 import os
 import sys
+from importlib import resources
+from typing import List, Optional
 
 class PathResolver:
     @staticmethod
@@ -23,6 +25,53 @@ class PathResolver:
         """Get the templates directory path"""
         return os.path.join(PathResolver.get_home_dir(), "templates")
 
+    @staticmethod
+    def get_service_layers() -> List[str]:
+        """Directories services are looked up in: the user's overrides first, then the bundled services"""
+        return [PathResolver.get_services_dir(), PathResolver.get_predefined_services_path()]
+
+    @staticmethod
+    def get_template_layers() -> List[str]:
+        """Directories templates are looked up in: the user's overrides first, then the bundled templates"""
+        return [PathResolver.get_templates_dir(), PathResolver.get_predefined_templates_path()]
+
+    @staticmethod
+    def find_resource(layers: List[str], *parts: str) -> Optional[str]:
+        """Path of a file or directory in the first layer that has it, or None"""
+        for layer in layers:
+            path = os.path.join(layer, *parts)
+            if os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def get_project_name(project_dir="."):
+        """Get the compose project name of a project directory"""
+        # Convert the directory name to slug format (lowercase, replace spaces with dashes)
+        return os.path.basename(os.path.abspath(project_dir)).lower().replace(' ', '-')
+
+    @staticmethod
+    def get_cache_dir():
+        """Get the cache directory path"""
+        return os.path.join(PathResolver.get_home_dir(), "cache")
+
+    @staticmethod
+    def get_store_dir():
+        """Get the content-addressed store the config files of projects are cloned from"""
+        return os.path.join(PathResolver.get_home_dir(), "store")
+
+    @staticmethod
+    def get_build_cache_dir():
+        """Get the default directory for local BuildKit caches"""
+        return os.path.join(PathResolver.get_home_dir(), "buildcache")
+
+    @staticmethod
+    def resolve_build_cache_dir(enabled=False, directory=None):
+        """Get the build cache directory asked for on the command line, or None when disabled"""
+        if directory:
+            return os.path.abspath(os.path.expanduser(directory))
+        return PathResolver.get_build_cache_dir() if enabled else None
+
     @staticmethod
     def get_predefined_services_path():
         """Get the path to predefined services"""
@@ -30,8 +79,8 @@ class PathResolver:
             # Try to get predefined services from PyInstaller
             return os.path.join(sys._MEIPASS, "services")
         except Exception:
-            # If not running in PyInstaller, use the local services directory
-            return os.path.join(os.path.dirname(os.path.dirname(__file__)), "services")
+            # If not running in PyInstaller, read the services shipped inside the package in place
+            return str(resources.files("dockit") / "services")
 
     @staticmethod
     def get_predefined_templates_path():
@@ -40,5 +89,30 @@ class PathResolver:
             # Try to get predefined templates from PyInstaller
             return os.path.join(sys._MEIPASS, "templates")
         except Exception:
-            # If not running in PyInstaller, use the local templates directory
-            return os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates") 
\ No newline at end of file
+            # If not running in PyInstaller, read the templates shipped inside the package in place
+            return str(resources.files("dockit") / "templates")
+
+    @staticmethod
+    def get_bundled_history_path():
+        """Get the record of every service and template file content dockit has shipped"""
+        try:
+            # Try to get the history from PyInstaller
+            return os.path.join(sys._MEIPASS, "bundled_history.json")
+        except Exception:
+            # If not running in PyInstaller, read the history shipped inside the package
+            return str(resources.files("dockit") / "bundled_history.json")
+
+    @staticmethod
+    def get_reference_dir():
+        """Get the directory force-publish copies the bundled catalog to, for reference; it is not a layer"""
+        return os.path.join(PathResolver.get_home_dir(), "bundled")
+
+    @staticmethod
+    def get_precompiled_templates_path():
+        """Get the path to the precompiled templates shipped with the package"""
+        try:
+            # Try to get precompiled templates from PyInstaller
+            return os.path.join(sys._MEIPASS, "compiled_templates")
+        except Exception:
+            # If not running in PyInstaller, use the local compiled templates directory
+            return os.path.join(os.path.dirname(os.path.dirname(__file__)), "compiled_templates")
\ No newline at end of file
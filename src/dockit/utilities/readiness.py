@@ -0,0 +1,57 @@
+import time
+import asyncio
+from typing import Dict
+
+class ReadinessWaiter:
+    """Waits for the containers of a stack to become ready, all at the same time
+
+    A container with a healthcheck is ready once it reports healthy; one without is
+    ready as soon as it runs. Exited, dead and unhealthy containers fail right away.
+    """
+
+    def __init__(self, docker_manager, timeout: float = 120, interval: float = 0.5):
+        self.docker_manager = docker_manager
+        self.timeout = timeout
+        self.interval = interval
+
+    def wait_all(self, containers: Dict[str, str]) -> Dict[str, dict]:
+        """Wait for every service (name -> container name); returns {service: {ready, seconds, state}}"""
+        return asyncio.run(self._wait_all(containers))
+
+    async def _wait_all(self, containers: Dict[str, str]) -> Dict[str, dict]:
+        started_at = time.perf_counter()
+        results = await asyncio.gather(*(
+            self.wait(container, started_at) for container in containers.values()
+        ))
+        return dict(zip(containers, results))
+
+    async def wait(self, container: str, started_at: float) -> dict:
+        """Poll one container until it is ready, fails or the timeout passes"""
+        while True:
+            state = await asyncio.to_thread(self.docker_manager.get_container_state, container)
+            seconds = time.perf_counter() - started_at
+            verdict = self.verdict(state)
+            if verdict is not None:
+                return {"ready": verdict, "seconds": seconds, "state": self.describe(state)}
+            if seconds >= self.timeout:
+                return {"ready": False, "seconds": seconds, "state": f"timed out ({self.describe(state)})"}
+            await asyncio.sleep(self.interval)
+
+    @staticmethod
+    def verdict(state):
+        """True when ready, False when it will not become ready, None while still starting"""
+        if state is None:
+            return None
+        if state["status"] in ("exited", "dead") or state["health"] == "unhealthy":
+            return False
+        if state["health"] is None:
+            return True if state["status"] == "running" else None
+        return True if state["health"] == "healthy" else None
+
+    @staticmethod
+    def describe(state) -> str:
+        if state is None:
+            return "not created"
+        return state["health"] or state["status"]
+
+__all__ = ["ReadinessWaiter"]
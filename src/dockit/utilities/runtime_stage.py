@@ -0,0 +1,74 @@
+from typing import List, Optional
+from dockit.utilities.dockerfile_optimizer import DockerfileOptimizer, APT_MOUNTS
+
+# Where the builder stage gathers the shared libraries the runtime stage needs
+RUNTIME_LIBS_DIR = "/dockit/runtime-libs"
+BASE_LIBS_LIST = "/dockit/base-libs.txt"
+
+# Record the libraries the base image already ships, before anything is installed
+SNAPSHOT_LIBS = (
+    "mkdir -p /dockit"
+    " && find / -xdev \\( -name '*.so' -o -name '*.so.*' \\) -print0 2>/dev/null"
+    f" | xargs -0 -r readlink -f | sort -u > {BASE_LIBS_LIST}"
+)
+
+class RuntimeStage:
+    """Plans the slim runtime stage of a service whose `build` declares a `runtime` block
+
+    Example `build.runtime`:
+
+        "runtime": {
+            "apt": ["git", "unzip"],
+            "copies": ["--from=composer:latest /usr/bin/composer /usr/bin/composer"],
+            "artifacts": ["/usr/local/lib/php/extensions", "/usr/local/etc/php/conf.d"]
+        }
+
+    The build steps run in a builder stage. The runtime stage starts again from the
+    base image and copies over only the artifacts plus the shared libraries they link
+    against that the base image lacks, leaving compilers and -dev headers behind.
+    The builder records those base libraries first by running SNAPSHOT_LIBS.
+    """
+
+    @staticmethod
+    def plan(build: dict, optimize: bool = False) -> Optional[dict]:
+        """Build the runtime stage plan rendered by Dockerfile.j2, or None for a single-stage build"""
+        runtime = build.get("runtime")
+        if not runtime:
+            return None
+
+        artifacts = runtime.get("artifacts", [])
+        return {
+            "base_image": runtime.get("base_image", build["base_image"]),
+            "apt": RuntimeStage.apt_instruction(runtime.get("apt", []), optimize),
+            "copies": runtime.get("copies", []),
+            "artifacts": artifacts,
+            "libs_dir": RUNTIME_LIBS_DIR,
+            "collect_libs": RuntimeStage.collect_libs_instruction(artifacts),
+        }
+
+    @staticmethod
+    def apt_instruction(entries: List[str], optimize: bool) -> str:
+        """RUN body installing the runtime packages in one layer"""
+        packages = DockerfileOptimizer.apt_packages(entries)
+        if not packages:
+            return ""
+        install = f"apt-get install -y --no-install-recommends {' '.join(packages)}"
+        if optimize:
+            return f"{' '.join(APT_MOUNTS)} rm -f /etc/apt/apt.conf.d/docker-clean && apt-get update && {install}"
+        return f"apt-get update && {install} && rm -rf /var/lib/apt/lists/*"
+
+    @staticmethod
+    def collect_libs_instruction(artifacts: List[str]) -> str:
+        """RUN body copying the libraries the artifacts link against (and the base image lacks)"""
+        paths = " ".join(artifacts)
+        return " \\\n    ".join([
+            f"mkdir -p {RUNTIME_LIBS_DIR}",
+            f"&& for lib in $(find {paths} -name '*.so*' -type f -exec ldd {{}} + 2>/dev/null"
+            " | awk '/=> \\// {print $3}' | sort -u); do",
+            f"    grep -qxF \"$(readlink -f \"$lib\")\" {BASE_LIBS_LIST} && continue;",
+            f"    dest=\"{RUNTIME_LIBS_DIR}$(readlink -f \"$(dirname \"$lib\")\")\";",
+            "    mkdir -p \"$dest\" && cp -L \"$lib\" \"$dest/\";",
+            "done",
+        ])
+
+__all__ = ["RuntimeStage"]
@@ -0,0 +1,108 @@
+import json
+from typing import Dict, List
+
+VERSION_PLACEHOLDER = "{version}"
+
+class ServiceDefinition:
+    """Resolves the versions of a service.json: `extends` and `{version}` placeholders
+
+    A version can extend another version, or an abstract template (a key starting
+    with "_", which is not offered as a version), and only spell out what differs:
+    mappings are merged key by key, any other value replaces the inherited one and
+    null removes it. Then every "{version}" in a string becomes the version's name.
+    """
+
+    @staticmethod
+    def load(paths: List[str]) -> dict:
+        """The service.json files of one service across the catalog layers (first one wins), merged
+
+        Layers are combined version by version: a version (or template, or "priority")
+        defined in an upper layer replaces the one below it, and null hides it.
+        """
+        layers = []
+        for path in paths:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError(f"{path} must hold an object of versions")
+            layers.append(data)
+        return ServiceDefinition.overlay(layers)
+
+    @staticmethod
+    def overlay(layers: List[dict]) -> dict:
+        merged: dict = {}
+        for data in reversed(layers):
+            for name, config in data.items():
+                if config is None:
+                    merged.pop(name, None)
+                else:
+                    merged[name] = config
+        return merged
+
+    @staticmethod
+    def resolve(data: dict) -> Dict[str, dict]:
+        """Fully resolved config of every concrete version, in file order (without "priority")"""
+        merged: Dict[str, dict] = {}
+        resolved = {}
+        for version in data:
+            if version == "priority" or ServiceDefinition.is_abstract(version):
+                continue
+            config = ServiceDefinition.merged(data, version, [], merged)
+            resolved[version] = ServiceDefinition.substitute(config, version)
+        return resolved
+
+    @staticmethod
+    def is_abstract(name: str) -> bool:
+        return name.startswith("_")
+
+    @staticmethod
+    def merged(data: dict, name: str, chain: List[str], memo: Dict[str, dict]) -> dict:
+        """A version's config with everything it extends merged in, placeholders still in place"""
+        if name in memo:
+            return memo[name]
+        if name in chain:
+            raise ValueError(f"Circular extends: {' -> '.join(chain + [name])}")
+        if not isinstance(data.get(name), dict):
+            if not chain:
+                raise ValueError(f"Version '{name}' must be an object")
+            raise ValueError(f"'{chain[-1]}' extends unknown version '{name}'")
+
+        config = dict(data[name])
+        parent = config.pop("extends", None)
+        if parent is not None:
+            config = ServiceDefinition.merge(ServiceDefinition.merged(data, parent, chain + [name], memo), config)
+        memo[name] = config
+        return config
+
+    @staticmethod
+    def merge(base: dict, override: dict) -> dict:
+        merged = dict(base)
+        for key, value in override.items():
+            if value is None:
+                merged.pop(key, None)
+            elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = ServiceDefinition.merge(merged[key], value)
+            else:
+                merged[key] = value
+        return merged
+
+    @staticmethod
+    def substitute(value, version: str):
+        """Replace {version} in every string; other braces (${DB_PASSWORD}, ...) are left as they are"""
+        if isinstance(value, str):
+            return value.replace(VERSION_PLACEHOLDER, version)
+        if isinstance(value, dict):
+            return {key: ServiceDefinition.substitute(item, version) for key, item in value.items()}
+        if isinstance(value, list):
+            return [ServiceDefinition.substitute(item, version) for item in value]
+        return value
+
+    @staticmethod
+    def dependents(data: dict, version: str) -> List[str]:
+        """Versions and templates that extend the given one directly"""
+        return [
+            name for name, config in data.items()
+            if isinstance(config, dict) and config.get("extends") == version
+        ]
+
+__all__ = ["ServiceDefinition"]
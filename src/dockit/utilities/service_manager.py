@@ -1,15 +1,15 @@
 import os
-import json
-import sys
-import shutil
-from pathlib import Path
 from typing import Dict, Optional, List
 from questionary import Choice
 import questionary
 from dockit.utilities.messenger import Messenger
 import fnmatch
-from dockit.utilities.debugger import Debugger
 from dockit.utilities.path_resolver import PathResolver
+from dockit.utilities.catalog_index import CatalogIndex, LazyCatalog
+from dockit.utilities.file_writer import FileWriter
+from dockit.utilities.content_store import ContentStore
+from dockit.utilities.catalog_validator import CatalogValidator
+from dockit.utilities.override_migration import OverrideMigration
 
 class ServiceManager:
     _instance = None
@@ -25,23 +25,36 @@ class ServiceManager:
             return
             
         self.services = {}
+        self.catalog = None
+        # User additions and overrides; the bundled services underneath are read in place
         self.services_dir = PathResolver.get_services_dir()
         self.templates_dir = PathResolver.get_templates_dir()
+        self.service_layers = PathResolver.get_service_layers()
+        # Published config files are cloned into projects from one deduplicated copy
+        self.store = ContentStore()
         self.messenger = Messenger()
         self._initialized = True
 
     def initialize_services(self):
-        """Initialize services directory and copy predefined services on first run"""
-        # Get the base .dockit directory path
-        dockit_base_dir = PathResolver.get_home_dir()
-        
+        """Create the directories for the user's services and template overrides on first run
+
+        Nothing is copied: the bundled services and templates are read where they are shipped.
+        Copies of them older releases left in ~/.dockit are cleared once, so they stop hiding
+        the bundled ones.
+        """
+        try:
+            removed = OverrideMigration(self.services_dir, self.templates_dir).run()
+            if removed:
+                self.messenger.info(f"Removed {len(removed)} outdated copies of bundled files from {PathResolver.get_home_dir()}")
+        except OSError as e:
+            self.messenger.warning(f"Could not clear the outdated copies of bundled files: {str(e)}")
+
         # Check if this is first run by looking for .dockit directory
-        if os.path.exists(dockit_base_dir) and os.path.exists(self.services_dir) and os.path.exists(self.templates_dir):
+        if os.path.exists(self.services_dir) and os.path.exists(self.templates_dir):
             return False
 
-        # Use PublishCommand to handle initialization and publishing
-        from dockit.commands.publish import PublishCommand
-        PublishCommand().publish(force=False)
+        os.makedirs(self.services_dir, exist_ok=True)
+        os.makedirs(self.templates_dir, exist_ok=True)
         return True
 
     def get_container_path(self, service_name: str, filename: str) -> str:
@@ -64,15 +77,14 @@ class ServiceManager:
     def scan_publishable_files(self, service_name: str, version: str, service_config: dict) -> list:
         """Scan for additional publishable files in the service directory"""
         publishable_files = []
-        service_dir = os.path.join('services', service_name)
         
         # Only process files that are explicitly defined in the files array
         if 'publishes' in service_config:
             for file_name, file_config in service_config['publishes'].items():
                 source_path = file_config['source'].format(version=version)
-                full_source_path = os.path.join(service_dir, source_path)
+                full_source_path = PathResolver.find_resource(self.service_layers, service_name, source_path)
                 
-                if os.path.exists(full_source_path):
+                if full_source_path:
                     publishable_files.append({
                         'source': full_source_path,
                         'target': file_config['destination']
@@ -84,30 +96,13 @@ class ServiceManager:
         return publishable_files
 
     def load_all_services(self):
-        """Load all services from the services directory, sorted by priority descending."""
-        if not os.path.exists(self.services_dir):
-            os.makedirs(self.services_dir, exist_ok=True)
-            return
-
-        services_with_priority = []
-
-        for service_name in os.listdir(self.services_dir):
-            service_dir = os.path.join(self.services_dir, service_name)
-            if os.path.isdir(service_dir):
-                service_json = os.path.join(service_dir, "service.json")
-                if os.path.exists(service_json):
-                    with open(service_json, "r") as f:
-                        data = json.load(f)
-                        priority = data.pop("priority", 0)  # remove priority after reading it
-                        services_with_priority.append((priority, service_name, data))
+        """Load all services from the catalog index, sorted by priority descending."""
+        # Only services whose service.json changed since the last run are parsed again
+        self.catalog = CatalogIndex(self.service_layers)
+        self.catalog.refresh()
 
-        # Sort by priority (descending)
-        sorted_services = sorted(services_with_priority, key=lambda x: x[0], reverse=True)
-
-        self.services = {
-            service_name: data
-            for _, service_name, data in sorted_services
-        }
+        # Versions are materialized one at a time when get_service_config asks for them
+        self.services = LazyCatalog(self.catalog)
 
     def get_service(self, service_name):
         """Get service configuration"""
@@ -132,36 +127,35 @@ class ServiceManager:
             return self.services[service_name][version]
         return None
 
-    def validate_service_config(self, service_name: str, service_config: dict) -> bool:
-        """Validate service configuration against its requirements"""
-        # Check if service has either build or image
-        if 'build' not in service_config and 'image' not in service_config:
-            return False
-
-        # Validate build configuration if present
-        if 'build' in service_config:
-            build = service_config['build']
-            required_build_fields = ['base_image', 'command']
-            for field in required_build_fields:
-                if field not in build:
-                    return False
-
-        # Validate compose configuration
-        if 'compose' not in service_config:
-            return False
-
-        return True
+    def find_selection_error(self, selected_services: Dict[str, str]) -> Optional[str]:
+        """Check a service -> version selection against the catalog, returning an error message if invalid"""
+        for service_name, version in selected_services.items():
+            versions = self.get_service_versions(service_name)
+            if versions is None:
+                return f"Unknown service '{service_name}'"
+            if version not in versions:
+                return f"Unknown version '{version}' for {service_name}. Available: {', '.join(versions)}"
+        return None
 
-    def handle_service_files(self, service_name: str, version: str, service_config: dict) -> None:
+    def validate_service_config(self, service_name: str, service_config: dict) -> bool:
+        """Validate service configuration against the service schema; unknown keys only warn"""
+        errors, warnings = CatalogValidator.schema_problems(service_config)
+        for path, message in warnings:
+            self.messenger.warning(f"{service_name}: {CatalogValidator.describe(path, message)}, ignored")
+        for path, message in errors:
+            self.messenger.warning(f"{service_name}: {CatalogValidator.describe(path, message)}")
+        return not errors
+
+    def handle_service_files(self, service_name: str, version: str, service_config: dict, project_dir: str = '.',
+                             writer: Optional[FileWriter] = None) -> None:
         """Handle service configuration files based on service configuration"""
         if 'publishes' not in service_config:
             return
 
-        service_dir = os.path.join(self.services_dir, service_name)
-        dockit_dir = os.path.join('dockit', f"{service_name}-{version}")
+        writer = writer or FileWriter()
 
-        # Ensure dockit directory exists
-        os.makedirs(dockit_dir, exist_ok=True)
+        # Created along with the first file placed in it
+        dockit_dir = os.path.join(project_dir, 'dockit', f"{service_name}-{version}")
 
         # Initialize volumes list if not exists
         if 'volumes' not in service_config['compose']:
@@ -173,19 +167,14 @@ class ServiceManager:
             source_path = file_config['source'].format(version=version)
             destination_path = file_config['destination']
             
-            # Construct full source path
-            full_source_path = os.path.join(service_dir, source_path)
+            # A file the user overrides in ~/.dockit/services wins over the bundled one
+            full_source_path = PathResolver.find_resource(self.service_layers, service_name, source_path)
             
             # If file exists
-            if os.path.exists(full_source_path):
-                # Create target directory in dockit
-                target_dir = os.path.dirname(os.path.join(dockit_dir, file_name))
-                os.makedirs(target_dir, exist_ok=True)
-                
-                # Copy file
+            if full_source_path:
+                # Link the file from the store, leaving it untouched when the content is already up to date
                 target_file = os.path.join(dockit_dir, file_name)
-                with open(full_source_path, 'r') as src, open(target_file, 'w') as dst:
-                    dst.write(src.read())
+                writer.place(full_source_path, target_file, self.store)
                 
                 # Add volume mapping with relative path only if skipVolumes is not True
                 if not file_config.get('skipVolumes', False):
@@ -195,9 +184,10 @@ class ServiceManager:
                     )
                     self.messenger.info(f"Added file mapping: {relative_target} → {destination_path}")
             else:
-                self.messenger.warning(f"File not found: {full_source_path}")
+                self.messenger.warning(f"File not found: {os.path.join(service_name, source_path)}")
 
-    def resolve_service_configs(self, selected_services: Dict[str, str]) -> Dict[str, dict]:
+    def resolve_service_configs(self, selected_services: Dict[str, str], project_dir: str = '.',
+                                writer: Optional[FileWriter] = None) -> Dict[str, dict]:
         """Resolve and validate service configurations for selected services and versions"""
         resolved = {}
         for service_name, version in selected_services.items():
@@ -213,7 +203,7 @@ class ServiceManager:
                 return None
 
             # Handle service files
-            self.handle_service_files(service_name, version, service_config)
+            self.handle_service_files(service_name, version, service_config, project_dir, writer)
 
             resolved[service_name] = service_config
 
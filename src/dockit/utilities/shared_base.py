@@ -0,0 +1,89 @@
+import hashlib
+from typing import Dict, List, Optional
+from dockit.utilities.dockerfile_optimizer import DockerfileOptimizer
+
+class SharedBase:
+    """Moves the build steps that services on the same base image have in common into a shared base image
+
+    Services are grouped by `base_image`: images that start FROM different images
+    (php:8.3-fpm and php:8.4-fpm, say) cannot share layers, whatever they install.
+    Within a group, the shared base installs the apt packages every member needs,
+    the leading `--from=` copies they all make and, when no member copies files
+    from its own build context, their common leading `run` commands. Each member
+    then builds FROM the base image and only adds what is specific to it.
+    """
+
+    @staticmethod
+    def plan(builds: Dict[str, dict]) -> List[dict]:
+        """Group services sharing a base image; returns [{"services": [...], "build": prefix}]"""
+        groups: Dict[str, List[str]] = {}
+        for service_name, build in builds.items():
+            groups.setdefault(build["base_image"], []).append(service_name)
+
+        shared = []
+        for service_names in groups.values():
+            if len(service_names) < 2:
+                continue
+            prefix = SharedBase.common_prefix([builds[name] for name in service_names])
+            if prefix is not None:
+                shared.append({"services": service_names, "build": prefix})
+        return shared
+
+    @staticmethod
+    def common_prefix(builds: List[dict]) -> Optional[dict]:
+        """The build steps every build starts with, or None if they have none in common"""
+        package_sets = [set(DockerfileOptimizer.apt_packages(build.get("apt", []))) for build in builds]
+        apt = sorted(set.intersection(*package_sets))
+
+        copies = SharedBase.leading(
+            [build.get("copies", []) for build in builds],
+            lambda copy: copy.startswith("--from=")
+        )
+
+        run = []
+        # Commands may depend on files copied from the build context, which happens after the base
+        if all(len(build.get("copies", [])) == len(copies) for build in builds):
+            run = SharedBase.leading([build.get("run", []) for build in builds])
+
+        if not (apt or copies or run):
+            return None
+        return {"base_image": builds[0]["base_image"], "apt": apt, "copies": copies, "run": run}
+
+    @staticmethod
+    def leading(lists: List[list], accept=lambda item: True) -> list:
+        """Longest common prefix of lists, stopping at the first item not accepted"""
+        prefix = []
+        for items in zip(*lists):
+            if len(set(items)) != 1 or not accept(items[0]):
+                break
+            prefix.append(items[0])
+        return prefix
+
+    @staticmethod
+    def image_name(dockerfile: str) -> str:
+        """Name the base image after its Dockerfile so identical bases are shared between projects"""
+        return f"dockit-base-{hashlib.sha256(dockerfile.encode('utf-8')).hexdigest()[:12]}"
+
+    @staticmethod
+    def remainder(build: dict, prefix: dict, image: str) -> dict:
+        """The part of a build that is left to do on top of the shared base image"""
+        shared_packages = set(prefix["apt"])
+        apt = []
+        for entry in build.get("apt", []):
+            packages = [package for package in entry.split() if package not in shared_packages]
+            if packages:
+                apt.append(" ".join(packages))
+
+        remaining = dict(
+            build,
+            base_image=image,
+            apt=apt,
+            copies=build.get("copies", [])[len(prefix["copies"]):],
+            run=build.get("run", [])[len(prefix["run"]):],
+        )
+        if build.get("runtime"):
+            # The runtime stage still starts from the original image, not from the build base
+            remaining["runtime"] = dict(build["runtime"], base_image=build["runtime"].get("base_image", build["base_image"]))
+        return remaining
+
+__all__ = ["SharedBase"]
@@ -0,0 +1,57 @@
+import yaml
+from typing import Dict, List, Optional
+
+class StackSpec:
+    """Declarative stack selection used to run `dockit init` without prompts
+
+    A spec file is YAML like:
+
+        services:
+          php: "8.4"        # quoted: an unquoted 8.10 would be read as 8.1
+          mysql: latest
+        start: false
+    """
+
+    def __init__(self, services: Optional[Dict[str, str]] = None, start: bool = False):
+        self.services = services or {}
+        self.start = start
+
+    @staticmethod
+    def load(path: str) -> "StackSpec":
+        """Load a stack spec from a YAML file"""
+        with open(path, "r") as f:
+            try:
+                data = yaml.safe_load(f) or {}
+            except yaml.YAMLError as e:
+                raise ValueError(f"{path}: {e}") from e
+
+        if not isinstance(data, dict) or not isinstance(data.get("services"), dict):
+            raise ValueError(f"{path}: expected a 'services' mapping of service name to version")
+
+        services = {}
+        for service_name, version in data["services"].items():
+            if version is None:
+                raise ValueError(f"{path}: no version given for service '{service_name}'")
+            # YAML reads 8.10 as the number 8.1; only a quoted version is taken as written
+            if not isinstance(version, str):
+                raise ValueError(f"{path}: quote the version of service '{service_name}', e.g. {service_name}: \"{version}\"")
+            services[str(service_name)] = version
+
+        start = data.get("start", False)
+        if not isinstance(start, bool):
+            raise ValueError(f"{path}: 'start' must be true or false")
+
+        return StackSpec(services, start)
+
+    @staticmethod
+    def parse_services(values: List[str]) -> Dict[str, str]:
+        """Parse repeated --service name=version options"""
+        services = {}
+        for value in values:
+            service_name, sep, version = value.partition("=")
+            if not sep or not service_name.strip() or not version.strip():
+                raise ValueError(f"Invalid service '{value}', expected name=version (e.g. php=8.4)")
+            services[service_name.strip()] = version.strip()
+        return services
+
+__all__ = ["StackSpec"]
@@ -0,0 +1,141 @@
+import time
+import asyncio
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from dockit.utilities.stream_readers import StreamReaders
+
+# Columns of a per-service sample, in the order CSV output writes them
+FIELDS = [
+    "timestamp", "service", "containers", "cpu_percent", "mem_bytes", "mem_limit", "mem_percent",
+    "net_rx_bytes", "net_tx_bytes", "block_read_bytes", "block_write_bytes",
+    "net_rx_rate", "net_tx_rate", "block_read_rate", "block_write_rate",
+]
+# Counters that also get a per-second rate
+COUNTERS = {
+    "net_rx_bytes": "net_rx_rate",
+    "net_tx_bytes": "net_tx_rate",
+    "block_read_bytes": "block_read_rate",
+    "block_write_bytes": "block_write_rate",
+}
+
+class StatsMonitor:
+    """Follows the resource usage of a stack's containers and samples it per service
+
+    Each container's stats stream is read on a thread of its own that only keeps the
+    latest reading; every `interval` seconds the readings are summed per service
+    and handed over as one sample, with I/O rates computed since the previous one.
+    """
+
+    def __init__(self, docker_manager, containers: Dict[str, str], interval: float = 1.0):
+        """
+        :param containers: container name -> service name
+        :param interval: seconds between samples
+        """
+        self.docker_manager = docker_manager
+        self.containers = containers
+        self.interval = interval
+        self.latest: Dict[str, dict] = {}
+        self.errors: Dict[str, str] = {}
+        self._previous: Dict[str, dict] = {}
+        self._streams = []
+        self._closing = False
+
+    def run(self, on_sample: Callable[[List[dict]], None], count: int = 0):
+        """Sample until interrupted, or `count` times; on_sample gets one row per service"""
+        asyncio.run(self._run(on_sample, count))
+
+    async def _run(self, on_sample, count):
+        reading = asyncio.ensure_future(StreamReaders.read_all(self.read, self.containers))
+        taken = 0
+        try:
+            while not reading.done() and (not count or taken < count):
+                await asyncio.wait([reading], timeout=self.interval)
+                if self.latest:
+                    on_sample(self.sample(time.monotonic()))
+                    taken += 1
+        finally:
+            self.close()
+            await asyncio.gather(reading, return_exceptions=True)
+
+    def read(self, container: str):
+        """Keep the latest reading of one container (on a worker thread)"""
+        try:
+            stream = self.docker_manager.container_stats(container)
+            self._streams.append(stream)
+            if self._closing:
+                stream.close()
+            for stats in stream:
+                # A stopped container reports no usage; it drops out of the samples
+                if stats.get("pids_stats") or stats.get("memory_stats"):
+                    self.latest[container] = self.parse(stats)
+                else:
+                    self.latest.pop(container, None)
+        except Exception as e:
+            if not self._closing:
+                self.errors[container] = str(e)
+                self.latest.pop(container, None)
+
+    @staticmethod
+    def parse(stats: dict) -> dict:
+        """CPU %, memory and I/O counters of one container from an Engine API stats reading"""
+        cpu = stats.get("cpu_stats") or {}
+        precpu = stats.get("precpu_stats") or {}
+        cpu_delta = (cpu.get("cpu_usage") or {}).get("total_usage", 0) - (precpu.get("cpu_usage") or {}).get("total_usage", 0)
+        system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+        cpus = cpu.get("online_cpus") or len((cpu.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+        cpu_percent = cpu_delta / system_delta * cpus * 100 if cpu_delta > 0 and system_delta > 0 else 0.0
+
+        memory = stats.get("memory_stats") or {}
+        details = memory.get("stats") or {}
+        # Like `docker stats`, page cache the kernel can drop is not counted (cgroup v2, then v1)
+        cache = details.get("inactive_file", details.get("total_inactive_file", 0))
+        mem_bytes = max(memory.get("usage", 0) - cache, 0)
+
+        networks = (stats.get("networks") or {}).values()
+        block = (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []
+        return {
+            "cpu_percent": cpu_percent,
+            "mem_bytes": mem_bytes,
+            "mem_limit": memory.get("limit", 0),
+            "net_rx_bytes": sum(network.get("rx_bytes", 0) for network in networks),
+            "net_tx_bytes": sum(network.get("tx_bytes", 0) for network in networks),
+            "block_read_bytes": sum(entry.get("value", 0) for entry in block if entry.get("op", "").lower() == "read"),
+            "block_write_bytes": sum(entry.get("value", 0) for entry in block if entry.get("op", "").lower() == "write"),
+        }
+
+    def sample(self, now: float, timestamp: Optional[str] = None) -> List[dict]:
+        """Sum the latest readings per service; rates are per second since the previous sample"""
+        timestamp = timestamp or datetime.now().isoformat(timespec="seconds")
+        rows: Dict[str, dict] = {}
+        for container, reading in list(self.latest.items()):
+            service = self.containers[container]
+            row = rows.setdefault(service, dict(
+                {field: 0 for field in FIELDS}, timestamp=timestamp, service=service, cpu_percent=0.0
+            ))
+            row["containers"] += 1
+            for field, value in reading.items():
+                row[field] += value
+
+        for service, row in rows.items():
+            row["cpu_percent"] = round(row["cpu_percent"], 2)
+            row["mem_percent"] = round(row["mem_bytes"] / row["mem_limit"] * 100, 2) if row["mem_limit"] else 0.0
+            previous = self._previous.get(service)
+            for counter, rate in COUNTERS.items():
+                if previous and now > previous["at"]:
+                    # Counters restart with their container; that interval shows no traffic
+                    row[rate] = round(max(row[counter] - previous[counter], 0) / (now - previous["at"]), 1)
+                else:
+                    row[rate] = 0.0
+            self._previous[service] = dict(row, at=now)
+        return [rows[service] for service in sorted(rows)]
+
+    def close(self):
+        """Stop sampling: closing the streams unblocks the reading threads"""
+        self._closing = True
+        for stream in self._streams:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+__all__ = ["StatsMonitor", "FIELDS"]
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from rich.table import Table
+
+# Container event action -> the state the container is in afterwards
+EVENT_STATES = {
+    "create": "created",
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "die": "exited",
+    "stop": "exited",
+}
+
+STATE_STYLES = {"running": "green", "exited": "red", "dead": "red", "paused": "yellow", "created": "yellow"}
+HEALTH_STYLES = {"healthy": "green", "unhealthy": "red", "starting": "yellow"}
+
+class StatusBoard:
+    """The containers of a project, kept up to date from Docker events instead of repeated listings"""
+
+    def __init__(self, containers: Optional[List[dict]] = None):
+        self.rows: Dict[str, dict] = {}
+        for container in containers or []:
+            self.rows[container["name"]] = {
+                "service": container.get("service"),
+                "state": container.get("state"),
+                "health": container.get("health"),
+                "since": None,
+            }
+
+    def apply(self, event: dict) -> bool:
+        """Update the board from one container event; returns True if anything changed"""
+        action = event.get("Action") or event.get("status") or ""
+        attributes = (event.get("Actor") or {}).get("Attributes") or {}
+        name = attributes.get("name")
+        if not name:
+            return False
+
+        if action == "destroy":
+            return self.rows.pop(name, None) is not None
+
+        if action.startswith("health_status"):
+            changes = {"health": action.split(":", 1)[-1].strip()}
+        elif action in EVENT_STATES:
+            changes = {"state": EVENT_STATES[action]}
+            if action in ("start", "restart"):
+                # Containers known to have a healthcheck start over; the first check reports back
+                changes["health"] = "starting" if self.rows.get(name, {}).get("health") else None
+        else:
+            # exec_*, attach, kill, ... leave the state as it is
+            return False
+
+        row = self.rows.setdefault(name, {
+            "service": attributes.get("com.docker.compose.service"),
+            "state": None,
+            "health": None,
+            "since": None,
+        })
+        row.update(changes)
+        row["since"] = datetime.fromtimestamp(event.get("timeNano", 0) / 1e9 or event.get("time", 0))
+        return True
+
+    def render(self, project: str) -> Table:
+        table = Table(title=f"{project} containers")
+        table.add_column("Service")
+        table.add_column("Container")
+        table.add_column("State")
+        table.add_column("Health")
+        table.add_column("Changed", justify="right")
+
+        for name, row in sorted(self.rows.items(), key=lambda item: (item[1]["service"] or "", item[0])):
+            state = row["state"] or "-"
+            health = row["health"] or "-"
+            table.add_row(
+                row["service"] or "-",
+                name,
+                f"[{STATE_STYLES.get(state, 'white')}]{state}[/]",
+                f"[{HEALTH_STYLES.get(health, 'white')}]{health}[/]",
+                row["since"].strftime("%H:%M:%S") if row["since"] else "",
+            )
+        return table
+
+__all__ = ["StatusBoard"]
@@ -0,0 +1,30 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List
+
+class StreamReaders:
+    """Runs one blocking stream reader per container, each on a thread of its own
+
+    A followed stream (logs, stats) never returns until it is closed, so its reader
+    holds its thread for good. The default executor only has min(32, cpu + 4)
+    threads: with more containers than that, the extra ones would never be read.
+    """
+
+    @staticmethod
+    async def read_all(read: Callable[..., Any], items: Iterable, *args) -> List[Any]:
+        """Call read(item, *args) for every item at once; returns their results in order"""
+        items = list(items)
+        if not items:
+            return []
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=len(items), thread_name_prefix="dockit-stream")
+        try:
+            return await asyncio.gather(*(
+                loop.run_in_executor(executor, functools.partial(read, item, *args)) for item in items
+            ))
+        finally:
+            # The readers end once their streams are closed; nothing to wait for here
+            executor.shutdown(wait=False)
+
+__all__ = ["StreamReaders"]
@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from typing import Dict, List, Optional, Union
+import jinja2
+from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader, TemplateNotFound
+from jinja2.bccache import Bucket
+from dockit.utilities.debugger import Debugger
+from dockit.utilities.path_resolver import PathResolver
+
+class ContentHashBytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache keyed on the template source hash, so edits invalidate and identical sources share"""
+
+    def get_bucket(self, environment, name, filename, source) -> Bucket:
+        checksum = self.get_source_checksum(source)
+        bucket = Bucket(environment, checksum, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+class PrecompiledLoader(ModuleLoader):
+    """Serve precompiled template modules, but only for templates whose source still matches"""
+
+    def __init__(self, path: str, names):
+        super().__init__(path)
+        self.names = set(names)
+
+    def load(self, environment, name, globals=None):
+        if name not in self.names:
+            raise TemplateNotFound(name)
+        return super().load(environment, name, globals)
+
+class TemplateLoader:
+    MANIFEST = "manifest.json"
+
+    @staticmethod
+    def runtime() -> Dict[str, str]:
+        """What compiled template code depends on besides the template sources"""
+        return {"jinja2": jinja2.__version__, "python": f"{sys.version_info[0]}.{sys.version_info[1]}"}
+
+    @staticmethod
+    def create_environment(templates_dir: Union[str, List[str]], cache_dir: Optional[str] = None,
+                           compiled_dir: Optional[str] = None, precompiled: bool = True) -> Environment:
+        """Build the Jinja environment used to render every Dockit template
+
+        :param templates_dir: a templates directory, or layers of them searched in order
+        """
+        if cache_dir is None:
+            # Bytecode from another Jinja2 release is never loaded
+            cache_dir = os.path.join(PathResolver.get_cache_dir(), "jinja", jinja2.__version__)
+        if compiled_dir is None:
+            compiled_dir = PathResolver.get_precompiled_templates_path()
+
+        loaders = []
+        names = TemplateLoader.get_precompiled_names(templates_dir, compiled_dir) if precompiled else []
+        if names:
+            loaders.append(PrecompiledLoader(compiled_dir, names))
+        loaders.append(FileSystemLoader(templates_dir))
+
+        bytecode_cache = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            bytecode_cache = ContentHashBytecodeCache(cache_dir)
+        except OSError:
+            pass  # Render without a cache rather than fail
+
+        env = Environment(
+            loader=ChoiceLoader(loaders),
+            bytecode_cache=bytecode_cache,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        # Add custom tojson filter with ensure_ascii=False
+        env.filters['tojson'] = lambda value: json.dumps(value, ensure_ascii=False)
+        # Add custom dd filter
+        env.filters['dd'] = Debugger.dd
+        return env
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @staticmethod
+    def get_precompiled_names(templates_dir: Union[str, List[str]], compiled_dir: str) -> list:
+        """Names of precompiled templates whose current source is byte-identical to what was compiled
+
+        None of them are used when they were compiled by another Jinja2 or Python version.
+        """
+        manifest_path = os.path.join(compiled_dir, TemplateLoader.MANIFEST)
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(manifest, dict) or manifest.get("runtime") != TemplateLoader.runtime():
+            return []
+
+        layers = [templates_dir] if isinstance(templates_dir, str) else templates_dir
+        names = []
+        for name, digest in (manifest.get("templates") or {}).items():
+            # An override is compared, not the bundled template it shadows
+            path = PathResolver.find_resource(layers, name)
+            if path is None:
+                continue
+            try:
+                if TemplateLoader.hash_file(path) == digest:
+                    names.append(name)
+            except OSError:
+                continue
+        return names
+
+    @staticmethod
+    def compile_templates(templates_dir: str, target_dir: str) -> Dict[str, str]:
+        """Precompile every .j2 template into importable modules plus a manifest; returns name -> source hash"""
+        os.makedirs(target_dir, exist_ok=True)
+        # The bytecode cache of the build stays in the build tree, not in the builder's ~/.dockit
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(target_dir))) as cache_dir:
+            env = TemplateLoader.create_environment(templates_dir, cache_dir, precompiled=False)
+            names = env.list_templates(filter_func=lambda name: name.endswith(".j2"))
+            env.compile_templates(target_dir, filter_func=lambda name: name in names, zip=None, ignore_errors=False)
+
+        templates = {
+            name: TemplateLoader.hash_file(os.path.join(templates_dir, name))
+            for name in names
+        }
+        with open(os.path.join(target_dir, TemplateLoader.MANIFEST), "w") as f:
+            json.dump({"runtime": TemplateLoader.runtime(), "templates": templates}, f, indent=4)
+        return templates
+
+__all__ = ["TemplateLoader"]